@@ -0,0 +1,50 @@
+"""
+Time pathological inputs through the orchestrator under the default
+ProcessingBudget and report whether each result was degraded.
+
+    python benchmarks/adversarial_inputs.py --size 50000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from document_processing.orchestrator import DocumentProcessingOrchestrator  # noqa: E402
+
+
+def inputs(size: int):
+    return {
+        "whitespace_and_hyphens": " \t-\n" * (size // 4),
+        "single_whitespace_line": " " * size,
+        "month_prefix_run": "mar" * (size // 3),
+        "reference_then_whitespace": ("REF" + " " * 997) * (size // 1000),
+        "party_suffix_lines": ("Acme Inc " * 10 + "\n") * (size // 100),
+        "digit_run": "1" * size,
+        "dollar_fragments": "$1," * (size // 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=50_000_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    orchestrator = DocumentProcessingOrchestrator()
+    for name, text in inputs(args.size).items():
+        started = time.perf_counter()
+        result = orchestrator.process_document(text, name)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"{name:28s} {elapsed_ms:9.1f} ms  degraded={result.degraded}")
+
+
+if __name__ == "__main__":
+    main()
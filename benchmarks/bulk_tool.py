@@ -0,0 +1,70 @@
+"""
+Compare one bulk call with per-document processing: wall time and the size of
+what the agent has to read back.
+
+    python benchmarks/bulk_tool.py --documents 40 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from document_processing.bulk import BulkProcessor  # noqa: E402
+from document_processing.orchestrator import DocumentProcessingOrchestrator  # noqa: E402
+
+VENDORS = ("Acme Corp", "Northwind Ltd", "Globex Inc", "Initech LLC")
+
+
+def invoice(idx: int, rng: random.Random) -> str:
+    lines = [f"{rng.randint(1, 20)} x item {n} @ ${rng.randint(5, 500)}.00" for n in range(40)]
+    return (
+        f"INVOICE INV-{idx}\nFrom:\n{rng.choice(VENDORS)}\nDate: 2025-11-{rng.randint(1, 28):02d}\n"
+        + "\n".join(lines)
+        + f"\nTotal due: ${rng.randint(1000, 90000):,}.00\nPayment due within 30 days."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(7)
+    documents = [invoice(idx, rng) for idx in range(args.documents)]
+    orchestrator = DocumentProcessingOrchestrator()
+
+    start = time.perf_counter()
+    single = [
+        asdict(orchestrator.process_document(text, f"doc_{i + 1}"))
+        for i, text in enumerate(documents)
+    ]
+    single_s = time.perf_counter() - start
+    single_bytes = sum(len(json.dumps(result)) for result in single)
+
+    with BulkProcessor(orchestrator, workers=args.workers, min_parallel=1) as bulk:
+        bulk.run(documents[:1] * bulk.workers)  # start the worker pool
+        start = time.perf_counter()
+        payload = bulk.process(documents)
+        bulk_s = time.perf_counter() - start
+    bulk_bytes = len(json.dumps(payload))
+
+    print(f"{args.documents} documents, {bulk.workers} workers")
+    print(f"per-document calls: {single_s * 1000:8.1f} ms, {single_bytes:8,} bytes of results")
+    print(f"one bulk call:      {bulk_s * 1000:8.1f} ms, {bulk_bytes:8,} bytes of payload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compare a dashboard query over JSONL result dumps with the same query over a
+columnar result store.
+
+    python benchmarks/columnar_analytics.py --results 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from document_processing.party_registry import normalize_party_name  # noqa: E402
+from document_processing.result_store import ColumnarResultReader, ColumnarResultWriter  # noqa: E402
+from document_processing.tools import DocumentParserTool  # noqa: E402
+
+VENDORS = tuple(f"Vendor {n} {suffix}" for n in range(200) for suffix in ("Inc", "LLC"))
+DOC_TYPES = ("Invoice", "Invoice", "Contract", "Email", "Report")
+
+
+def result_record(idx: int, rng: random.Random) -> dict:
+    doc_type = rng.choice(DOC_TYPES)
+    amounts = [f"${rng.randint(100, 90000):,}.{rng.randint(0, 99):02d}" for _ in range(rng.randint(0, 3))]
+    return {
+        "document_id": f"D{idx}",
+        "timestamp": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00.{idx % 1000000:06d}",
+        "metadata": {
+            "doc_type": doc_type,
+            "confidence": 0.85,
+            "dates": [f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"],
+            "amounts": amounts,
+            "parties": rng.sample(VENDORS, rng.randint(1, 2)),
+            "references": [f"REF-INV-{idx}"] if doc_type == "Invoice" else [],
+        },
+        "action_items": [
+            {"priority": "High", "action": "Process payment", "assignee": "Finance Team", "due_date": None}
+        ]
+        if doc_type == "Invoice"
+        else [],
+        "summary": f"{doc_type} with {len(amounts)} amounts.",
+        "risks": [],
+        "processing_time_ms": rng.randint(1, 40),
+        "degraded": False,
+    }
+
+
+def jsonl_query(path: Path, since: datetime, until: datetime) -> dict:
+    """Invoice value by vendor for one month, the way ad-hoc scripts do it today."""
+    totals = defaultdict(float)
+    lo, hi = since.isoformat(), until.isoformat()
+    with path.open() as handle:
+        for line in handle:
+            result = json.loads(line)
+            metadata = result["metadata"]
+            if metadata["doc_type"] != "Invoice" or not lo <= result["timestamp"] < hi:
+                continue
+            parsed = [DocumentParserTool.parse_amount(a) for a in metadata["amounts"]]
+            value = max((a for a in parsed if a is not None), default=0.0)
+            for party in metadata["parties"]:
+                totals[normalize_party_name(party) or party] += value
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=1_000_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(7)
+    since, until = datetime(2025, 10, 1), datetime(2025, 11, 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        dump = Path(tmp) / "results.jsonl"
+        with dump.open("w") as handle:
+            for idx in range(args.results):
+                handle.write(json.dumps(result_record(idx, rng)) + "\n")
+
+        start = time.perf_counter()
+        expected = jsonl_query(dump, since, until)
+        jsonl_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ColumnarResultWriter(Path(tmp) / "store") as writer:
+            with dump.open() as handle:
+                writer.append_many(json.loads(line) for line in handle)
+        convert_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ColumnarResultReader(Path(tmp) / "store") as reader:
+            totals = reader.aggregate("party", "value", doc_type="Invoice", since=since, until=until)
+        columnar_s = time.perf_counter() - start
+
+    assert totals.keys() == expected.keys()
+    assert all(abs(totals[k] - expected[k]) < 1e-6 * max(1.0, expected[k]) for k in totals)
+    print(f"{args.results} results, {len(totals)} vendors")
+    print(f"JSONL reparse:      {jsonl_s:8.2f}s")
+    print(f"one-off conversion: {convert_s:8.2f}s")
+    print(f"columnar query:     {columnar_s:8.2f}s ({jsonl_s / columnar_s:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Local load test for the HTTP service: compares one-request-at-a-time handling
+(``max_batch_size=1``) with adaptive micro-batching.
+
+    python benchmarks/http_load.py --requests 2000 --concurrency 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from document_processing.server import DocumentProcessingServer, ServerConfig  # noqa: E402
+
+SAMPLE = (ROOT_DIR / "tests" / "sample_documents" / "invoice_samples.txt").read_text()
+
+
+async def _client(port: int, jobs: asyncio.Queue, statuses: list):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while True:
+            try:
+                idx = jobs.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            body = json.dumps({"document_text": SAMPLE, "document_id": f"LOAD{idx}"}).encode()
+            writer.write(
+                f"POST /process HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            statuses.append(int(status_line.split()[1]))
+    finally:
+        writer.close()
+
+
+async def run(config: ServerConfig, requests: int, concurrency: int) -> dict:
+    server = DocumentProcessingServer(config)
+    await server.start()
+    try:
+        jobs: asyncio.Queue = asyncio.Queue()
+        for idx in range(requests):
+            jobs.put_nowait(idx)
+        statuses: list = []
+        start = time.perf_counter()
+        await asyncio.gather(*(_client(server.port, jobs, statuses) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        stats = server.batcher.stats()
+    finally:
+        await server.stop()
+    return {
+        "max_batch_size": config.max_batch_size,
+        "throughput_rps": round(requests / elapsed, 1),
+        "ok": statuses.count(200),
+        "rejected": statuses.count(429),
+        "avg_batch_size": stats["avg_batch_size"],
+        "latency_ms": stats["latency_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    for batch_size in (1, 32):
+        config = ServerConfig(
+            port=0,
+            workers=args.workers,
+            max_batch_size=batch_size,
+            max_queue_size=args.concurrency * 2,
+        )
+        print(json.dumps(asyncio.run(run(config, args.requests, args.concurrency))))
+
+
+if __name__ == "__main__":
+    main()
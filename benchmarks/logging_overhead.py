@@ -0,0 +1,54 @@
+"""
+Compare per-document throughput under the original synchronous logging setup
+and the production (queued, structured, sampled) logging mode.
+
+    python benchmarks/logging_overhead.py --documents 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from document_processing.observability import configure_logging, shutdown_logging  # noqa: E402
+from document_processing.orchestrator import DocumentProcessingOrchestrator  # noqa: E402
+
+SAMPLES = [
+    (ROOT_DIR / "tests" / "sample_documents" / name).read_text()
+    for name in ("invoice_samples.txt", "contract_samples.txt", "report_samples.txt")
+]
+
+
+def run(mode: str, documents: int, sample_rate: float) -> float:
+    with open(os.devnull, "w") as sink:
+        configure_logging(mode, sample_rate=sample_rate, stream=sink)
+        orchestrator = DocumentProcessingOrchestrator()
+        start = time.perf_counter()
+        for idx in range(documents):
+            orchestrator.process_document(SAMPLES[idx % len(SAMPLES)], f"BENCH{idx}")
+        elapsed = time.perf_counter() - start
+        shutdown_logging()
+    return documents / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--sample-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    baseline = run("default", args.documents, args.sample_rate)
+    production = run("production", args.documents, args.sample_rate)
+    print(f"default logging:    {baseline:10.1f} docs/sec")
+    print(f"production logging: {production:10.1f} docs/sec ({production / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Startup time of a memory snapshot with millions of stored patterns.
+
+The snapshot is grown the way a long-running process grows it: load,
+store another batch of patterns, re-snapshot. Startup (load plus first
+lookups) is then timed in a fresh process, next to rebuilding the same
+patterns from a JSON log.
+
+    python benchmarks/memory_snapshot.py --patterns 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from document_processing.session import MemoryBank  # noqa: E402
+from document_processing.snapshot import load_snapshot, save_snapshot  # noqa: E402
+
+DOC_TYPES = ("Invoice", "Contract")
+RISK_LEVELS = ("High", "Medium", "Low")
+
+STARTUP = """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+from document_processing.snapshot import load_snapshot
+imported = time.perf_counter()
+bank, _ = load_snapshot({path!r})
+invoices = bank.retrieve_patterns("Invoice")
+first, last = invoices[0], invoices[len(invoices) // 2]
+done = time.perf_counter()
+print(f"{{(imported - started) * 1000:.1f}} {{(done - imported) * 1000:.1f}} {{len(invoices)}}")
+"""
+
+
+def pattern(rng: random.Random) -> dict:
+    return {
+        "entities_found": rng.randint(0, 40),
+        "action_count": rng.randint(0, 6),
+        "risk_level": rng.choice(RISK_LEVELS),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patterns", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=1_000_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "memory.snap"
+        bank = MemoryBank()
+        stored = 0
+        while stored < args.patterns:
+            batch = min(args.batch, args.patterns - stored)
+            for _ in range(batch):
+                bank.store_pattern(rng.choice(DOC_TYPES), pattern(rng))
+            started = time.perf_counter()
+            save_snapshot(path, bank)
+            stored += batch
+            print(f"snapshot of {stored:>11,} patterns saved in {time.perf_counter() - started:6.2f}s")
+            bank, _ = load_snapshot(path)
+
+        env = dict(os.environ, GOOGLE_API_KEY=os.environ.get("GOOGLE_API_KEY", "benchmark"))
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP.format(root=str(ROOT_DIR), path=str(path))],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout.split()
+        import_ms, load_ms, invoices = float(out[0]), float(out[1]), int(out[2])
+
+        # Baseline: rebuilding the bank from a JSON log of one batch.
+        log = Path(tmp) / "patterns.jsonl"
+        sample = min(args.batch, args.patterns)
+        with log.open("w") as handle:
+            for _ in range(sample):
+                handle.write(json.dumps([rng.choice(DOC_TYPES), pattern(rng)]) + "\n")
+        started = time.perf_counter()
+        rebuilt = MemoryBank()
+        with log.open() as handle:
+            for line in handle:
+                doc_type, stored_pattern = json.loads(line)
+                rebuilt.store_pattern(doc_type, stored_pattern)
+        rebuild_s = (time.perf_counter() - started) * args.patterns / sample
+
+        print(f"snapshot size: {path.stat().st_size / 2**20:.1f} MiB ({invoices:,} invoice patterns)")
+        print(f"warm start: {load_ms:.1f} ms (plus {import_ms:.0f} ms of package imports)")
+        print(f"JSON log rebuild, extrapolated from {sample:,} patterns: {rebuild_s:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,26 @@ ADK integration that exposes the orchestrator via an Agent Development Kit agent
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from google.adk.agents import Agent
 from google.adk.models.google_llm import Gemini
 from google.adk.runners import InMemoryRunner
 from google.adk.tools import FunctionTool
 
+from .bulk import DEFAULT_FIELDS, BulkProcessor
 from .config import settings
+from .models import (
+    PIPELINE_STAGES,
+    ActionsIdentified,
+    DocumentClassified,
+    EntitiesExtracted,
+    ProcessingDone,
+    RisksAssessed,
+    SummaryGenerated,
+)
 from .orchestrator import DocumentProcessingOrchestrator
+from .snapshot import warm_start
 
 
 class DocumentProcessingADKApp:
@@ -23,19 +34,40 @@ class DocumentProcessingADKApp:
 
     def __init__(self):
         self.orchestrator = DocumentProcessingOrchestrator()
+        self.snapshots = (
+            warm_start(
+                self.orchestrator, settings.memory_snapshot_path, settings.snapshot_interval_s
+            )
+            if settings.memory_snapshot_path
+            else None
+        )
+        self.bulk = BulkProcessor(self.orchestrator)
         self.model = Gemini(model=settings.google_model)
 
         self.process_document_tool = FunctionTool(self._process_document_tool)
+        self.process_document_stages_tool = FunctionTool(self._process_document_stages_tool)
+        self.process_documents_bulk_tool = FunctionTool(self._process_documents_bulk_tool)
+        self.get_bulk_result_tool = FunctionTool(self._get_bulk_result_tool)
 
         self.agent = Agent(
             name="DocumentProcessingAgent",
             instruction=(
                 "You are an enterprise document processing assistant. "
                 "Use the provided tool to run the deterministic multi-agent pipeline "
-                "and report the structured results back to the user."
+                "and report the structured results back to the user. When only part of "
+                "the analysis is needed (for example the document type for routing), "
+                "use the stages tool with an early stop_after to answer faster. For more "
+                "than a couple of documents, call the bulk tool once with all of them, "
+                "request only the fields you need, and fetch individual full results "
+                "by handle only when the user asks for details."
             ),
             model=self.model,
-            tools=[self.process_document_tool],
+            tools=[
+                self.process_document_tool,
+                self.process_document_stages_tool,
+                self.process_documents_bulk_tool,
+                self.get_bulk_result_tool,
+            ],
         )
         self.runner = InMemoryRunner(self.agent)
 
@@ -61,10 +93,81 @@ class DocumentProcessingADKApp:
             "action_items": [vars(a) for a in result.action_items],
             "risks": [vars(r) for r in result.risks],
             "processing_time_ms": result.processing_time_ms,
+            "degraded": result.degraded,
         }
 
         return payload
 
+    def _process_document_stages_tool(
+        self,
+        document_text: str,
+        stop_after: str = "classified",
+        document_id: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the pipeline only until ``stop_after`` (one of classified,
+        extracted, actions, summary, risks, done) and return the fields known
+        at that point. Later stages are not executed.
+        """
+        if stop_after not in PIPELINE_STAGES:
+            return {"error": f"stop_after must be one of {', '.join(PIPELINE_STAGES)}"}
+
+        payload: Dict[str, Any] = {"stages_completed": []}
+        for event in self.orchestrator.stream_document(document_text, document_id):
+            payload["document_id"] = event.document_id
+            payload["stages_completed"].append(event.stage)
+            payload["elapsed_ms"] = event.elapsed_ms
+            if isinstance(event, DocumentClassified):
+                payload["doc_type"] = event.doc_type
+                payload["confidence"] = event.confidence
+            elif isinstance(event, EntitiesExtracted):
+                payload["dates"] = event.metadata.dates
+                payload["amounts"] = event.metadata.amounts
+                payload["parties"] = event.metadata.parties
+                payload["references"] = event.metadata.references
+            elif isinstance(event, ActionsIdentified):
+                payload["action_items"] = [vars(a) for a in event.action_items]
+            elif isinstance(event, SummaryGenerated):
+                payload["summary"] = event.summary
+            elif isinstance(event, RisksAssessed):
+                payload["risks"] = [vars(r) for r in event.risks]
+            elif isinstance(event, ProcessingDone):
+                payload["processing_time_ms"] = event.result.processing_time_ms
+                payload["degraded"] = event.result.degraded
+            if event.stage == stop_after:
+                break
+
+        return payload
+
+    def _process_documents_bulk_tool(
+        self,
+        documents: List[str],
+        document_ids: List[str] | None = None,
+        fields: List[str] | None = None,
+        max_rows: int | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Process many documents in parallel in one call. Returns counts and
+        total value per doc type, counts per highest risk level, overall
+        totals, and one row per document holding only ``fields`` (default
+        doc_type, value, risk_level). Full results are kept under the returned
+        handle for ``get_bulk_result``; documents without an id are named
+        ``<handle>-1``, ``<handle>-2``, ... in input order.
+        """
+        try:
+            return self.bulk.process(
+                documents, document_ids, fields=fields or DEFAULT_FIELDS, max_rows=max_rows
+            )
+        except ValueError as exc:
+            return {"error": str(exc)}
+
+    def _get_bulk_result_tool(self, handle: str, document_id: str) -> Dict[str, Any]:
+        """Return the full result of one document from a previous bulk call."""
+        try:
+            return self.bulk.store.get(handle, document_id)
+        except KeyError as exc:
+            return {"error": exc.args[0]}
+
     def run_conversation(self, message: str) -> Any:
         """Utility for CLI/testing without the ADK web UI."""
         return self.runner.run(message)
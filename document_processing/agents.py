@@ -5,14 +5,27 @@ Agent implementations for each stage of the document processing pipeline.
 from __future__ import annotations
 
 import logging
-from typing import List
+import time
+from typing import Collection, List
 
-from .models import ActionItem, DocumentMetadata, RiskAssessment
+from .models import ActionItem, DocumentMetadata, DuplicateMatch, RiskAssessment
+from .party_registry import PartyRegistry
 from .session import InMemorySessionService, MemoryBank
 from .tools import DocumentParserTool, EntityExtractionTool
 
 logger = logging.getLogger(__name__)
 
+# Entity scans run by InformationExtractionAgent, in order.
+EXTRACTORS = ("dates", "amounts", "references", "parties")
+
+# Classification rules checked in order: (doc_type, confidence, keywords).
+DOC_TYPE_RULES = (
+    ("Invoice", 0.95, ("invoice", "bill", "payment due")),
+    ("Contract", 0.90, ("contract", "agreement", "terms and conditions")),
+    ("Report", 0.85, ("report", "analysis", "findings", "summary")),
+    ("Proposal", 0.88, ("proposal", "quotation", "estimate")),
+)
+
 
 class DocumentClassifierAgent:
     """Agent 1: Classifies document type."""
@@ -26,49 +39,77 @@ class DocumentClassifierAgent:
         """Classify document and return type with confidence."""
         logger.info("%s: Starting classification", self.name)
 
-        text_lower = document_text.lower()
-
-        if any(word in text_lower for word in ["invoice", "bill", "payment due"]):
-            doc_type = "Invoice"
-            confidence = 0.95
-        elif any(word in text_lower for word in ["contract", "agreement", "terms and conditions"]):
-            doc_type = "Contract"
-            confidence = 0.90
-        elif any(word in text_lower for word in ["report", "analysis", "findings", "summary"]):
-            doc_type = "Report"
-            confidence = 0.85
-        elif any(word in text_lower for word in ["proposal", "quotation", "estimate"]):
-            doc_type = "Proposal"
-            confidence = 0.88
-        else:
-            doc_type = "General Document"
-            confidence = 0.70
+        doc_type, confidence = self.match_doc_type(document_text.lower())
 
         logger.info("%s: Classified as %s (confidence: %.2f)", self.name, doc_type, confidence)
         return doc_type, confidence
 
+    @staticmethod
+    def match_doc_type(text_lower: str) -> tuple[str, float]:
+        """Keyword rules behind ``classify``; expects lower-cased text."""
+        for doc_type, confidence, keywords in DOC_TYPE_RULES:
+            if any(word in text_lower for word in keywords):
+                return doc_type, confidence
+        return "General Document", 0.70
+
 
 class InformationExtractionAgent:
     """Agent 2: Extracts key information from documents."""
 
-    def __init__(self, session_service: InMemorySessionService):
+    def __init__(
+        self,
+        session_service: InMemorySessionService,
+        party_registry: PartyRegistry | None = None,
+    ):
         self.session_service = session_service
+        self.party_registry = party_registry
         self.parser = DocumentParserTool()
         self.entity_tool = EntityExtractionTool()
         self.name = "InformationExtractionAgent"
         logger.info("%s initialized", self.name)
 
-    def extract(self, document_text: str, session_id: str) -> DocumentMetadata:
-        """Extract all key information from document."""
+    def extract(
+        self,
+        document_text: str,
+        session_id: str,
+        extractors: Collection[str] | None = None,
+        deadline: float | None = None,
+    ) -> DocumentMetadata:
+        """
+        Extract all key information from document.
+
+        ``extractors`` limits which entity scans run (see ``EXTRACTORS``);
+        skipped scans yield empty lists. Scans not started before
+        ``deadline`` (a ``time.perf_counter()`` value) are skipped and listed
+        in the session's ``skipped_scans`` state.
+        """
         logger.info("%s: Starting extraction", self.name)
 
         doc_type = self.session_service.get_state(session_id, "doc_type")
         confidence = self.session_service.get_state(session_id, "confidence")
 
-        dates = self.parser.extract_dates(document_text)
-        amounts = self.parser.extract_amounts(document_text)
-        references = self.parser.extract_references(document_text)
-        parties = self.entity_tool.extract_parties(document_text)
+        scanners = {
+            "dates": self.parser.extract_dates,
+            "amounts": self.parser.extract_amounts,
+            "references": self.parser.extract_references,
+            "parties": self.entity_tool.extract_parties,
+        }
+        run = EXTRACTORS if extractors is None else extractors
+        found = {name: [] for name in EXTRACTORS}
+        skipped = []
+        for name in EXTRACTORS:
+            if name not in run:
+                continue
+            if deadline is not None and time.perf_counter() > deadline:
+                skipped.append(name)
+                continue
+            found[name] = scanners[name](document_text)
+        if skipped:
+            logger.warning("%s: Time budget exhausted, skipped %s", self.name, ", ".join(skipped))
+            self.session_service.update_state(session_id, "skipped_scans", skipped)
+
+        dates, amounts = found["dates"], found["amounts"]
+        references, parties = found["references"], found["parties"]
 
         metadata = DocumentMetadata(
             doc_type=doc_type or "Unknown",
@@ -79,6 +120,15 @@ class InformationExtractionAgent:
             references=references[:5],
         )
 
+        if self.party_registry is not None and metadata.parties:
+            document_id = self.session_service.get_state(session_id, "document_id") or session_id
+            history = self.party_registry.observe(metadata.parties, document_id)
+            self.session_service.update_state(
+                session_id,
+                "party_history",
+                {party: record.document_count for party, record in history.items()},
+            )
+
         logger.info(
             "%s: Extracted %s dates, %s amounts, %s parties",
             self.name,
@@ -92,6 +142,9 @@ class InformationExtractionAgent:
 class ActionItemsAgent:
     """Agent 3: Identifies required actions."""
 
+    # Phrases in the text (besides metadata) that change the actions produced.
+    TEXT_TRIGGERS = ("urgent", "immediate")
+
     def __init__(self):
         self.name = "ActionItemsAgent"
         logger.info("%s initialized", self.name)
@@ -137,7 +190,7 @@ class ActionItemsAgent:
                 )
             )
 
-        if "urgent" in text_lower or "immediate" in text_lower:
+        if any(phrase in text_lower for phrase in self.TEXT_TRIGGERS):
             actions.insert(
                 0,
                 ActionItem(
@@ -208,17 +261,42 @@ class SummaryGenerationAgent:
 class RiskAssessmentAgent:
     """Agent 5: Assesses risks and compliance."""
 
-    def __init__(self):
+    # Phrases in the text (besides metadata) that change the risks produced.
+    TEXT_TRIGGERS = ("urgent", "new vendor", "first time")
+
+    def __init__(self, party_registry: PartyRegistry | None = None):
+        self.party_registry = party_registry
         self.name = "RiskAssessmentAgent"
         logger.info("%s initialized", self.name)
 
-    def assess_risks(self, metadata: DocumentMetadata, document_text: str) -> List[RiskAssessment]:
+    def assess_risks(
+        self,
+        metadata: DocumentMetadata,
+        document_text: str,
+        duplicates: List[DuplicateMatch] | None = None,
+    ) -> List[RiskAssessment]:
         """Assess risks based on document content."""
         logger.info("%s: Assessing risks", self.name)
 
         risks: List[RiskAssessment] = []
         text_lower = document_text.lower()
 
+        for match in duplicates or []:
+            details = [f"similarity {match.similarity:.0%}"]
+            if match.shared_references:
+                details.append(f"same reference {', '.join(match.shared_references)}")
+            if match.shared_amounts:
+                details.append(f"same amount {', '.join(match.shared_amounts)}")
+            risks.append(
+                RiskAssessment(
+                    level="High",
+                    description=(
+                        f"Possible duplicate of {match.document_id} ({'; '.join(details)})"
+                    ),
+                    recommendation="Confirm this is not a resubmission before approving payment",
+                )
+            )
+
         if metadata.amounts:
             try:
                 max_amount = max(
@@ -270,6 +348,16 @@ class RiskAssessmentAgent:
                     recommendation="Complete vendor verification and due diligence",
                 )
             )
+        elif self.party_registry is not None and metadata.parties:
+            first_seen = [p for p in metadata.parties if self.party_registry.is_new(p)]
+            if first_seen:
+                risks.append(
+                    RiskAssessment(
+                        level="Medium",
+                        description=f"First document from new party: {', '.join(first_seen)}",
+                        recommendation="Complete vendor verification and due diligence",
+                    )
+                )
 
         if not risks:
             risks.append(
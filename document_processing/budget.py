@@ -0,0 +1,60 @@
+"""
+Per-document size and time budgets.
+
+Python's ``re`` cannot be interrupted, so the budget bounds work in two ways:
+the text handed to the agents is capped at ``max_document_chars`` (the scan
+window), and optional deadlines are checked between scans so an expensive
+document stops early instead of stalling a worker. Either cut marks the result
+as ``degraded``.
+
+``max_stage_ms`` applies to the extraction stage only: it is the one stage
+made of several independent scans, so it can stop between them. Classification,
+actions, summary and risks are single passes bounded by the scan window.
+``max_document_ms`` also gates the duplicate check.
+
+Only the size cap is on by default: wall-clock deadlines make output depend on
+machine load, so they are opt-in.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class ProcessingBudget:
+    """Limits applied to each document processed by the orchestrator."""
+
+    max_document_chars: int = 1_000_000
+    max_document_ms: float = math.inf
+    max_stage_ms: float = math.inf  # extraction stage only
+
+    def scan_window(self, document_text: str) -> Tuple[str, bool]:
+        """
+        Return the part of ``document_text`` the agents may scan and whether it
+        was truncated. Cuts at the last line break when one is close enough.
+        """
+        limit = self.max_document_chars
+        if len(document_text) <= limit:
+            return document_text, False
+        cut = document_text.rfind("\n", 0, limit)
+        if cut < limit // 2:
+            cut = limit
+        return document_text[:cut], True
+
+    def document_deadline(self, started: float) -> float:
+        return started + self.max_document_ms / 1000.0
+
+    def stage_deadline(self, document_deadline: float) -> float:
+        """Deadline for a stage starting now, never later than the document's."""
+        return min(time.perf_counter() + self.max_stage_ms / 1000.0, document_deadline)
+
+
+UNLIMITED_BUDGET = ProcessingBudget(
+    max_document_chars=2**62,
+    max_document_ms=math.inf,
+    max_stage_ms=math.inf,
+)
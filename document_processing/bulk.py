@@ -0,0 +1,239 @@
+"""
+Bulk processing with compact, aggregated responses.
+
+Built for the ADK agent: one tool call processes many documents in parallel
+and returns per-type and per-risk-level aggregates plus one short row per
+document with only the requested fields. Full results stay server-side
+under a handle and can be fetched per document when the agent needs them.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Sequence
+
+from .orchestrator import DocumentProcessingOrchestrator
+from .server import init_worker, process_batch
+from .tools import DocumentParserTool
+
+logger = logging.getLogger(__name__)
+
+RISK_LEVELS = ("High", "Medium", "Low")
+
+
+def _value(result: Dict[str, Any]) -> float | None:
+    """Largest amount on the document (normally its total)."""
+    parsed = (DocumentParserTool.parse_amount(a) for a in result["metadata"]["amounts"])
+    return max((a for a in parsed if a is not None), default=None)
+
+
+def _risk_level(result: Dict[str, Any]) -> str:
+    levels = {risk["level"] for risk in result["risks"]}
+    return next((level for level in RISK_LEVELS if level in levels), "None")
+
+
+ROW_FIELDS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "doc_type": lambda r: r["metadata"]["doc_type"],
+    "confidence": lambda r: r["metadata"]["confidence"],
+    "value": _value,
+    "risk_level": _risk_level,
+    "parties": lambda r: r["metadata"]["parties"],
+    "dates": lambda r: r["metadata"]["dates"],
+    "amounts": lambda r: r["metadata"]["amounts"],
+    "references": lambda r: r["metadata"]["references"],
+    "summary": lambda r: r["summary"],
+    "action_count": lambda r: len(r["action_items"]),
+    "risk_count": lambda r: len(r["risks"]),
+    "processing_time_ms": lambda r: r["processing_time_ms"],
+    "degraded": lambda r: r["degraded"],
+}
+DEFAULT_FIELDS = ("doc_type", "value", "risk_level")
+
+
+class BulkResultStore:
+    """Full results of recent bulk runs, keyed by handle (least recently used dropped first)."""
+
+    def __init__(self, max_batches: int = 100):
+        self.max_batches = max_batches
+        self._batches: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._batches)
+
+    @staticmethod
+    def new_handle() -> str:
+        return f"bulk-{uuid.uuid4().hex[:12]}"
+
+    def put(self, results: Sequence[Dict[str, Any]], handle: str | None = None) -> str:
+        handle = handle or self.new_handle()
+        self._batches[handle] = {result["document_id"]: result for result in results}
+        while len(self._batches) > self.max_batches:
+            self._batches.popitem(last=False)
+        return handle
+
+    def get(self, handle: str, document_id: str | None = None) -> Any:
+        """All results of a batch, or a single result when ``document_id`` is given."""
+        try:
+            batch = self._batches[handle]
+        except KeyError:
+            raise KeyError(f"Unknown or expired bulk handle {handle!r}") from None
+        self._batches.move_to_end(handle)
+        if document_id is None:
+            return list(batch.values())
+        try:
+            return batch[document_id]
+        except KeyError:
+            raise KeyError(f"No document {document_id!r} in {handle}") from None
+
+
+def _check_fields(fields: Sequence[str]):
+    unknown = [name for name in fields if name not in ROW_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s) {', '.join(unknown)}; choose from {', '.join(ROW_FIELDS)}"
+        )
+
+
+def summarize(
+    results: Sequence[Dict[str, Any]],
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    max_rows: int | None = None,
+) -> Dict[str, Any]:
+    """Aggregates plus a column-oriented table of the requested per-document fields."""
+    _check_fields(fields)
+    by_doc_type: Dict[str, Dict[str, Any]] = {}
+    by_risk_level: Counter = Counter()
+    total_value = 0.0
+    action_items = high_priority_actions = degraded = 0
+    rows: List[List[Any]] = []
+    for result in results:
+        value = _value(result)
+        risk_level = _risk_level(result)
+        group = by_doc_type.setdefault(
+            result["metadata"]["doc_type"], {"count": 0, "total_value": 0.0, "high_risk": 0}
+        )
+        group["count"] += 1
+        group["total_value"] += value or 0.0
+        group["high_risk"] += risk_level == "High"
+        by_risk_level[risk_level] += 1
+        total_value += value or 0.0
+        action_items += len(result["action_items"])
+        high_priority_actions += sum(a["priority"] == "High" for a in result["action_items"])
+        degraded += bool(result["degraded"])
+        if max_rows is None or len(rows) < max_rows:
+            rows.append([result["document_id"]] + [ROW_FIELDS[name](result) for name in fields])
+
+    for group in by_doc_type.values():
+        group["total_value"] = round(group["total_value"], 2)
+    payload: Dict[str, Any] = {
+        "documents": len(results),
+        "by_doc_type": by_doc_type,
+        "by_risk_level": {
+            level: by_risk_level[level] for level in (*RISK_LEVELS, "None") if by_risk_level[level]
+        },
+        "totals": {
+            "value": round(total_value, 2),
+            "action_items": action_items,
+            "high_priority_actions": high_priority_actions,
+            "degraded": degraded,
+        },
+        "columns": ["document_id", *fields],
+        "rows": rows,
+    }
+    if len(rows) < len(results):
+        payload["rows_omitted"] = len(results) - len(rows)
+    return payload
+
+
+class BulkProcessor:
+    """
+    Runs document batches through worker processes and keeps the full
+    results in a ``BulkResultStore``.
+
+    Batches smaller than ``min_parallel`` run on ``orchestrator`` in-process,
+    where pool dispatch would cost more than it saves. Worker processes build
+    their own orchestrators (as in the HTTP service), so collaborators attached
+    to ``orchestrator`` only see the in-process batches.
+    """
+
+    def __init__(
+        self,
+        orchestrator: DocumentProcessingOrchestrator | None = None,
+        workers: int | None = None,
+        min_parallel: int = 8,
+        executor: Executor | None = None,
+        store: BulkResultStore | None = None,
+    ):
+        self.orchestrator = orchestrator or DocumentProcessingOrchestrator()
+        self.workers = workers or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+        self.store = store if store is not None else BulkResultStore()
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def __enter__(self) -> "BulkProcessor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def run(
+        self, documents: Sequence[str], document_ids: Sequence[str | None] | None = None
+    ) -> List[Dict[str, Any]]:
+        """Process ``documents`` and return result dicts in input order."""
+        if document_ids is not None and len(document_ids) != len(documents):
+            raise ValueError("document_ids must have one entry per document")
+        items = list(zip(documents, document_ids or [None] * len(documents)))
+        if len(items) < self.min_parallel or self.workers <= 1:
+            return [asdict(result) for result in self.orchestrator.process_batch(items)]
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        size = math.ceil(len(items) / self.workers)
+        chunks = [items[start : start + size] for start in range(0, len(items), size)]
+        return [result for chunk in self._executor.map(process_batch, chunks) for result in chunk]
+
+    def process(
+        self,
+        documents: Sequence[str],
+        document_ids: Sequence[str | None] | None = None,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        max_rows: int | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Process a batch and return the compact payload, including the result handle.
+
+        Results are stored by document id, so ids must be unique within a batch.
+        """
+        started = time.perf_counter()
+        _check_fields(fields)
+        # Number unnamed documents under the run's handle: readable, addressable,
+        # and distinct from other runs sharing the orchestrator's session,
+        # dedup, party and revision state.
+        handle = self.store.new_handle()
+        document_ids = [
+            doc_id or f"{handle}-{index + 1}"
+            for index, doc_id in enumerate(document_ids or [None] * len(documents))
+        ]
+        duplicates = sorted(doc_id for doc_id, count in Counter(document_ids).items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Duplicate document_ids: {', '.join(duplicates)}")
+        results = self.run(documents, document_ids)
+        payload = {"handle": self.store.put(results, handle), **summarize(results, fields, max_rows)}
+        payload["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(
+            "Bulk run %s: %s documents in %s ms", payload["handle"], len(results), payload["elapsed_ms"]
+        )
+        return payload
@@ -25,6 +25,10 @@ class Settings:
     google_api_key: str
     google_model: str = "gemini-1.5-flash"
     use_vertex_ai: bool = False
+    log_mode: str = "default"
+    log_sample_rate: float = 0.01
+    memory_snapshot_path: str | None = None
+    snapshot_interval_s: float = 300.0
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -37,6 +41,10 @@ class Settings:
 
         use_vertex = os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "FALSE").upper() == "TRUE"
         model = os.getenv("GOOGLE_GENAI_MODEL", "gemini-1.5-flash")
+        log_mode = os.getenv("DOC_PROCESSING_LOG_MODE", "default").lower()
+        log_sample_rate = float(os.getenv("DOC_PROCESSING_LOG_SAMPLE_RATE", "0.01"))
+        memory_snapshot_path = os.getenv("DOC_PROCESSING_MEMORY_SNAPSHOT") or None
+        snapshot_interval_s = float(os.getenv("DOC_PROCESSING_SNAPSHOT_INTERVAL_S", "300"))
 
         # Ensure ADK downstream gets consistent configuration.
         os.environ["GOOGLE_API_KEY"] = api_key
@@ -47,6 +55,10 @@ class Settings:
             google_api_key=api_key,
             google_model=model,
             use_vertex_ai=use_vertex,
+            log_mode=log_mode,
+            log_sample_rate=log_sample_rate,
+            memory_snapshot_path=memory_snapshot_path,
+            snapshot_interval_s=snapshot_interval_s,
         )
 
 
@@ -0,0 +1,172 @@
+"""
+Near-duplicate document detection using MinHash signatures and an LSH index.
+
+Each document costs a fixed amount of memory (its signature plus one bucket
+entry per band) and a lookup only compares against documents that share at
+least one band bucket, so cost stays sublinear in corpus size.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+from .models import DocumentMetadata, DuplicateMatch
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """Lower-cased word n-grams of ``text``."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+@dataclass
+class _Entry:
+    document_id: str
+    signature: array
+    references: List[str]
+    amounts: List[str]
+
+
+class DuplicateDetector:
+    """
+    MinHash/LSH index of processed documents.
+
+    Signatures use ``num_perm`` XOR-seeded permutations of 32-bit shingle
+    hashes; the signature is split into ``bands`` bands so that pairs above
+    roughly ``(1 / bands) ** (1 / rows)`` Jaccard similarity collide in at
+    least one bucket. Candidates are then confirmed against ``threshold``.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.8,
+        shingle_size: int = 3,
+        max_matches: int = 3,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_matches = max_matches
+
+        rng = random.Random(seed)
+        self._seeds = [rng.getrandbits(32) for _ in range(num_perm)]
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._entries: List[_Entry | None] = []  # None once replaced by a newer version
+        self._by_id: Dict[str, int] = {}
+        logger.info(
+            "DuplicateDetector initialized (num_perm=%s, bands=%s, threshold=%.2f)",
+            num_perm,
+            bands,
+            threshold,
+        )
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def signature(self, text: str) -> array | None:
+        """MinHash signature of ``text``, or ``None`` when it has no words to shingle."""
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(text, self.shingle_size)]
+        if not hashes:
+            return None
+        return array("I", [min(map(seed.__xor__, hashes)) for seed in self._seeds])
+
+    def _band_keys(self, signature: array) -> List[bytes]:
+        raw = signature.tobytes()
+        width = self.rows * signature.itemsize
+        return [raw[i * width : (i + 1) * width] for i in range(self.bands)]
+
+    @staticmethod
+    def similarity(left: Sequence[int], right: Sequence[int]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(a == b for a, b in zip(left, right)) / len(left)
+
+    def find_duplicates(
+        self, document_text: str, metadata: DocumentMetadata, document_id: str | None = None
+    ) -> List[DuplicateMatch]:
+        """Return indexed documents at or above ``threshold``, most similar first."""
+        signature = self.signature(document_text)
+        if signature is None:
+            return []
+        return self._query(signature, metadata, document_id)
+
+    def add(self, document_id: str, document_text: str, metadata: DocumentMetadata):
+        """Index a document, replacing any earlier version with the same id."""
+        self._insert(document_id, self.signature(document_text), metadata)
+
+    def check_and_add(
+        self, document_id: str, document_text: str, metadata: DocumentMetadata
+    ) -> List[DuplicateMatch]:
+        """Look up duplicates of a new document, then index it."""
+        signature = self.signature(document_text)
+        matches = self._query(signature, metadata, document_id) if signature is not None else []
+        self._insert(document_id, signature, metadata)
+        return matches
+
+    def _query(
+        self, signature: array, metadata: DocumentMetadata, document_id: str | None
+    ) -> List[DuplicateMatch]:
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+
+        matches: List[DuplicateMatch] = []
+        for ordinal in candidates:
+            entry = self._entries[ordinal]
+            if entry.document_id == document_id:
+                continue
+            score = self.similarity(signature, entry.signature)
+            if score < self.threshold:
+                continue
+            matches.append(
+                DuplicateMatch(
+                    document_id=entry.document_id,
+                    similarity=round(score, 3),
+                    shared_references=[r for r in metadata.references if r in entry.references],
+                    shared_amounts=[a for a in metadata.amounts if a in entry.amounts],
+                )
+            )
+        matches.sort(key=lambda m: m.similarity, reverse=True)
+        return matches[: self.max_matches]
+
+    def _insert(self, document_id: str, signature: array | None, metadata: DocumentMetadata):
+        self._remove(document_id)
+        # Documents without words all share one degenerate signature; don't index them.
+        if signature is None:
+            return
+        ordinal = len(self._entries)
+        self._entries.append(
+            _Entry(document_id, signature, list(metadata.references), list(metadata.amounts))
+        )
+        self._by_id[document_id] = ordinal
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(ordinal)
+
+    def _remove(self, document_id: str):
+        ordinal = self._by_id.pop(document_id, None)
+        if ordinal is None:
+            return
+        entry = self._entries[ordinal]
+        for bucket, key in zip(self._buckets, self._band_keys(entry.signature)):
+            bucket[key].remove(ordinal)
+            if not bucket[key]:
+                del bucket[key]
+        self._entries[ordinal] = None
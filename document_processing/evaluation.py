@@ -1,16 +1,269 @@
 """
 Agent evaluation utilities.
+
+Besides per-result completeness tracking, ``evaluate_corpus`` scores the
+pipeline against a labeled JSONL corpus. Each line holds ``document_text``,
+optionally ``document_id``, the gold ``doc_type`` and any of the entity
+lists ``dates``, ``amounts``, ``parties``, ``references``; entity fields that
+are absent are not scored for that document. Documents are processed in
+chunks on a process pool and each chunk comes back as a fixed-layout count
+vector, so aggregation is a handful of element-wise sums.
 """
 
 from __future__ import annotations
 
+import argparse
+import json
 import logging
-from typing import Any, Dict
+import operator
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
 
-from .models import ProcessingResult
+from .agents import DOC_TYPE_RULES, EXTRACTORS
+from .config import settings
+from .models import DocumentMetadata, ProcessingResult
+from .observability import configure_logging
+from .orchestrator import DocumentProcessingOrchestrator
+from .party_registry import normalize_party_name
+from .result_index import normalize_reference
+from .tools import DocumentParserTool
 
 logger = logging.getLogger(__name__)
 
+DOC_TYPE_LABELS = tuple(doc_type for doc_type, _, _ in DOC_TYPE_RULES) + (
+    "General Document",
+    "Other",  # gold labels the classifier cannot produce
+)
+
+# Count vector layout: per field (tp, fp, fn, labeled documents), then the
+# doc-type confusion matrix (gold row-major), then documents processed.
+_FIELD_SLOTS = 4
+_MATRIX_OFFSET = len(EXTRACTORS) * _FIELD_SLOTS
+_DOCUMENTS = _MATRIX_OFFSET + len(DOC_TYPE_LABELS) ** 2
+_VECTOR_LEN = _DOCUMENTS + 1
+
+
+def _normalize_date(value: str) -> str:
+    parsed = DocumentParserTool.parse_date(value)
+    return parsed.isoformat() if parsed else value.strip().lower()
+
+
+def _normalize_amount(value: str) -> str:
+    parsed = DocumentParserTool.parse_amount(value)
+    return f"{parsed:.2f}" if parsed is not None else value.strip()
+
+
+_NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    "dates": _normalize_date,
+    "amounts": _normalize_amount,
+    "parties": normalize_party_name,
+    "references": normalize_reference,
+}
+
+
+def _label_index(doc_type: str | None) -> int:
+    try:
+        return DOC_TYPE_LABELS.index(doc_type)
+    except ValueError:
+        return len(DOC_TYPE_LABELS) - 1
+
+
+def score_document(
+    record: Dict[str, Any], metadata: DocumentMetadata, counts: array
+) -> List[Dict[str, Any]]:
+    """Add one document's outcome to ``counts``; returns its mismatches."""
+    mismatches: List[Dict[str, Any]] = []
+    for idx, field in enumerate(EXTRACTORS):
+        gold_values = record.get(field)
+        if gold_values is None:
+            continue
+        normalize = _NORMALIZERS[field]
+        gold: Set[str] = {normalize(v) for v in gold_values}
+        predicted: Set[str] = {normalize(v) for v in getattr(metadata, field)}
+        base = idx * _FIELD_SLOTS
+        counts[base] += len(gold & predicted)
+        counts[base + 1] += len(predicted - gold)
+        counts[base + 2] += len(gold - predicted)
+        counts[base + 3] += 1
+        if gold != predicted:
+            mismatches.append(
+                {
+                    "field": field,
+                    "missing": sorted(gold - predicted),
+                    "unexpected": sorted(predicted - gold),
+                }
+            )
+
+    if "doc_type" in record:
+        gold_idx = _label_index(record["doc_type"])
+        predicted_idx = _label_index(metadata.doc_type)
+        counts[_MATRIX_OFFSET + gold_idx * len(DOC_TYPE_LABELS) + predicted_idx] += 1
+        if gold_idx != predicted_idx:
+            mismatches.append(
+                {"field": "doc_type", "expected": record["doc_type"], "actual": metadata.doc_type}
+            )
+    counts[_DOCUMENTS] += 1
+    return mismatches
+
+
+_worker_orchestrator: DocumentProcessingOrchestrator | None = None
+
+
+def _init_worker():
+    global _worker_orchestrator
+    _worker_orchestrator = DocumentProcessingOrchestrator()
+
+
+def score_chunk(
+    lines: Sequence[str], max_examples: int = 20
+) -> Tuple[array, List[Dict[str, Any]]]:
+    """Process and score a chunk of raw JSONL lines in the current worker."""
+    if _worker_orchestrator is None:
+        _init_worker()
+    counts = array("q", bytes(8 * _VECTOR_LEN))
+    examples: List[Dict[str, Any]] = []
+    for line in lines:
+        record = json.loads(line)
+        result = _worker_orchestrator.process_document(
+            record["document_text"], record.get("document_id")
+        )
+        mismatches = score_document(record, result.metadata, counts)
+        if mismatches and len(examples) < max_examples:
+            examples.append({"document_id": result.document_id, "mismatches": mismatches})
+    # Sessions are per document; dropping them keeps long runs flat in memory.
+    _worker_orchestrator.session_service.sessions.clear()
+    return counts, examples
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for line in lines:
+        if line.strip():
+            chunk.append(line)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _f1(precision: float, recall: float) -> float:
+    return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+
+def _ratio(numerator: int, denominator: int) -> float:
+    return numerator / denominator if denominator else 0.0
+
+
+def build_report(
+    counts: Sequence[int], examples: List[Dict[str, Any]], elapsed_s: float
+) -> Dict[str, Any]:
+    """Turn an aggregated count vector into precision/recall/F1 and a confusion matrix."""
+    fields = {}
+    for idx, field in enumerate(EXTRACTORS):
+        tp, fp, fn, labeled = counts[idx * _FIELD_SLOTS : (idx + 1) * _FIELD_SLOTS]
+        if not labeled:
+            continue
+        precision, recall = _ratio(tp, tp + fp), _ratio(tp, tp + fn)
+        fields[field] = {
+            "precision": round(precision, 4),
+            "recall": round(recall, 4),
+            "f1": round(_f1(precision, recall), 4),
+            "tp": tp,
+            "fp": fp,
+            "fn": fn,
+            "documents": labeled,
+        }
+
+    size = len(DOC_TYPE_LABELS)
+    cells = counts[_MATRIX_OFFSET:_DOCUMENTS]
+    matrix = [list(cells[row * size : (row + 1) * size]) for row in range(size)]
+    labeled_types = sum(map(sum, matrix))
+    per_class = {}
+    for idx, label in enumerate(DOC_TYPE_LABELS):
+        support = sum(matrix[idx])
+        predicted = sum(row[idx] for row in matrix)
+        if not support and not predicted:
+            continue
+        precision, recall = _ratio(matrix[idx][idx], predicted), _ratio(matrix[idx][idx], support)
+        per_class[label] = {
+            "precision": round(precision, 4),
+            "recall": round(recall, 4),
+            "f1": round(_f1(precision, recall), 4),
+            "support": support,
+        }
+
+    documents = counts[_DOCUMENTS]
+    return {
+        "documents": documents,
+        "elapsed_s": round(elapsed_s, 3),
+        "docs_per_sec": round(_ratio(documents, elapsed_s), 1) if elapsed_s else None,
+        "fields": fields,
+        "doc_type": {
+            "accuracy": round(_ratio(sum(matrix[i][i] for i in range(size)), labeled_types), 4),
+            "labels": list(DOC_TYPE_LABELS),
+            "confusion_matrix": matrix,
+            "per_class": per_class,
+        },
+        "examples": examples,
+    }
+
+
+def evaluate_corpus(
+    path: str | os.PathLike,
+    workers: int | None = None,
+    chunk_size: int = 500,
+    max_examples: int = 50,
+) -> Dict[str, Any]:
+    """
+    Score the pipeline against a labeled JSONL corpus.
+
+    ``workers`` defaults to the CPU count; ``0`` runs in-process. At most two
+    chunks per worker are in flight, so the corpus is streamed rather than
+    loaded.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    totals = array("q", bytes(8 * _VECTOR_LEN))
+    examples: List[Dict[str, Any]] = []
+
+    def collect(counts: array, chunk_examples: List[Dict[str, Any]]):
+        totals[:] = array("q", map(operator.add, totals, counts))
+        examples.extend(chunk_examples[: max_examples - len(examples)])
+
+    start = time.perf_counter()
+    with open(path, encoding="utf-8") as handle:
+        chunks = _chunks(handle, chunk_size)
+        if workers <= 0:
+            for chunk in chunks:
+                collect(*score_chunk(chunk, max_examples))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                pending: Set[Future] = set()
+                for chunk in chunks:
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(*future.result())
+                    pending.add(pool.submit(score_chunk, chunk, max_examples))
+                for future in pending:
+                    collect(*future.result())
+    elapsed = time.perf_counter() - start
+
+    report = build_report(totals, examples, elapsed)
+    logger.info(
+        "Evaluated %s documents in %.1fs (doc type accuracy %.3f)",
+        report["documents"],
+        elapsed,
+        report["doc_type"]["accuracy"],
+    )
+    return report
+
 
 class AgentEvaluator:
     """Evaluation framework for measuring agent performance."""
@@ -47,6 +300,20 @@ class AgentEvaluator:
             result.processing_time_ms,
         )
 
+    def evaluate_corpus(
+        self,
+        path: str | os.PathLike,
+        workers: int | None = None,
+        chunk_size: int = 500,
+        report_path: str | os.PathLike | None = None,
+    ) -> Dict[str, Any]:
+        """Accuracy evaluation over a labeled corpus (see ``evaluate_corpus``)."""
+        report = evaluate_corpus(path, workers=workers, chunk_size=chunk_size)
+        self.metrics["corpus_report"] = report
+        if report_path is not None:
+            Path(report_path).write_text(json.dumps(report, indent=2))
+        return report
+
     def get_report(self) -> Dict[str, Any]:
         """Get evaluation report."""
         completeness_scores = self.metrics["extraction_completeness"]
@@ -62,3 +329,41 @@ class AgentEvaluator:
             "avg_extraction_completeness": round(avg_completeness, 2),
         }
 
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Score the pipeline against a labeled JSONL corpus."
+    )
+    parser.add_argument("corpus", type=Path, help="Labeled JSONL corpus")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--report", type=Path, help="Write the full JSON report here")
+    parser.add_argument(
+        "--min-f1", type=float, default=None, help="Exit non-zero if any field F1 falls below this"
+    )
+    args = parser.parse_args(argv)
+
+    configure_logging(settings.log_mode, level=logging.WARNING, sample_rate=settings.log_sample_rate)
+    report = AgentEvaluator().evaluate_corpus(
+        args.corpus, workers=args.workers, chunk_size=args.chunk_size, report_path=args.report
+    )
+
+    print(
+        f"{report['documents']} documents in {report['elapsed_s']}s"
+        f" ({report['docs_per_sec']} docs/sec)"
+    )
+    print(f"doc type accuracy: {report['doc_type']['accuracy']:.4f}")
+    for field, scores in report["fields"].items():
+        print(
+            f"{field:<11} P={scores['precision']:.4f} R={scores['recall']:.4f} F1={scores['f1']:.4f}"
+        )
+
+    if args.min_f1 is not None:
+        failing = [f for f, scores in report["fields"].items() if scores["f1"] < args.min_f1]
+        if failing:
+            print(f"F1 below {args.min_f1} for: {', '.join(failing)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
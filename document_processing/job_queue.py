@@ -0,0 +1,539 @@
+"""
+Durable SQLite-backed job queue and worker runner for bulk document processing.
+
+Jobs are leased in batches with a visibility timeout. A worker that crashes
+simply lets its lease expire and the jobs become visible again, giving
+at-least-once delivery. Failed and expired jobs are retried with exponential
+backoff and moved to a dead-letter table once they exhaust their attempts, so
+a document that keeps crashing its worker cannot circulate forever.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .config import settings
+from .metrics import percentile
+from .observability import configure_logging
+from .orchestrator import DocumentProcessingOrchestrator
+from .scheduler import PRIORITY_NAMES, PRIORITY_NORMAL, PriorityRules
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    document_id TEXT NOT NULL,
+    document_text TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    leased_by TEXT,
+    lease_expires_at REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 2,
+    schedule_key REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_available ON jobs (available_at);
+CREATE TABLE IF NOT EXISTS results (
+    job_id INTEGER PRIMARY KEY,
+    document_id TEXT NOT NULL,
+    result_json TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 2,
+    created_at REAL
+);
+CREATE INDEX IF NOT EXISTS results_document ON results (document_id);
+CREATE TABLE IF NOT EXISTS dead_letter (
+    job_id INTEGER PRIMARY KEY,
+    document_id TEXT NOT NULL,
+    document_text TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    failed_at REAL NOT NULL
+);
+"""
+
+# Columns added after the first release; older queue files are migrated on open.
+_ADDED_COLUMNS = {
+    "jobs": (
+        ("priority", "INTEGER NOT NULL DEFAULT 2"),
+        ("schedule_key", "REAL NOT NULL DEFAULT 0"),
+    ),
+    "results": (
+        ("priority", "INTEGER NOT NULL DEFAULT 2"),
+        ("created_at", "REAL"),
+    ),
+}
+
+
+@dataclass
+class Job:
+    """A leased unit of work."""
+
+    id: int
+    document_id: str
+    document_text: str
+    attempts: int
+    priority: int = PRIORITY_NORMAL
+    created_at: float | None = None
+    leased_by: str | None = None  # with ``attempts``, identifies the lease
+
+
+class SQLiteJobQueue:
+    """
+    Queue with enqueue/lease/ack/fail semantics stored in a single SQLite file.
+
+    A job is "visible" when ``available_at`` has passed; leasing pushes
+    ``available_at`` forward by the visibility timeout, so expired leases need
+    no separate sweep.
+
+    Visible jobs are leased in ``schedule_key`` order, where the key is
+    ``available_at + priority * aging_s`` (see ``scheduler``). With
+    ``priority_rules`` set, documents are pre-scanned on enqueue; without it
+    every job is normal priority and the queue stays FIFO.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_attempts: int = 5,
+        backoff_base_s: float = 2.0,
+        backoff_max_s: float = 300.0,
+        priority_rules: PriorityRules | None = None,
+        aging_s: float = 30.0,
+    ):
+        self.path = str(path)
+        self.max_attempts = max_attempts
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.priority_rules = priority_rules
+        self.aging_s = aging_s
+
+        self.conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_schedule ON jobs (schedule_key, id)"
+        )
+
+    def _migrate(self):
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for name, definition in columns:
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+                    if name == "schedule_key":
+                        self.conn.execute(
+                            "UPDATE jobs SET schedule_key = available_at + priority * ?",
+                            (self.aging_s,),
+                        )
+
+    def close(self):
+        self.conn.close()
+
+    def _priority(self, document_text: str, priority: int | None) -> int:
+        if priority is not None:
+            return priority
+        if self.priority_rules is None:
+            return PRIORITY_NORMAL
+        return self.priority_rules.prescan(document_text).priority
+
+    def enqueue(
+        self, document_text: str, document_id: str | None = None, priority: int | None = None
+    ) -> int:
+        """Add a single document and return its job id."""
+        now = time.time()
+        priority = self._priority(document_text, priority)
+        cursor = self.conn.execute(
+            "INSERT INTO jobs (document_id, document_text, available_at, created_at,"
+            " priority, schedule_key) VALUES (?, ?, ?, ?, ?, ?)",
+            (document_id or "", document_text, now, now, priority, now + priority * self.aging_s),
+        )
+        job_id = cursor.lastrowid
+        if not document_id:
+            self.conn.execute("UPDATE jobs SET document_id = ? WHERE id = ?", (f"job_{job_id}", job_id))
+        return job_id
+
+    def enqueue_many(self, documents: Iterable[Tuple[str, str | None]]) -> int:
+        """Add many ``(document_text, document_id)`` pairs in one transaction."""
+        now = time.time()
+        rows = []
+        for text, doc_id in documents:
+            priority = self._priority(text, None)
+            rows.append((doc_id or "", text, now, now, priority, now + priority * self.aging_s))
+        with self._transaction():
+            cursor = self.conn.executemany(
+                "INSERT INTO jobs (document_id, document_text, available_at, created_at,"
+                " priority, schedule_key) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            count = cursor.rowcount
+            self.conn.execute(
+                "UPDATE jobs SET document_id = 'job_' || id WHERE document_id = ''"
+            )
+        return count
+
+    def lease(self, worker_id: str, batch_size: int = 64, visibility_timeout_s: float = 60.0) -> List[Job]:
+        """
+        Lease up to ``batch_size`` visible jobs for ``worker_id``.
+
+        Leased jobs stay invisible for ``visibility_timeout_s`` seconds; if they
+        are neither acked nor failed by then they are handed out again after
+        the same backoff as a failure, or dead-lettered once out of attempts.
+        """
+        now = time.time()
+        with self._transaction(immediate=True):
+            self._expire_leases(now)
+            rows = self.conn.execute(
+                "SELECT id, document_id, document_text, attempts, priority, created_at FROM jobs"
+                " WHERE available_at <= ? ORDER BY schedule_key, id LIMIT ?",
+                (now, batch_size),
+            ).fetchall()
+            if rows:
+                self.conn.executemany(
+                    "UPDATE jobs SET attempts = attempts + 1, leased_by = ?,"
+                    " lease_expires_at = ?, available_at = ? WHERE id = ?",
+                    (
+                        (worker_id, now + visibility_timeout_s, now + visibility_timeout_s, row[0])
+                        for row in rows
+                    ),
+                )
+        return [
+            Job(
+                id=r[0],
+                document_id=r[1],
+                document_text=r[2],
+                attempts=r[3] + 1,
+                priority=r[4],
+                created_at=r[5],
+                leased_by=worker_id,
+            )
+            for r in rows
+        ]
+
+    def _expire_leases(self, now: float):
+        """Back off or dead-letter jobs whose lease ran out without an ack or fail."""
+        expired = self.conn.execute(
+            "SELECT id, document_id, document_text, attempts, available_at FROM jobs"
+            " WHERE available_at <= ? AND lease_expires_at IS NOT NULL",
+            (now,),
+        ).fetchall()
+        for job_id, document_id, document_text, attempts, expired_at in expired:
+            if attempts >= self.max_attempts:
+                error = f"lease expired after {attempts} attempts"
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO dead_letter"
+                    " (job_id, document_id, document_text, attempts, last_error, failed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, document_id, document_text, attempts, error, now),
+                )
+                self.conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                logger.warning("Job %s (%s) dead-lettered: %s", job_id, document_id, error)
+                continue
+            # leased_by is kept so a slow worker can still ack until the job is re-leased.
+            retry_at = expired_at + self.backoff_s(attempts)
+            self.conn.execute(
+                "UPDATE jobs SET available_at = ?, schedule_key = ? + priority * ?,"
+                " lease_expires_at = NULL, last_error = 'lease expired' WHERE id = ?",
+                (retry_at, retry_at, self.aging_s, job_id),
+            )
+
+    def ack(self, results: Sequence[Tuple[Job, Dict[str, Any]]]) -> List[Job]:
+        """
+        Store results for completed jobs and remove them from the queue.
+
+        Jobs whose lease is no longer held (it expired and the job was leased
+        again) are skipped and returned; the current lease holder owns them.
+        """
+        if not results:
+            return []
+        now = time.time()
+        stale = []
+        with self._transaction():
+            for job, result in results:
+                if not self._release(job):
+                    stale.append(job)
+                    continue
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO results"
+                    " (job_id, document_id, result_json, completed_at, priority, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (job.id, job.document_id, json.dumps(result), now, job.priority, job.created_at),
+                )
+        self._warn_stale("ack", stale)
+        return stale
+
+    def fail(self, failures: Sequence[Tuple[Job, str]]) -> List[Job]:
+        """
+        Schedule failed jobs for retry, or dead-letter them when out of attempts.
+
+        As with ``ack``, jobs whose lease is no longer held are skipped and returned.
+        """
+        if not failures:
+            return []
+        now = time.time()
+        stale = []
+        with self._transaction():
+            for job, error in failures:
+                if job.attempts < self.max_attempts:
+                    retry_at = now + self.backoff_s(job.attempts)
+                    cursor = self.conn.execute(
+                        "UPDATE jobs SET available_at = ?, schedule_key = ? + priority * ?,"
+                        " leased_by = NULL, lease_expires_at = NULL, last_error = ?"
+                        " WHERE id = ? AND leased_by = ? AND attempts = ?",
+                        (retry_at, retry_at, self.aging_s, error, job.id, job.leased_by, job.attempts),
+                    )
+                    if not cursor.rowcount:
+                        stale.append(job)
+                    continue
+                if not self._release(job):
+                    stale.append(job)
+                    continue
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO dead_letter"
+                    " (job_id, document_id, document_text, attempts, last_error, failed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (job.id, job.document_id, job.document_text, job.attempts, error, now),
+                )
+                logger.warning("Job %s (%s) dead-lettered: %s", job.id, job.document_id, error)
+        self._warn_stale("fail", stale)
+        return stale
+
+    def _release(self, job: Job) -> bool:
+        """Delete ``job`` if its lease is still the current one."""
+        cursor = self.conn.execute(
+            "DELETE FROM jobs WHERE id = ? AND leased_by = ? AND attempts = ?",
+            (job.id, job.leased_by, job.attempts),
+        )
+        return cursor.rowcount == 1
+
+    @staticmethod
+    def _warn_stale(action: str, stale: Sequence[Job]):
+        for job in stale:
+            logger.warning(
+                "Skipped %s of job %s (%s): lease held by %s expired",
+                action,
+                job.id,
+                job.document_id,
+                job.leased_by,
+            )
+
+    def backoff_s(self, attempts: int) -> float:
+        """Exponential backoff delay before the next attempt."""
+        return min(self.backoff_max_s, self.backoff_base_s * (2 ** max(0, attempts - 1)))
+
+    def get_result(self, document_id: str) -> Dict[str, Any] | None:
+        row = self.conn.execute(
+            "SELECT result_json FROM results WHERE document_id = ? ORDER BY job_id DESC LIMIT 1",
+            (document_id,),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT job_id, document_id, attempts, last_error, failed_at FROM dead_letter"
+            " ORDER BY job_id"
+        ).fetchall()
+        return [
+            {"job_id": r[0], "document_id": r[1], "attempts": r[2], "last_error": r[3], "failed_at": r[4]}
+            for r in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        now = time.time()
+        visible, leased, retrying = self.conn.execute(
+            "SELECT"
+            " COALESCE(SUM(available_at <= ?), 0),"
+            " COALESCE(SUM(available_at > ? AND lease_expires_at IS NOT NULL), 0),"
+            " COALESCE(SUM(available_at > ? AND lease_expires_at IS NULL), 0)"
+            " FROM jobs",
+            (now, now, now),
+        ).fetchone()
+        return {
+            "pending": visible,
+            "leased": leased,
+            "retry_scheduled": retrying,
+            "completed": self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0],
+            "dead_letter": self.conn.execute("SELECT COUNT(*) FROM dead_letter").fetchone()[0],
+        }
+
+    def latency_by_priority(self) -> Dict[str, Dict[str, float]]:
+        """Enqueue-to-completion latency percentiles (ms) for completed jobs, per priority."""
+        latencies: Dict[int, List[float]] = {}
+        for priority, latency_s in self.conn.execute(
+            "SELECT priority, completed_at - created_at FROM results"
+            " WHERE created_at IS NOT NULL ORDER BY 1, 2"
+        ):
+            latencies.setdefault(priority, []).append(latency_s * 1000)
+        return {
+            PRIORITY_NAMES[priority]: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p90_ms": round(percentile(values, 90), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+            }
+            for priority, values in latencies.items()
+        }
+
+    def _transaction(self, immediate: bool = False):
+        return _Transaction(self.conn, immediate)
+
+
+class _Transaction:
+    """Explicit BEGIN/COMMIT since the connection runs in autocommit mode."""
+
+    def __init__(self, conn: sqlite3.Connection, immediate: bool):
+        self.conn = conn
+        self.immediate = immediate
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE" if self.immediate else "BEGIN")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class JobWorker:
+    """Leases batches from the queue and runs them through the orchestrator."""
+
+    def __init__(
+        self,
+        queue: SQLiteJobQueue,
+        orchestrator: DocumentProcessingOrchestrator | None = None,
+        worker_id: str | None = None,
+        batch_size: int = 64,
+        visibility_timeout_s: float = 60.0,
+        poll_interval_s: float = 0.5,
+    ):
+        self.queue = queue
+        self.orchestrator = orchestrator or DocumentProcessingOrchestrator()
+        self.worker_id = worker_id or f"worker-{os.getpid()}"
+        self.batch_size = batch_size
+        self.visibility_timeout_s = visibility_timeout_s
+        self.poll_interval_s = poll_interval_s
+
+    def run_once(self) -> int:
+        """Process one leased batch; returns the number of jobs handled."""
+        jobs = self.queue.lease(self.worker_id, self.batch_size, self.visibility_timeout_s)
+        if not jobs:
+            return 0
+
+        done: List[Tuple[Job, Dict[str, Any]]] = []
+        failed: List[Tuple[Job, str]] = []
+        for job in jobs:
+            try:
+                result = self.orchestrator.process_document(job.document_text, job.document_id)
+            except Exception as exc:
+                logger.exception("%s: job %s failed", self.worker_id, job.id)
+                failed.append((job, f"{type(exc).__name__}: {exc}"))
+            else:
+                done.append((job, asdict(result)))
+
+        self.queue.ack(done)
+        self.queue.fail(failed)
+        return len(jobs)
+
+    def run(self, stop_when_idle: bool = False, max_batches: int | None = None):
+        """Poll the queue until stopped, optionally exiting once it drains."""
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            handled = self.run_once()
+            if handled:
+                batches += 1
+                continue
+            if stop_when_idle:
+                break
+            time.sleep(self.poll_interval_s)
+
+
+def _worker_main(path: str, batch_size: int, visibility_timeout_s: float, stop_when_idle: bool):
+    queue = SQLiteJobQueue(path)
+    try:
+        JobWorker(queue, batch_size=batch_size, visibility_timeout_s=visibility_timeout_s).run(
+            stop_when_idle=stop_when_idle
+        )
+    finally:
+        queue.close()
+
+
+def run_workers(
+    path: str | os.PathLike,
+    processes: int = 4,
+    batch_size: int = 64,
+    visibility_timeout_s: float = 60.0,
+    stop_when_idle: bool = False,
+):
+    """Start ``processes`` worker processes against the queue and wait for them."""
+    workers = [
+        multiprocessing.Process(
+            target=_worker_main,
+            args=(str(path), batch_size, visibility_timeout_s, stop_when_idle),
+            name=f"doc-worker-{idx}",
+        )
+        for idx in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description="Durable local job queue for document processing.")
+    parser.add_argument("--db", default="document_jobs.sqlite3", help="Queue database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Enqueue documents from a JSONL file")
+    enqueue.add_argument("jsonl", type=Path, help="Lines of {document_text, document_id}")
+    enqueue.add_argument(
+        "--prioritize", action="store_true", help="Pre-scan documents so urgent ones run first"
+    )
+
+    work = sub.add_parser("work", help="Run worker processes")
+    work.add_argument("--processes", type=int, default=4)
+    work.add_argument("--batch-size", type=int, default=64)
+    work.add_argument("--visibility-timeout", type=float, default=60.0)
+    work.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+
+    sub.add_parser("stats", help="Print queue counters")
+    args = parser.parse_args(argv)
+
+    configure_logging(settings.log_mode, level=logging.WARNING, sample_rate=settings.log_sample_rate)
+
+    if args.command == "enqueue":
+        queue = SQLiteJobQueue(args.db, priority_rules=PriorityRules() if args.prioritize else None)
+        with args.jsonl.open() as handle:
+            records = (json.loads(line) for line in handle if line.strip())
+            count = queue.enqueue_many((r["document_text"], r.get("document_id")) for r in records)
+        print(f"Enqueued {count} documents")
+    elif args.command == "work":
+        run_workers(
+            args.db,
+            processes=args.processes,
+            batch_size=args.batch_size,
+            visibility_timeout_s=args.visibility_timeout,
+            stop_when_idle=args.drain,
+        )
+    else:
+        queue = SQLiteJobQueue(args.db)
+        stats = queue.stats()
+        stats["latency_by_priority"] = queue.latency_by_priority()
+        print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+Open-loop load generator for the processing pipeline.
+
+Requests arrive on a fixed (Poisson) schedule regardless of how fast earlier
+ones complete, and latency is measured from each request's *scheduled*
+arrival time. A closed-loop client that waits for responses slows down with
+the system and hides queueing delay (coordinated omission); here a backlog
+shows up directly in the percentiles.
+
+Each phase offers one arrival rate to a pool of worker processes and reports
+throughput, latency percentiles and resident memory over time.
+``find_saturation`` ramps the rate until throughput stops keeping up or the
+p99 objective is missed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from .config import settings
+from .metrics import percentile
+from .observability import configure_logging
+from .orchestrator import DocumentProcessingOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SizeClass:
+    """A share of the synthetic traffic with documents of roughly ``chars`` characters."""
+
+    name: str
+    chars: int
+    weight: float
+
+
+DEFAULT_MIX = (
+    SizeClass("small", 600, 0.70),
+    SizeClass("medium", 6_000, 0.25),
+    SizeClass("large", 60_000, 0.05),
+)
+
+_VENDORS = ("Acme Corp", "Northwind Ltd", "Globex Inc", "Initech LLC", "Umbrella Corporation")
+_HEADERS = (
+    "INVOICE INV-{n}\nBill to: {vendor}\nDate: 2025-{month:02d}-{day:02d}",
+    "SERVICE AGREEMENT\nBetween: {vendor} and Tech Innovations LLC\nEffective: {month:02d}/{day:02d}/2025",
+    "QUARTERLY REPORT\nPrepared for {vendor}\nFindings summary for Q{quarter}",
+)
+
+
+def synthetic_document(chars: int, rng: random.Random) -> str:
+    """Invoice/contract/report-like text of about ``chars`` characters."""
+    lines = [
+        rng.choice(_HEADERS).format(
+            n=rng.randint(1000, 99999),
+            vendor=rng.choice(_VENDORS),
+            month=rng.randint(1, 12),
+            day=rng.randint(1, 28),
+            quarter=rng.randint(1, 4),
+        )
+    ]
+    size = len(lines[0])
+    while size < chars:
+        line = rng.choice(
+            (
+                f"Line item {rng.randint(1, 500)}: services rendered ${rng.randint(10, 90000):,}.00",
+                f"Reference PO-{rng.randint(10000, 99999)} applies to this section.",
+                f"Payment due by {rng.choice(('March', 'June', 'September'))} {rng.randint(1, 28)}, 2025",
+                "The parties agree to the terms and conditions set out in this document.",
+                "Please contact the account manager with any questions about this notice.",
+            )
+        )
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def synthetic_corpus(
+    mix: Sequence[SizeClass], variants: int = 8, seed: int = 0
+) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    return {
+        size.name: [synthetic_document(size.chars, rng) for _ in range(variants)] for size in mix
+    }
+
+
+def _orchestrator_target() -> Callable[[str, str], Any]:
+    return DocumentProcessingOrchestrator().process_document
+
+
+def _adk_tool_target() -> Callable[[str, str], Any]:
+    # Imported lazily: the ADK target needs google-adk and model settings.
+    from .adk_app import DocumentProcessingADKApp
+
+    return DocumentProcessingADKApp()._process_document_tool
+
+
+TARGETS: Dict[str, Callable[[], Callable[[str, str], Any]]] = {
+    "orchestrator": _orchestrator_target,
+    "adk-tool": _adk_tool_target,
+}
+
+_worker_call: Callable[[str, str], Any] | None = None
+_worker_corpus: Dict[str, List[str]] = {}
+
+
+def _init_worker(target: str, mix: Sequence[SizeClass], seed: int):
+    """Build the target and the document corpus once per worker process."""
+    global _worker_call, _worker_corpus
+    _worker_call = TARGETS[target]()
+    _worker_corpus = synthetic_corpus(mix, seed=seed)
+
+
+def _run_request(size: str, variant: int, document_id: str) -> Tuple[int, int | None]:
+    _worker_call(_worker_corpus[size][variant], document_id)
+    return os.getpid(), rss_kib()
+
+
+def _warm_up() -> Tuple[int, int | None]:
+    return os.getpid(), rss_kib()
+
+
+def rss_kib() -> int | None:
+    """Current resident set size of this process (Linux ``/proc``), or None."""
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+@dataclass
+class LoadPhase:
+    """Outcome of offering one arrival rate for ``duration_s`` seconds."""
+
+    target_rps: float
+    offered_rps: float
+    throughput_rps: float
+    requests: int
+    completed: int
+    errors: int
+    incomplete: int  # still queued or running when the drain timeout hit
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+    max_ms: float
+    max_dispatch_lag_ms: float  # how far the generator itself fell behind schedule
+    rss_mib: List[Tuple[float, float]] = field(default_factory=list)  # (seconds, total MiB)
+    saturated: bool = False
+
+
+def run_phase(
+    rate_rps: float,
+    duration_s: float = 10.0,
+    workers: int | None = None,
+    target: str = "orchestrator",
+    mix: Sequence[SizeClass] = DEFAULT_MIX,
+    seed: int = 0,
+    drain_timeout_s: float | None = None,
+    sample_interval_s: float = 0.5,
+    slo_p99_ms: float = 1000.0,
+    min_efficiency: float = 0.9,
+) -> LoadPhase:
+    """
+    Offer ``rate_rps`` Poisson arrivals for ``duration_s`` seconds.
+
+    Requests still unfinished ``drain_timeout_s`` after the last arrival
+    (default: ``duration_s``) are counted at their age at that point, so an
+    overloaded phase cannot look fast by dropping its slowest requests.
+    """
+    workers = workers or os.cpu_count() or 1
+    drain_timeout_s = duration_s if drain_timeout_s is None else drain_timeout_s
+    rng = random.Random(seed)
+    names = [size.name for size in mix]
+    weights = [size.weight for size in mix]
+
+    offsets: List[float] = []
+    clock = rng.expovariate(rate_rps)
+    while clock < duration_s:
+        offsets.append(clock)
+        clock += rng.expovariate(rate_rps)
+
+    latencies: List[float] = []
+    finished: List[float] = []
+    worker_rss: Dict[int, int] = {}
+    recorded = bytearray(len(offsets))  # set once a request's outcome is counted
+    errors = 0
+    lock = threading.Lock()
+
+    def on_done(idx: int, intended: float, future: Future):
+        nonlocal errors
+        now = time.perf_counter()
+        with lock:
+            if recorded[idx] or future.cancelled():
+                return
+            recorded[idx] = 1
+            if future.exception() is not None:
+                errors += 1
+                return
+            pid, rss = future.result()
+            if rss is not None:
+                worker_rss[pid] = rss
+            latencies.append((now - intended) * 1000)
+            finished.append(now)
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(target, tuple(mix), seed)
+    )
+    try:
+        # Start every worker before the clock runs so start-up is not measured.
+        for warm in [pool.submit(_warm_up) for _ in range(workers)]:
+            pid, rss = warm.result()
+            if rss is not None:
+                worker_rss[pid] = rss
+
+        rss_samples: List[Tuple[float, float]] = []
+        futures: List[Tuple[float, Future]] = []
+        max_lag = 0.0
+        start = time.perf_counter()
+        next_sample = start
+
+        def sample_rss(now: float):
+            total = (rss_kib() or 0) + sum(worker_rss.values())
+            rss_samples.append((round(now - start, 3), round(total / 1024, 1)))
+
+        for idx, offset in enumerate(offsets):
+            intended = start + offset
+            now = time.perf_counter()
+            if intended > now:
+                time.sleep(intended - now)
+            else:
+                max_lag = max(max_lag, now - intended)
+            size = rng.choices(names, weights)[0]
+            future = pool.submit(_run_request, size, idx % 8, f"LOAD{idx}")
+            future.add_done_callback(partial(on_done, idx, intended))
+            futures.append((intended, future))
+            if intended >= next_sample:
+                sample_rss(intended)
+                next_sample = intended + sample_interval_s
+
+        deadline = start + duration_s + drain_timeout_s
+        pending = [f for _, f in futures if not f.done()]
+        while pending and time.perf_counter() < deadline:
+            wait(pending, timeout=min(sample_interval_s, max(0.0, deadline - time.perf_counter())))
+            sample_rss(time.perf_counter())
+            pending = [f for f in pending if not f.done()]
+
+        abandoned: List[Future] = []
+        with lock:
+            cutoff = time.perf_counter()
+            for idx, (intended, future) in enumerate(futures):
+                if not recorded[idx]:
+                    recorded[idx] = 1
+                    latencies.append((cutoff - intended) * 1000)
+                    abandoned.append(future)
+        # Cancelling runs done-callbacks inline, so it happens outside the lock.
+        for future in abandoned:
+            future.cancel()
+        incomplete = len(abandoned)
+        sample_rss(cutoff)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = (max(finished) if finished else cutoff) - start
+    elapsed = max(elapsed, offsets[-1] if offsets else duration_s, 1e-9)
+    completed = len(finished)
+    latencies.sort()
+    phase = LoadPhase(
+        target_rps=rate_rps,
+        offered_rps=round(len(offsets) / duration_s, 1),
+        throughput_rps=round(completed / elapsed, 1),
+        requests=len(offsets),
+        completed=completed,
+        errors=errors,
+        incomplete=incomplete,
+        p50_ms=round(percentile(latencies, 50), 2),
+        p99_ms=round(percentile(latencies, 99), 2),
+        p999_ms=round(percentile(latencies, 99.9), 2),
+        max_ms=round(latencies[-1], 2) if latencies else 0.0,
+        max_dispatch_lag_ms=round(max_lag * 1000, 2),
+        rss_mib=rss_samples,
+    )
+    phase.saturated = (
+        phase.incomplete > 0
+        or phase.errors > 0
+        or phase.p99_ms > slo_p99_ms
+        or phase.throughput_rps < min_efficiency * phase.offered_rps
+    )
+    logger.info(
+        "%.0f rps offered: %.1f rps done, p50 %.1fms p99 %.1fms%s",
+        phase.offered_rps,
+        phase.throughput_rps,
+        phase.p50_ms,
+        phase.p99_ms,
+        " (saturated)" if phase.saturated else "",
+    )
+    return phase
+
+
+def find_saturation(
+    start_rps: float = 50.0,
+    step_factor: float = 1.5,
+    max_rps: float = 100_000.0,
+    refine_steps: int = 2,
+    runner: Callable[..., LoadPhase] = run_phase,
+    **phase_options: Any,
+) -> Dict[str, Any]:
+    """
+    Ramp the arrival rate geometrically until a phase saturates, then bisect
+    between the last sustainable rate and the first saturated one.
+
+    Each phase is ``runner(rate, **phase_options)``; tests substitute a model
+    of the service for the real ``run_phase``.
+    """
+    phases: List[LoadPhase] = []
+    good: LoadPhase | None = None
+    bad: LoadPhase | None = None
+    rate = start_rps
+    while rate <= max_rps:
+        phase = runner(rate, **phase_options)
+        phases.append(phase)
+        if phase.saturated:
+            bad = phase
+            break
+        good = phase
+        rate *= step_factor
+
+    for _ in range(refine_steps if good and bad else 0):
+        phase = runner((good.target_rps + bad.target_rps) / 2, **phase_options)
+        phases.append(phase)
+        if phase.saturated:
+            bad = phase
+        else:
+            good = phase
+
+    return {
+        "max_sustainable_rps": good.throughput_rps if good else None,
+        "saturation_rps": bad.target_rps if bad else None,
+        "phases": [asdict(phase) for phase in phases],
+    }
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description="Open-loop load test for the pipeline.")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="orchestrator")
+    parser.add_argument("--rate", type=float, help="Offer a single rate (requests/sec)")
+    parser.add_argument("--find-saturation", action="store_true", help="Ramp until saturated")
+    parser.add_argument("--start-rate", type=float, default=50.0)
+    parser.add_argument("--step-factor", type=float, default=1.5)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--slo-p99-ms", type=float, default=1000.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.rate is None and not args.find_saturation:
+        parser.error("pass --rate or --find-saturation")
+
+    configure_logging(settings.log_mode, level=logging.WARNING, sample_rate=settings.log_sample_rate)
+    logger.setLevel(logging.INFO)
+    options = {
+        "duration_s": args.duration,
+        "workers": args.workers,
+        "target": args.target,
+        "seed": args.seed,
+        "slo_p99_ms": args.slo_p99_ms,
+    }
+    if args.find_saturation:
+        report = find_saturation(args.start_rate, args.step_factor, **options)
+    else:
+        report = asdict(run_phase(args.rate, **options))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
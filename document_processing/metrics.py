@@ -0,0 +1,16 @@
+"""
+Small statistics helpers shared by the HTTP service, job queue, scheduler
+and load test reports.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank ``pct`` percentile of already sorted values (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
@@ -50,4 +50,89 @@ class ProcessingResult:
     summary: str
     risks: List[RiskAssessment]
     processing_time_ms: int
+    degraded: bool = False  # True when a size or time budget cut processing short
 
+
+@dataclass
+class PartyRecord:
+    """Cross-document history for a normalized party name."""
+
+    key: str
+    display_name: str
+    document_count: int
+    first_seen_document: str
+    last_seen_document: str
+
+
+@dataclass
+class DuplicateMatch:
+    """A previously processed document that is likely a duplicate."""
+
+    document_id: str
+    similarity: float
+    shared_references: List[str]
+    shared_amounts: List[str]
+
+
+@dataclass
+class ChangeReport:
+    """Entity-level differences between a revision and the version it replaces."""
+
+    previous_document_id: str
+    document_id: str
+    changed_regions: int
+    rescanned_chars: int
+    doc_type_changed: bool
+    amounts_added: List[str]
+    amounts_removed: List[str]
+    dates_added: List[str]
+    dates_removed: List[str]
+    parties_added: List[str]
+    parties_removed: List[str]
+    references_added: List[str]
+    references_removed: List[str]
+    rerun_stages: List[str]
+
+
+# Stage names in the order the streaming API emits them.
+PIPELINE_STAGES = ("classified", "extracted", "actions", "summary", "risks", "done")
+
+
+@dataclass
+class StageEvent:
+    """Base class for events yielded by the streaming pipeline API."""
+
+    document_id: str
+    stage: str
+    elapsed_ms: float  # since processing of this document started
+
+
+@dataclass
+class DocumentClassified(StageEvent):
+    doc_type: str
+    confidence: float
+
+
+@dataclass
+class EntitiesExtracted(StageEvent):
+    metadata: DocumentMetadata
+
+
+@dataclass
+class ActionsIdentified(StageEvent):
+    action_items: List[ActionItem]
+
+
+@dataclass
+class SummaryGenerated(StageEvent):
+    summary: str
+
+
+@dataclass
+class RisksAssessed(StageEvent):
+    risks: List[RiskAssessment]
+
+
+@dataclass
+class ProcessingDone(StageEvent):
+    result: ProcessingResult
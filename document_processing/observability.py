@@ -0,0 +1,168 @@
+"""
+Logging configuration for the CLI, services and workers.
+
+``default`` mode mirrors the original ``logging.basicConfig`` setup: every
+agent step is logged synchronously. ``production`` mode is meant for the
+per-document hot path at high volume: callers only enqueue records, a
+background thread formats and writes them as JSON lines, per-stage detail is
+kept for a sample of documents, and each document produces one structured
+record with stage timings.
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from typing import IO, Any, Dict
+
+# One structured record per processed document is emitted on this logger.
+RECORDS_LOGGER = "document_processing.records"
+
+DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+PACKAGE_LOGGER = "document_processing"
+
+_listener: logging.handlers.QueueListener | None = None
+_detail_sample_rate: float | None = None
+# Per-document sampling decision; per context so concurrent documents don't
+# overwrite each other's choice.
+_detail_sampled: ContextVar[bool] = ContextVar("detail_sampled", default=False)
+
+
+class StructuredFormatter(logging.Formatter):
+    """Render records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        document = getattr(record, "document", None)
+        if document is not None:
+            payload["document"] = document
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, separators=(",", ":"))
+
+
+def _in_package(name: str) -> bool:
+    return name == PACKAGE_LOGGER or name.startswith(PACKAGE_LOGGER + ".")
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves message formatting to the listener thread.
+
+    The stock ``prepare`` formats every record in the calling thread, which
+    is exactly the cost production mode is trying to move off the hot path.
+    Only this package's records are deferred, since its log arguments are
+    immutable values; records from other loggers are formatted eagerly.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not _in_package(record.name):
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # the writer is behind; drop the record rather than block the caller
+
+
+class _DetailSampleFilter(logging.Filter):
+    """Drop package records below WARNING for documents outside the sample."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or _detail_sampled.get():
+            return True
+        if record.name == RECORDS_LOGGER:
+            return True
+        return not _in_package(record.name)
+
+
+def configure_logging(
+    mode: str = "default",
+    level: int = logging.INFO,
+    sample_rate: float = 0.01,
+    stream: IO[str] | None = None,
+    queue_size: int = 100_000,
+):
+    """
+    Configure root logging for ``mode`` (``"default"`` or ``"production"``).
+
+    In production mode the queue is bounded by ``queue_size``; when the
+    writer falls behind, records are dropped rather than blocking workers.
+    """
+    global _listener, _detail_sample_rate
+    shutdown_logging()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    stream = stream or sys.stderr
+
+    if mode == "default":
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(level)
+        return
+
+    if mode != "production":
+        raise ValueError(f"Unknown logging mode: {mode!r}")
+
+    writer = logging.StreamHandler(stream)
+    writer.setFormatter(StructuredFormatter())
+    records: queue.Queue = queue.Queue(maxsize=queue_size)
+    handler = _DeferredQueueHandler(records)
+    handler.addFilter(_DetailSampleFilter())
+    root.addHandler(handler)
+    root.setLevel(level)
+    logging.getLogger(RECORDS_LOGGER).setLevel(logging.INFO)
+    _detail_sample_rate = sample_rate
+    _detail_sampled.set(False)
+
+    _listener = logging.handlers.QueueListener(records, writer, respect_handler_level=True)
+    _listener.start()
+
+
+def begin_document():
+    """
+    Decide whether per-stage detail is logged for the next document.
+
+    The decision is kept in the current context and applied by the queue
+    handler's filter, so package records below WARNING from documents outside
+    the sample are dropped before they are enqueued. Sampling whole documents
+    keeps traces complete.
+    """
+    if _detail_sample_rate is None:
+        return
+    _detail_sampled.set(_detail_sample_rate > 0 and random.random() < _detail_sample_rate)
+
+
+def shutdown_logging():
+    """Flush and stop the background writer if one is running."""
+    global _listener, _detail_sample_rate
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    _detail_sample_rate = None
+
+
+atexit.register(shutdown_logging)
@@ -4,67 +4,175 @@ Main orchestrator coordinating the sequential agent pipeline.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Set, Tuple
 
 from .agents import (
+    DOC_TYPE_RULES,
     ActionItemsAgent,
     DocumentClassifierAgent,
     InformationExtractionAgent,
     RiskAssessmentAgent,
     SummaryGenerationAgent,
 )
-from .models import ProcessingResult
+from .budget import ProcessingBudget
+from .dedup import DuplicateDetector
+from .models import (
+    ActionsIdentified,
+    ChangeReport,
+    DocumentClassified,
+    DocumentMetadata,
+    EntitiesExtracted,
+    ProcessingDone,
+    ProcessingResult,
+    RisksAssessed,
+    StageEvent,
+    SummaryGenerated,
+)
+from .observability import RECORDS_LOGGER, begin_document
+from .party_registry import PartyRegistry
+from .revisions import RevisionStore, StoredVersion, added_entities
 from .session import InMemorySessionService, MemoryBank
+from .tiering import TierPlanner
 
 logger = logging.getLogger(__name__)
+records_logger = logging.getLogger(RECORDS_LOGGER)
+
+
+def new_document_id() -> str:
+    """
+    Default id for a document submitted without one. The random suffix keeps
+    ids from the same second apart, so a resend is indexed as a new document.
+    """
+    return f"doc_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
 
 class DocumentProcessingOrchestrator:
     """Coordinates all agents in sequence."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        party_registry: PartyRegistry | None = None,
+        duplicate_detector: DuplicateDetector | None = None,
+        tier_planner: TierPlanner | None = None,
+        budget: ProcessingBudget | None = None,
+        revision_store: RevisionStore | None = None,
+    ):
         self.session_service = InMemorySessionService()
         self.memory_bank = MemoryBank()
+        self.party_registry = party_registry
+        self.duplicate_detector = duplicate_detector
+        self.tier_planner = tier_planner
+        self.budget = budget or ProcessingBudget()
+        self.revision_store = revision_store
+        self._stream_executors: Set[ThreadPoolExecutor] = set()
 
         self.classifier = DocumentClassifierAgent(self.memory_bank)
-        self.extractor = InformationExtractionAgent(self.session_service)
+        self.extractor = InformationExtractionAgent(self.session_service, party_registry)
         self.action_agent = ActionItemsAgent()
         self.summarizer = SummaryGenerationAgent()
-        self.risk_assessor = RiskAssessmentAgent()
+        self.risk_assessor = RiskAssessmentAgent(party_registry)
 
         logger.info("DocumentProcessingOrchestrator initialized")
 
     def process_document(self, document_text: str, document_id: str | None = None) -> ProcessingResult:
         """Main processing pipeline."""
+        for event in self.stream_document(document_text, document_id):
+            pass
+        return event.result
+
+    def stream_document(
+        self, document_text: str, document_id: str | None = None
+    ) -> Iterator[StageEvent]:
+        """
+        Run the pipeline, yielding a typed event as each stage completes.
+
+        Events arrive in order ``classified``, ``extracted``, ``actions``,
+        ``summary``, ``risks``, ``done``. Closing the generator early (e.g.
+        breaking out of the loop once the doc type is known) cancels the
+        stages that have not run yet.
+        """
         start_time = datetime.now()
+        begin_document()
 
         if not document_id:
-            document_id = f"doc_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            document_id = new_document_id()
 
         logger.info("=== Starting document processing: %s ===", document_id)
 
         session_id = f"session_{document_id}"
         self.session_service.create_session(session_id)
+        self.session_service.update_state(session_id, "document_id", document_id)
+
+        timings: Dict[str, float] = {}
+        stage_start = time.perf_counter()
+        deadline = self.budget.document_deadline(stage_start)
 
-        doc_type, confidence = self.classifier.classify(document_text)
+        # Every stage sees the same bounded scan window of the text.
+        scan_text, degraded = self.budget.scan_window(document_text)
+        if degraded:
+            logger.warning(
+                "%s: %s chars exceeds budget, scanning first %s",
+                document_id,
+                len(document_text),
+                len(scan_text),
+            )
+
+        doc_type, confidence = self.classifier.classify(scan_text)
         self.session_service.update_state(session_id, "doc_type", doc_type)
         self.session_service.update_state(session_id, "confidence", confidence)
+        stage_start = self._record_stage(timings, "classify", stage_start)
+        yield DocumentClassified(
+            document_id, "classified", self._elapsed_ms(start_time), doc_type, confidence
+        )
 
-        metadata = self.extractor.extract(document_text, session_id)
+        tier, extractors = None, None
+        if self.tier_planner is not None:
+            tier, extractors = self.tier_planner.plan(doc_type, scan_text)
+            self.session_service.update_state(session_id, "pipeline_tier", tier)
+
+        metadata = self.extractor.extract(
+            scan_text, session_id, extractors, self.budget.stage_deadline(deadline)
+        )
+        if self.session_service.get_state(session_id, "skipped_scans"):
+            degraded = True
         self.session_service.update_state(session_id, "metadata", asdict(metadata))
+        stage_start = self._record_stage(timings, "extract", stage_start)
+        yield EntitiesExtracted(document_id, "extracted", self._elapsed_ms(start_time), metadata)
 
-        action_items = self.action_agent.identify_actions(metadata, document_text)
+        action_items = self.action_agent.identify_actions(metadata, scan_text)
         self.session_service.update_state(
             session_id, "action_items", [asdict(a) for a in action_items]
         )
+        stage_start = self._record_stage(timings, "actions", stage_start)
+        yield ActionsIdentified(document_id, "actions", self._elapsed_ms(start_time), action_items)
 
         summary = self.summarizer.generate_summary(metadata, action_items)
         self.session_service.update_state(session_id, "summary", summary)
+        stage_start = self._record_stage(timings, "summary", stage_start)
+        yield SummaryGenerated(document_id, "summary", self._elapsed_ms(start_time), summary)
 
-        risks = self.risk_assessor.assess_risks(metadata, document_text)
+        duplicates = None
+        if self.duplicate_detector is not None and time.perf_counter() > deadline:
+            logger.warning("%s: Time budget exhausted, skipping duplicate check", document_id)
+            degraded = True
+        elif self.duplicate_detector is not None:
+            duplicates = self.duplicate_detector.check_and_add(document_id, scan_text, metadata)
+            self.session_service.update_state(
+                session_id, "duplicates", [asdict(d) for d in duplicates]
+            )
+            stage_start = self._record_stage(timings, "dedup", stage_start)
+
+        risks = self.risk_assessor.assess_risks(metadata, scan_text, duplicates)
         self.session_service.update_state(session_id, "risks", [asdict(r) for r in risks])
+        self._record_stage(timings, "risks", stage_start)
+        yield RisksAssessed(document_id, "risks", self._elapsed_ms(start_time), risks)
 
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
 
@@ -88,8 +196,215 @@ class DocumentProcessingOrchestrator:
             summary=summary,
             risks=risks,
             processing_time_ms=int(processing_time),
+            degraded=degraded,
         )
 
+        if self.revision_store is not None:
+            self.revision_store.remember(
+                document_id, StoredVersion(document_id, 0, scan_text, result)
+            )
+
         logger.info("=== Processing complete: %s (%.2fms) ===", document_id, processing_time)
-        return result
+        if records_logger.isEnabledFor(logging.INFO):
+            records_logger.info(
+                "Document processed: %s",
+                document_id,
+                extra={
+                    "document": {
+                        "document_id": document_id,
+                        "doc_type": doc_type,
+                        "tier": tier,
+                        "degraded": degraded,
+                        "chars": len(document_text),
+                        "stage_ms": timings,
+                        "total_ms": round(processing_time, 3),
+                        "counts": {
+                            "dates": len(metadata.dates),
+                            "amounts": len(metadata.amounts),
+                            "parties": len(metadata.parties),
+                            "references": len(metadata.references),
+                            "actions": len(action_items),
+                            "risks": len(risks),
+                        },
+                    }
+                },
+            )
+        yield ProcessingDone(document_id, "done", round(processing_time, 3), result)
+
+    async def astream_document(
+        self, document_text: str, document_id: str | None = None
+    ) -> AsyncIterator[StageEvent]:
+        """
+        Async counterpart of ``stream_document``.
+
+        All stages of a document run on one worker thread of their own (stage
+        code may hold thread-bound resources such as SQLite connections), so
+        the event loop stays responsive. If the consumer stops iterating, the
+        stages not yet started are cancelled; a stage already running
+        finishes first.
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="doc-stream")
+        self._stream_executors.add(executor)
+        stages = self.stream_document(document_text, document_id)
+        try:
+            while True:
+                event = await asyncio.wrap_future(executor.submit(next, stages, None))
+                if event is None:
+                    return
+                yield event
+        finally:
+            # Queued behind any running stage, so the generator closes on its own thread.
+            closing = executor.submit(stages.close)
+            closing.add_done_callback(lambda _: self._stream_executors.discard(executor))
+            executor.shutdown(wait=False)
+
+    def close(self):
+        """Wait for streams that are still finishing a stage after being abandoned."""
+        for executor in list(self._stream_executors):
+            executor.shutdown(wait=True)
+        self._stream_executors.clear()
+
+    def process_revision(
+        self, prev_result_id: str, new_text: str, document_id: str | None = None
+    ) -> Tuple[ProcessingResult, ChangeReport]:
+        """
+        Reprocess a revised document against a stored previous version.
+
+        Only changed regions are rescanned for entities, and downstream stages
+        rerun only when their inputs changed: classification when a changed
+        region contains a doc-type keyword, actions and risks when metadata
+        changed or a changed region contains one of their trigger phrases,
+        and the summary when metadata or actions changed. Revisions skip the
+        duplicate check and party registry updates.
+        """
+        if self.revision_store is None:
+            raise ValueError("process_revision requires a revision_store")
+
+        start_time = datetime.now()
+        begin_document()
+        scan_text, degraded = self.budget.scan_window(new_text)
+        diff = self.revision_store.diff(prev_result_id, scan_text)
+        previous = diff.previous.result
+        revision = self.revision_store.next_revision(diff.previous.root_id)
+        if not document_id:
+            document_id = f"{diff.previous.root_id}_rev{revision}"
+
+        logger.info("=== Processing revision %s of %s ===", document_id, prev_result_id)
+        session_id = f"session_{document_id}"
+        self.session_service.create_session(session_id)
+        self.session_service.update_state(session_id, "document_id", document_id)
+        self.session_service.update_state(session_id, "previous_document_id", prev_result_id)
+
+        rerun: List[str] = []
+        doc_type, confidence = previous.metadata.doc_type, previous.metadata.confidence
+        doc_type_keywords = [word for _, _, words in DOC_TYPE_RULES for word in words]
+        if self._mentions(diff.changed_text, doc_type_keywords):
+            doc_type, confidence = self.classifier.classify(scan_text)
+            rerun.append("classify")
+        self.session_service.update_state(session_id, "doc_type", doc_type)
+        self.session_service.update_state(session_id, "confidence", confidence)
+
+        if diff.changed_regions:
+            rerun.append("extract")
+        found = diff.found
+        metadata = DocumentMetadata(
+            doc_type=doc_type,
+            confidence=confidence,
+            dates=found["dates"][:5],
+            amounts=found["amounts"][:5],
+            parties=found["parties"][:5],
+            references=found["references"][:5],
+        )
+        metadata_changed = metadata != previous.metadata
+        self.session_service.update_state(session_id, "metadata", asdict(metadata))
+
+        action_items = previous.action_items
+        if metadata_changed or self._mentions(diff.changed_text, ActionItemsAgent.TEXT_TRIGGERS):
+            action_items = self.action_agent.identify_actions(metadata, scan_text)
+            rerun.append("actions")
+        self.session_service.update_state(
+            session_id, "action_items", [asdict(a) for a in action_items]
+        )
+
+        summary = previous.summary
+        if metadata_changed or action_items != previous.action_items:
+            summary = self.summarizer.generate_summary(metadata, action_items)
+            rerun.append("summary")
+        self.session_service.update_state(session_id, "summary", summary)
+
+        risks = previous.risks
+        if metadata_changed or self._mentions(diff.changed_text, RiskAssessmentAgent.TEXT_TRIGGERS):
+            risks = self.risk_assessor.assess_risks(metadata, scan_text)
+            rerun.append("risks")
+        self.session_service.update_state(session_id, "risks", [asdict(r) for r in risks])
+
+        previous_found = diff.previous_found
+        report = ChangeReport(
+            previous_document_id=prev_result_id,
+            document_id=document_id,
+            changed_regions=diff.changed_regions,
+            rescanned_chars=diff.rescanned_chars,
+            doc_type_changed=doc_type != previous.metadata.doc_type,
+            amounts_added=added_entities(found["amounts"], previous_found["amounts"]),
+            amounts_removed=added_entities(previous_found["amounts"], found["amounts"]),
+            dates_added=added_entities(found["dates"], previous_found["dates"]),
+            dates_removed=added_entities(previous_found["dates"], found["dates"]),
+            parties_added=added_entities(found["parties"], previous_found["parties"]),
+            parties_removed=added_entities(previous_found["parties"], found["parties"]),
+            references_added=added_entities(found["references"], previous_found["references"]),
+            references_removed=added_entities(previous_found["references"], found["references"]),
+            rerun_stages=rerun,
+        )
+        self.session_service.update_state(session_id, "change_report", asdict(report))
+
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
+        result = ProcessingResult(
+            document_id=document_id,
+            timestamp=datetime.now().isoformat(),
+            metadata=metadata,
+            action_items=action_items,
+            summary=summary,
+            risks=risks,
+            processing_time_ms=int(processing_time),
+            degraded=degraded,
+        )
+        self.revision_store.remember(
+            document_id,
+            StoredVersion(
+                diff.previous.root_id,
+                revision,
+                scan_text,
+                result,
+                diff.chunks,
+                diff.entities,
+                diff.found,
+            ),
+        )
+
+        logger.info(
+            "=== Revision complete: %s (%.2fms, reran %s) ===",
+            document_id,
+            processing_time,
+            ", ".join(rerun) or "nothing",
+        )
+        return result, report
+
+    @staticmethod
+    def _mentions(text_lower: str, phrases: Iterable[str]) -> bool:
+        return bool(text_lower) and any(phrase in text_lower for phrase in phrases)
+
+    @staticmethod
+    def _elapsed_ms(start_time: datetime) -> float:
+        return round((datetime.now() - start_time).total_seconds() * 1000, 3)
+
+    @staticmethod
+    def _record_stage(timings: Dict[str, float], stage: str, started: float) -> float:
+        now = time.perf_counter()
+        timings[stage] = round((now - started) * 1000, 3)
+        return now
 
+    def process_batch(
+        self, documents: Iterable[Tuple[str, str | None]]
+    ) -> List[ProcessingResult]:
+        """Process several ``(document_text, document_id)`` pairs in order."""
+        return [self.process_document(text, doc_id) for text, doc_id in documents]
@@ -0,0 +1,280 @@
+"""
+Persistent cross-document registry of parties (vendors, customers, counterparties).
+
+Records live in SQLite so the registry survives restarts and its footprint is
+bounded by the page cache rather than by the number of parties. A bounded
+in-process cache keeps repeat lookups of active vendors to a dict hit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from .models import PartyRecord
+
+logger = logging.getLogger(__name__)
+
+LEGAL_SUFFIXES = {
+    "inc",
+    "incorporated",
+    "llc",
+    "corp",
+    "corporation",
+    "ltd",
+    "limited",
+    "co",
+    "company",
+    "plc",
+    "gmbh",
+    "lp",
+    "llp",
+}
+
+# Words the entity scanner picks up from the surrounding line ("From: Acme Inc").
+LEADING_NOISE = {"from", "to", "between", "and", "by", "with", "the", "bill", "billed", "vendor"}
+
+_NON_WORD = re.compile(r"[^\w]+")
+_VOWELS = re.compile(r"(?<!^)[aeiouy]")
+_REPEATS = re.compile(r"(.)\1+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parties (
+    key TEXT PRIMARY KEY,
+    display_name TEXT NOT NULL,
+    document_count INTEGER NOT NULL,
+    first_seen_document TEXT NOT NULL,
+    last_seen_document TEXT NOT NULL,
+    fuzzy_key TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS parties_fuzzy ON parties (fuzzy_key);
+CREATE TABLE IF NOT EXISTS observations (
+    document_id TEXT NOT NULL,
+    parties_hash TEXT NOT NULL,
+    PRIMARY KEY (document_id, parties_hash)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_party_name(name: str) -> str:
+    """Case-fold, drop punctuation, scanner noise words and legal suffixes."""
+    tokens = [t for t in _NON_WORD.sub(" ", name.casefold()).split() if t]
+    while tokens and tokens[0] in LEADING_NOISE:
+        tokens.pop(0)
+    while tokens and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def fuzzy_party_key(normalized: str) -> str:
+    """Order-insensitive consonant skeleton used to match spelling variants."""
+    skeletons = []
+    for token in normalized.split():
+        if len(token) > 3 and token.endswith("s"):
+            token = token[:-1]
+        skeletons.append(_REPEATS.sub(r"\1", _VOWELS.sub("", token)))
+    return " ".join(sorted(skeletons))
+
+
+class PartyRegistry:
+    """
+    Registry keyed by normalized party name with per-party document counts.
+
+    Writes happen inside an open transaction that is committed every
+    ``commit_every`` observations (and on ``flush``/``close``), so the
+    per-document cost is a handful of index lookups rather than an fsync.
+
+    One registry can be shared by threads (streaming, the HTTP service);
+    calls are serialized on an internal lock.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike = ":memory:",
+        fuzzy: bool = False,
+        cache_entries: int = 100_000,
+        page_cache_kib: int = 16 * 1024,
+        commit_every: int = 1000,
+    ):
+        self.path = str(path)
+        self.fuzzy = fuzzy
+        self.cache_entries = cache_entries
+        self.commit_every = commit_every
+
+        self.conn = sqlite3.connect(
+            self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.RLock()
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA cache_size=-{int(page_cache_kib)}")
+        self.conn.executescript(_SCHEMA)
+
+        self._cache: "OrderedDict[str, PartyRecord]" = OrderedDict()
+        self._uncommitted = 0
+        logger.info("Party registry opened at %s", self.path)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM parties").fetchone()[0]
+
+    def observe(self, parties: Iterable[str], document_id: str) -> Dict[str, PartyRecord]:
+        """
+        Record that ``parties`` appear in ``document_id``.
+
+        Returns the updated record for each input name. A party mentioned
+        several times in one document is counted once. Observing the same
+        ``document_id`` with the same parties again (e.g. a redelivered job)
+        changes nothing and returns the current records; a different document
+        that happens to reuse the id is still counted.
+        """
+        with self._lock:
+            resolved = [(party, self._resolve_key(party)) for party in parties]
+            keys = sorted({key for _, key in resolved if key})
+            parties_hash = hashlib.blake2b("\n".join(keys).encode("utf-8"), digest_size=8).hexdigest()
+            if self.conn.execute(
+                "SELECT 1 FROM observations WHERE document_id = ? AND parties_hash = ?",
+                (document_id, parties_hash),
+            ).fetchone():
+                current = {party: self._get(key) for party, key in resolved if key}
+                return {party: record for party, record in current.items() if record is not None}
+            return self._observe(resolved, document_id, parties_hash)
+
+    def _observe(
+        self, resolved: Iterable[Tuple[str, str]], document_id: str, parties_hash: str
+    ) -> Dict[str, PartyRecord]:
+        updated: Dict[str, PartyRecord] = {}
+        by_key: Dict[str, PartyRecord] = {}
+        for party, key in resolved:
+            if not key:
+                continue
+            if key in by_key:
+                updated[party] = by_key[key]
+                continue
+
+            record = self._get(key)
+            if record is None:
+                record = PartyRecord(
+                    key=key,
+                    display_name=party.strip(),
+                    document_count=1,
+                    first_seen_document=document_id,
+                    last_seen_document=document_id,
+                )
+            else:
+                record = PartyRecord(
+                    key=key,
+                    display_name=record.display_name,
+                    document_count=record.document_count + 1,
+                    first_seen_document=record.first_seen_document,
+                    last_seen_document=document_id,
+                )
+            by_key[key] = record
+            updated[party] = record
+
+        if by_key:
+            self._write(by_key.values(), document_id, parties_hash)
+        return updated
+
+    def lookup(self, party: str) -> PartyRecord | None:
+        """Return the history for ``party`` or ``None`` if it was never seen."""
+        with self._lock:
+            key = self._resolve_key(party)
+            return self._get(key) if key else None
+
+    def is_new(self, party: str) -> bool:
+        """True if ``party`` has appeared in at most one document so far."""
+        record = self.lookup(party)
+        return record is None or record.document_count <= 1
+
+    def top_parties(self, limit: int = 10) -> List[PartyRecord]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT key, display_name, document_count, first_seen_document, last_seen_document"
+                " FROM parties ORDER BY document_count DESC, key LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [PartyRecord(*row) for row in rows]
+
+    def flush(self):
+        with self._lock:
+            if self.conn.in_transaction:
+                self.conn.execute("COMMIT")
+            self._uncommitted = 0
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self.conn.close()
+
+    def _resolve_key(self, party: str) -> str:
+        key = normalize_party_name(party)
+        if not key or not self.fuzzy or self._get(key) is not None:
+            return key
+        row = self.conn.execute(
+            "SELECT key FROM parties WHERE fuzzy_key = ? LIMIT 1", (fuzzy_party_key(key),)
+        ).fetchone()
+        return row[0] if row else key
+
+    def _get(self, key: str) -> PartyRecord | None:
+        record = self._cache.get(key)
+        if record is not None:
+            self._cache.move_to_end(key)
+            return record
+        row = self.conn.execute(
+            "SELECT key, display_name, document_count, first_seen_document, last_seen_document"
+            " FROM parties WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        record = PartyRecord(*row)
+        self._remember(record)
+        return record
+
+    def _remember(self, record: PartyRecord):
+        self._cache[record.key] = record
+        self._cache.move_to_end(record.key)
+        if len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+    def _write(self, records: Iterable[PartyRecord], document_id: str, parties_hash: str):
+        records = list(records)
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+        self.conn.execute(
+            "INSERT INTO observations (document_id, parties_hash) VALUES (?, ?)",
+            (document_id, parties_hash),
+        )
+        self.conn.executemany(
+            "INSERT INTO parties"
+            " (key, display_name, document_count, first_seen_document, last_seen_document, fuzzy_key)"
+            " VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET"
+            " document_count = parties.document_count + 1,"
+            " last_seen_document = excluded.last_seen_document",
+            (
+                (
+                    r.key,
+                    r.display_name,
+                    r.document_count,
+                    r.first_seen_document,
+                    r.last_seen_document,
+                    fuzzy_party_key(r.key),
+                )
+                for r in records
+            ),
+        )
+        for record in records:
+            self._remember(record)
+
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.flush()
@@ -0,0 +1,434 @@
+"""
+Inverted index over processed results for lookup by reference, party,
+document type, date range and amount range.
+
+Each document gets a dense integer ordinal. Exact-match fields map a term to
+a sorted posting list of ordinals; dates and amounts are kept as value-sorted
+``(value, ordinal)`` columns searched with bisection. On disk, posting lists
+are delta + varint encoded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import logging
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, is_dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from .models import ProcessingResult
+from .party_registry import normalize_party_name
+from .tools import DocumentParserTool
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"DPIX"
+_VERSION = 1
+
+# DocumentParserTool keeps only the number for INV/PO references and prefixes
+# every match with REF-, so queries and stored values are reduced alike.
+_REFERENCE_PREFIX = re.compile(r"^(?:PURCHASE ORDER|INVOICE|INV|REF|PO)(?:[-#:\s]+|(?=\d))")
+
+
+def normalize_reference(reference: str) -> str:
+    """Canonical form for references: upper-case without type prefixes."""
+    reference = reference.strip().upper()
+    while True:
+        stripped = _REFERENCE_PREFIX.sub("", reference, count=1)
+        if stripped == reference or not stripped:
+            return reference
+        reference = stripped
+
+
+def _encode_postings(postings: Sequence[int]) -> bytes:
+    out = bytearray()
+    previous = 0
+    for ordinal in postings:
+        delta = ordinal - previous
+        previous = ordinal
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def _decode_postings(data: bytes) -> array:
+    postings = array("I")
+    value = shift = previous = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        postings.append(previous)
+        value = shift = 0
+    return postings
+
+
+def _gallop(postings: Sequence[int], target: int, lo: int) -> int:
+    """Index of the first posting ``>= target`` at or after ``lo``."""
+    hi, step = lo, 1
+    while hi < len(postings) and postings[hi] < target:
+        lo = hi + 1
+        hi += step
+        step *= 2
+    return bisect_left(postings, target, lo, min(hi, len(postings)))
+
+
+def _intersect(postings: List[Sequence[int]]) -> Iterator[int]:
+    """
+    Yield ordinals present in every sorted posting list, in ascending order.
+
+    The smallest list drives the walk and the others are probed by galloping
+    from the last position, so cost follows the rarest term rather than the
+    most common one.
+    """
+    postings = sorted(postings, key=len)
+    cursors = [0] * len(postings)
+    for ordinal in postings[0]:
+        for i in range(1, len(postings)):
+            other = postings[i]
+            cursors[i] = position = _gallop(other, ordinal, cursors[i])
+            if position == len(other):
+                return
+            if other[position] != ordinal:
+                break
+        else:
+            yield ordinal
+
+
+class _RangeColumn:
+    """
+    Numeric values per document, stored twice: value-sorted ``(value, ordinal)``
+    pairs for range scans, and ordinal-ordered offsets + values for checking a
+    small candidate set without materializing the whole range.
+    """
+
+    def __init__(self, typecode: str):
+        self.typecode = typecode
+        self.sorted_values = array(typecode)
+        self.sorted_ordinals = array("I")
+        self.offsets = array("I", [0])
+        self.values = array(typecode)
+        self._pending: List[Tuple[float, int]] = []
+
+    def append(self, ordinal: int, values: Sequence[float]):
+        """Record ``values`` for ``ordinal``; must be called for every ordinal in order."""
+        self.values.extend(values)
+        self.offsets.append(len(self.values))
+        self._pending.extend((value, ordinal) for value in values)
+
+    def _merge(self):
+        if not self._pending:
+            return
+        merged = list(
+            heapq.merge(zip(self.sorted_values, self.sorted_ordinals), sorted(self._pending))
+        )
+        self.sorted_values = array(self.typecode, (v for v, _ in merged))
+        self.sorted_ordinals = array("I", (o for _, o in merged))
+        self._pending = []
+
+    def _bounds(self, low: float | None, high: float | None) -> Tuple[int, int]:
+        self._merge()
+        start = 0 if low is None else bisect_left(self.sorted_values, low)
+        end = len(self.sorted_values) if high is None else bisect_right(self.sorted_values, high)
+        return start, end
+
+    def between(self, low: float | None, high: float | None) -> Iterator[int]:
+        """Ordinals with a value in range, ascending and without repeats."""
+        start, end = self._bounds(low, high)
+        previous = None
+        for ordinal in sorted(self.sorted_ordinals[start:end]):
+            if ordinal != previous:
+                yield ordinal
+            previous = ordinal
+
+    def matches(self, ordinal: int, low: float | None, high: float | None) -> bool:
+        for value in self.values[self.offsets[ordinal] : self.offsets[ordinal + 1]]:
+            if (low is None or value >= low) and (high is None or value <= high):
+                return True
+        return False
+
+    def range_size(self, low: float | None, high: float | None) -> int:
+        start, end = self._bounds(low, high)
+        return end - start
+
+    def to_bytes(self) -> bytes:
+        self._merge()
+        return b"".join(
+            [
+                struct.pack("<II", len(self.offsets), len(self.values)),
+                self.offsets.tobytes(),
+                self.values.tobytes(),
+                self.sorted_values.tobytes(),
+                self.sorted_ordinals.tobytes(),
+            ]
+        )
+
+    @classmethod
+    def from_bytes(cls, typecode: str, data: memoryview, offset: int) -> Tuple["_RangeColumn", int]:
+        column = cls(typecode)
+        offset_count, value_count = struct.unpack_from("<II", data, offset)
+        offset += 8
+        column.offsets = array("I")
+        for target, count in (
+            (column.offsets, offset_count),
+            (column.values, value_count),
+            (column.sorted_values, value_count),
+            (column.sorted_ordinals, value_count),
+        ):
+            width = target.itemsize * count
+            target.frombytes(data[offset : offset + width])
+            offset += width
+        return column, offset
+
+
+class ResultIndex:
+    """Incrementally updated, locally persisted index of ``ProcessingResult`` fields."""
+
+    def __init__(self):
+        self.doc_ids: List[str] = []
+        self._ordinals: Dict[str, int] = {}
+        self._deleted: Set[int] = set()
+        self._postings: Dict[str, array] = {}
+        self._amounts = _RangeColumn("d")
+        self._dates = _RangeColumn("i")
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def add(self, result: ProcessingResult | Dict[str, Any]):
+        """Index one result; re-adding a document id replaces the older entry."""
+        if is_dataclass(result):
+            result = asdict(result)
+        document_id = result["document_id"]
+        metadata = result["metadata"]
+
+        previous = self._ordinals.get(document_id)
+        if previous is not None:
+            self._deleted.add(previous)
+
+        ordinal = len(self.doc_ids)
+        self.doc_ids.append(document_id)
+        self._ordinals[document_id] = ordinal
+
+        terms = {f"type:{metadata['doc_type'].casefold()}"}
+        terms.update(f"ref:{normalize_reference(r)}" for r in metadata.get("references", []))
+        for party in metadata.get("parties", []):
+            key = normalize_party_name(party)
+            if key:
+                terms.add(f"party:{key}")
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = array("I")
+            postings.append(ordinal)
+
+        amounts = [DocumentParserTool.parse_amount(a) for a in metadata.get("amounts", [])]
+        self._amounts.append(ordinal, [a for a in amounts if a is not None])
+        dates = [DocumentParserTool.parse_date(d) for d in metadata.get("dates", [])]
+        self._dates.append(ordinal, [d.toordinal() for d in dates if d is not None])
+
+    def add_many(self, results: Iterable[ProcessingResult | Dict[str, Any]]) -> int:
+        count = 0
+        for result in results:
+            self.add(result)
+            count += 1
+        return count
+
+    def search(
+        self,
+        reference: str | None = None,
+        party: str | None = None,
+        doc_type: str | None = None,
+        amount_min: float | None = None,
+        amount_max: float | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        limit: int | None = None,
+    ) -> List[str]:
+        """
+        Return document ids matching every supplied filter.
+
+        Amount and date filters match when any extracted value on the document
+        falls within the (inclusive) range.
+        """
+        postings: List[array] = []
+        if reference is not None:
+            postings.append(self._postings.get(f"ref:{normalize_reference(reference)}", array("I")))
+        if party is not None:
+            postings.append(self._postings.get(f"party:{normalize_party_name(party)}", array("I")))
+        if doc_type is not None:
+            postings.append(self._postings.get(f"type:{doc_type.casefold()}", array("I")))
+
+        ranges: List[Tuple[_RangeColumn, float | None, float | None]] = []
+        if amount_min is not None or amount_max is not None:
+            ranges.append((self._amounts, amount_min, amount_max))
+        if date_from is not None or date_to is not None:
+            ranges.append(
+                (
+                    self._dates,
+                    date_from.toordinal() if date_from else None,
+                    date_to.toordinal() if date_to else None,
+                )
+            )
+        if (not postings and not ranges) or (limit is not None and limit <= 0):
+            return []
+
+        # Seed with the most selective filter, then verify the rest per candidate
+        # in ordinal order, stopping as soon as ``limit`` matches are found.
+        candidates: Iterable[int]
+        if postings:
+            candidates = _intersect(postings)
+        else:
+            ranges.sort(key=lambda r: r[0].range_size(r[1], r[2]))
+            column, low, high = ranges.pop(0)
+            size = column.range_size(low, high)
+            if limit is not None and limit * len(self.doc_ids) < size * size:
+                # Dense range: walking ordinals finds ``limit`` hits sooner
+                # than sorting the whole range.
+                candidates = (
+                    o for o in range(len(self.doc_ids)) if column.matches(o, low, high)
+                )
+            else:
+                candidates = column.between(low, high)
+
+        ordered: List[int] = []
+        for ordinal in candidates:
+            if ordinal in self._deleted:
+                continue
+            if all(column.matches(ordinal, low, high) for column, low, high in ranges):
+                ordered.append(ordinal)
+                if limit is not None and len(ordered) >= limit:
+                    break
+        return [self.doc_ids[o] for o in ordered]
+
+    def save(self, path: str | os.PathLike):
+        """Write the index atomically to ``path``."""
+        chunks = [_MAGIC, struct.pack("<HI", _VERSION, len(self.doc_ids))]
+        for doc_id in self.doc_ids:
+            encoded = doc_id.encode("utf-8")
+            chunks.append(struct.pack("<H", len(encoded)) + encoded)
+
+        deleted = _encode_postings(sorted(self._deleted))
+        chunks.append(struct.pack("<I", len(deleted)) + deleted)
+
+        chunks.append(struct.pack("<I", len(self._postings)))
+        for term, postings in self._postings.items():
+            encoded_term = term.encode("utf-8")
+            encoded = _encode_postings(postings)
+            chunks.append(struct.pack("<HI", len(encoded_term), len(encoded)) + encoded_term + encoded)
+
+        chunks.append(self._amounts.to_bytes())
+        chunks.append(self._dates.to_bytes())
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(b"".join(chunks))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "ResultIndex":
+        data = memoryview(Path(path).read_bytes())
+        if bytes(data[:4]) != _MAGIC:
+            raise ValueError(f"{path} is not a result index")
+        version, doc_count = struct.unpack_from("<HI", data, 4)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported result index version {version}")
+        offset = 10
+
+        index = cls()
+        for ordinal in range(doc_count):
+            (length,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            doc_id = bytes(data[offset : offset + length]).decode("utf-8")
+            offset += length
+            index.doc_ids.append(doc_id)
+            index._ordinals[doc_id] = ordinal
+
+        (length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        index._deleted = set(_decode_postings(data[offset : offset + length]))
+        offset += length
+        for ordinal in index._deleted:
+            if index._ordinals.get(index.doc_ids[ordinal]) == ordinal:
+                del index._ordinals[index.doc_ids[ordinal]]
+
+        (term_count,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        for _ in range(term_count):
+            term_length, postings_length = struct.unpack_from("<HI", data, offset)
+            offset += 6
+            term = bytes(data[offset : offset + term_length]).decode("utf-8")
+            offset += term_length
+            index._postings[term] = _decode_postings(data[offset : offset + postings_length])
+            offset += postings_length
+
+        index._amounts, offset = _RangeColumn.from_bytes("d", data, offset)
+        index._dates, offset = _RangeColumn.from_bytes("i", data, offset)
+        return index
+
+    @classmethod
+    def build_from_jsonl(cls, paths: Iterable[str | os.PathLike]) -> "ResultIndex":
+        """Bulk-build an index from JSONL dumps of ``asdict(ProcessingResult)``."""
+        index = cls()
+        for path in paths:
+            with open(path, encoding="utf-8") as handle:
+                count = index.add_many(json.loads(line) for line in handle if line.strip())
+            logger.info("Indexed %s results from %s", count, path)
+        return index
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description="Build and query the processed-result index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build an index from JSONL result dumps")
+    build.add_argument("index", type=Path)
+    build.add_argument("jsonl", type=Path, nargs="+")
+
+    query = sub.add_parser("query", help="Query an index")
+    query.add_argument("index", type=Path)
+    query.add_argument("--reference")
+    query.add_argument("--party")
+    query.add_argument("--doc-type")
+    query.add_argument("--amount-min", type=float)
+    query.add_argument("--amount-max", type=float)
+    query.add_argument("--date-from", type=date.fromisoformat)
+    query.add_argument("--date-to", type=date.fromisoformat)
+    query.add_argument("--limit", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = ResultIndex.build_from_jsonl(args.jsonl)
+        index.save(args.index)
+        print(f"Indexed {len(index)} documents into {args.index}")
+    else:
+        index = ResultIndex.load(args.index)
+        for doc_id in index.search(
+            reference=args.reference,
+            party=args.party,
+            doc_type=args.doc_type,
+            amount_min=args.amount_min,
+            amount_max=args.amount_max,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            limit=args.limit,
+        ):
+            print(doc_id)
+
+
+if __name__ == "__main__":
+    main()
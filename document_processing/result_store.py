@@ -0,0 +1,599 @@
+"""
+Columnar on-disk store of ``ProcessingResult`` batches for bulk analytics.
+
+A store is a directory of immutable chunk files, one per flushed batch, so
+appending never rewrites earlier data. Each chunk holds named typed buffers:
+scalar fields as fixed-width arrays, strings as offsets + UTF-8 bytes,
+repetitive strings (doc types, parties, action and risk text) as dictionary
+codes, and list fields as per-row offsets into child columns. The reader
+memory-maps chunks and aggregates straight over the typed buffers, so a
+dashboard query never parses JSON or builds per-document objects.
+
+The container itself (``write_chunk``, ``ChunkFile`` and the column builders)
+is public and reused by ``snapshot`` for memory snapshots.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter, defaultdict
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import compress
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from .models import ActionItem, DocumentMetadata, ProcessingResult, RiskAssessment
+from .party_registry import normalize_party_name
+from .tools import DocumentParserTool
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"DPCS"
+_VERSION = 1
+_ALIGN = 8
+_NULL = 0xFFFFFFFF  # dictionary code for a missing optional string
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+GROUP_KEYS = ("doc_type", "party", "month")
+METRICS = ("documents", "value", "amount_total", "avg_processing_ms")
+
+
+def _timestamp_us(timestamp: str) -> int:
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def _and_masks(left: bytes, right: bytes) -> bytes:
+    """Row-wise AND of two 0/1 byte masks, done as one big-integer operation."""
+    combined = int.from_bytes(left, "little") & int.from_bytes(right, "little")
+    return combined.to_bytes(len(left), "little")
+
+
+class StringColumn:
+    """String column builder: offsets + UTF-8 bytes."""
+
+    def __init__(self, offset_typecode: str = "I"):
+        self.offsets = array(offset_typecode, [0])
+        self.data = bytearray()
+
+    def add(self, value: str):
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def buffers(self, name: str) -> List[Tuple[str, array | bytes]]:
+        return [(f"{name}.offsets", self.offsets), (f"{name}.data", bytes(self.data))]
+
+
+class DictionaryColumn:
+    """Dictionary-encoded string column builder; ``values`` pre-seeds codes 0..n-1."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.codes = array("I")
+        self.values = StringColumn()
+        self._index: Dict[str, int] = {}
+        for value in values:
+            self._index[value] = len(self._index)
+            self.values.add(value)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, value: str | None):
+        if value is None:
+            self.codes.append(_NULL)
+            return
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self._index)
+            self.values.add(value)
+        self.codes.append(code)
+
+    def buffers(self, name: str) -> List[Tuple[str, array | bytes]]:
+        return [(f"{name}.codes", self.codes)] + self.values.buffers(f"{name}.dict")
+
+
+class _ChunkBuilder:
+    """Accumulates rows for one chunk file."""
+
+    def __init__(self):
+        self.rows = 0
+        self.document_id = StringColumn()
+        self.timestamp_us = array("q")
+        self.month = DictionaryColumn()
+        self.doc_type = DictionaryColumn()
+        self.confidence = array("d")
+        self.processing_ms = array("i")
+        self.degraded = array("B")
+        self.summary = StringColumn()
+        self.value = array("d")  # largest amount on the document
+        self.amount_total = array("d")  # sum of all amounts on the document
+
+        self.amounts_offsets = array("I", [0])
+        self.amounts_text = StringColumn()
+        self.amounts_value = array("d")
+        self.dates_offsets = array("I", [0])
+        self.dates_text = StringColumn()
+        self.dates_ordinal = array("i")
+        self.references_offsets = array("I", [0])
+        self.references = StringColumn()
+        self.parties_offsets = array("I", [0])
+        self.parties = DictionaryColumn()
+        self.parties_key = DictionaryColumn()  # normalized name, for grouping variants
+        self.parties_rows = array("I")
+
+        # Dates and party names repeat heavily; parse each distinct value once per chunk.
+        self._date_ordinals: Dict[str, int] = {}
+        self._party_keys: Dict[str, str] = {}
+
+        self.actions_offsets = array("I", [0])
+        self.actions = {
+            name: DictionaryColumn() for name in ("priority", "action", "assignee", "due_date")
+        }
+        self.risks_offsets = array("I", [0])
+        self.risks = {
+            name: DictionaryColumn() for name in ("level", "description", "recommendation")
+        }
+
+    def add(self, result: Dict[str, Any]):
+        row = self.rows
+        metadata = result["metadata"]
+        timestamp_us = _timestamp_us(result["timestamp"])
+
+        self.document_id.add(result["document_id"])
+        self.timestamp_us.append(timestamp_us)
+        when = _EPOCH + timestamp_us * _MICROSECOND
+        self.month.add(f"{when.year:04d}-{when.month:02d}")
+        self.doc_type.add(metadata["doc_type"])
+        self.confidence.append(metadata["confidence"])
+        self.processing_ms.append(result["processing_time_ms"])
+        self.degraded.append(bool(result.get("degraded", False)))
+        self.summary.add(result["summary"])
+
+        amounts = []
+        for amount in metadata["amounts"]:
+            parsed = DocumentParserTool.parse_amount(amount)
+            self.amounts_text.add(amount)
+            self.amounts_value.append(math.nan if parsed is None else parsed)
+            if parsed is not None:
+                amounts.append(parsed)
+        self.amounts_offsets.append(len(self.amounts_value))
+        self.value.append(max(amounts, default=0.0))
+        self.amount_total.append(math.fsum(amounts))
+
+        for value in metadata["dates"]:
+            ordinal = self._date_ordinals.get(value)
+            if ordinal is None:
+                parsed = DocumentParserTool.parse_date(value)
+                ordinal = self._date_ordinals[value] = parsed.toordinal() if parsed else 0
+            self.dates_text.add(value)
+            self.dates_ordinal.append(ordinal)
+        self.dates_offsets.append(len(self.dates_ordinal))
+
+        for reference in metadata["references"]:
+            self.references.add(reference)
+        self.references_offsets.append(len(self.references.offsets) - 1)
+
+        for party in metadata["parties"]:
+            self.parties.add(party)
+            key = self._party_keys.get(party)
+            if key is None:
+                key = self._party_keys[party] = normalize_party_name(party) or party
+            self.parties_key.add(key)
+            self.parties_rows.append(row)
+        self.parties_offsets.append(len(self.parties_rows))
+
+        for item in result["action_items"]:
+            for name, column in self.actions.items():
+                column.add(item.get(name))
+        self.actions_offsets.append(len(self.actions["priority"].codes))
+
+        for risk in result["risks"]:
+            for name, column in self.risks.items():
+                column.add(risk[name])
+        self.risks_offsets.append(len(self.risks["level"].codes))
+
+        self.rows += 1
+
+    def buffers(self) -> List[Tuple[str, array | bytes]]:
+        buffers: List[Tuple[str, array | bytes]] = [
+            ("timestamp_us", self.timestamp_us),
+            ("confidence", self.confidence),
+            ("processing_ms", self.processing_ms),
+            ("degraded", self.degraded),
+            ("value", self.value),
+            ("amount_total", self.amount_total),
+            ("amounts.offsets", self.amounts_offsets),
+            ("amounts.value", self.amounts_value),
+            ("dates.offsets", self.dates_offsets),
+            ("dates.ordinal", self.dates_ordinal),
+            ("references.row_offsets", self.references_offsets),
+            ("parties.offsets", self.parties_offsets),
+            ("parties.rows", self.parties_rows),
+            ("actions.offsets", self.actions_offsets),
+            ("risks.offsets", self.risks_offsets),
+        ]
+        buffers += self.document_id.buffers("document_id")
+        buffers += self.month.buffers("month")
+        buffers += self.doc_type.buffers("doc_type")
+        buffers += self.summary.buffers("summary")
+        buffers += self.amounts_text.buffers("amounts.text")
+        buffers += self.dates_text.buffers("dates.text")
+        buffers += self.references.buffers("references")
+        buffers += self.parties.buffers("parties")
+        buffers += self.parties_key.buffers("parties.key")
+        for name, column in self.actions.items():
+            buffers += column.buffers(f"actions.{name}")
+        for name, column in self.risks.items():
+            buffers += column.buffers(f"risks.{name}")
+        return buffers
+
+
+def write_chunk(
+    path: Path,
+    rows: int,
+    buffers: List[Tuple[str, array | bytes]],
+    meta: Dict[str, Any] | None = None,
+):
+    """Atomically write named buffers; ``meta`` is stored in the header as-is."""
+    columns: Dict[str, List[Any]] = {}
+    offset = 0
+    for name, buffer in buffers:
+        typecode = buffer.typecode if isinstance(buffer, array) else "B"
+        size = len(buffer) * (buffer.itemsize if isinstance(buffer, array) else 1)
+        columns[name] = [typecode, offset, len(buffer)]
+        offset += size + (-size % _ALIGN)
+    header: Dict[str, Any] = {
+        "version": _VERSION,
+        "rows": rows,
+        "byteorder": sys.byteorder,
+        "columns": columns,
+    }
+    if meta is not None:
+        header["meta"] = meta
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    prefix = _MAGIC + struct.pack("<I", len(encoded)) + encoded
+    prefix += b"\0" * (-len(prefix) % _ALIGN)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(prefix)
+        for _, buffer in buffers:
+            data = buffer.tobytes() if isinstance(buffer, array) else buffer
+            handle.write(data)
+            handle.write(b"\0" * (-len(data) % _ALIGN))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+class ColumnarResultWriter:
+    """
+    Appends results to a store directory, writing a new chunk file every
+    ``chunk_rows`` rows (and on ``flush``/``close``).
+    """
+
+    def __init__(self, directory: str | os.PathLike, chunk_rows: int = 65_536):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.chunk_rows = chunk_rows
+        existing = [int(p.stem.split("-")[1]) for p in self.directory.glob("chunk-*.dpcs")]
+        self._next_chunk = max(existing, default=0) + 1
+        self._builder = _ChunkBuilder()
+
+    def __enter__(self) -> "ColumnarResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def append(self, result: ProcessingResult | Dict[str, Any]):
+        self._builder.add(asdict(result) if is_dataclass(result) else result)
+        if self._builder.rows >= self.chunk_rows:
+            self.flush()
+
+    def append_many(self, results: Iterable[ProcessingResult | Dict[str, Any]]) -> int:
+        count = 0
+        for result in results:
+            self.append(result)
+            count += 1
+        return count
+
+    def flush(self):
+        if not self._builder.rows:
+            return
+        path = self.directory / f"chunk-{self._next_chunk:06d}.dpcs"
+        write_chunk(path, self._builder.rows, self._builder.buffers())
+        logger.info("Wrote %s rows to %s", self._builder.rows, path)
+        self._next_chunk += 1
+        self._builder = _ChunkBuilder()
+
+    def close(self):
+        self.flush()
+
+
+class ChunkFile:
+    """A memory-mapped chunk file exposing its buffers as typed memoryviews."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._base = memoryview(self._mmap)
+        self._views: List[memoryview] = []
+        if bytes(self._base[:4]) != _MAGIC:
+            raise ValueError(f"{path} is not a columnar result chunk")
+        (header_length,) = struct.unpack_from("<I", self._base, 4)
+        header = json.loads(bytes(self._base[8 : 8 + header_length]))
+        if header["version"] != _VERSION:
+            raise ValueError(f"Unsupported chunk version {header['version']} in {path}")
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {header['byteorder']}-endian machine")
+        self.rows: int = header["rows"]
+        self.meta: Dict[str, Any] = header.get("meta", {})
+        self._data_start = 8 + header_length + (-(8 + header_length) % _ALIGN)
+        self._columns: Dict[str, List[Any]] = header["columns"]
+        self._cache: Dict[str, Any] = {}
+
+    def column(self, name: str) -> memoryview:
+        view = self._cache.get(name)
+        if view is None:
+            typecode, offset, count = self._columns[name]
+            start = self._data_start + offset
+            raw = self._base[start : start + count * array(typecode).itemsize]
+            view = raw.cast(typecode) if typecode != "B" else raw
+            self._views.extend([raw, view] if view is not raw else [raw])
+            self._cache[name] = view
+        return view
+
+    def strings(self, name: str) -> List[str]:
+        """Decode a whole string column (used for dictionaries)."""
+        key = f"{name}:decoded"
+        decoded = self._cache.get(key)
+        if decoded is None:
+            offsets, data = self.column(f"{name}.offsets"), self.column(f"{name}.data")
+            decoded = [
+                str(data[offsets[i] : offsets[i + 1]], "utf-8") for i in range(len(offsets) - 1)
+            ]
+            self._cache[key] = decoded
+        return decoded
+
+    def string_at(self, name: str, index: int) -> str:
+        offsets, data = self.column(f"{name}.offsets"), self.column(f"{name}.data")
+        return str(data[offsets[index] : offsets[index + 1]], "utf-8")
+
+    def dictionary_value(self, name: str, code: int) -> str | None:
+        return None if code == _NULL else self.strings(f"{name}.dict")[code]
+
+    def close(self):
+        self._cache.clear()
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._base.release()
+        self._mmap.close()
+
+
+class ColumnarResultReader:
+    """Read-only view over every chunk in a store directory."""
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        self._chunks = [ChunkFile(path) for path in sorted(self.directory.glob("chunk-*.dpcs"))]
+
+    def __enter__(self) -> "ColumnarResultReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(chunk.rows for chunk in self._chunks)
+
+    def close(self):
+        for chunk in self._chunks:
+            chunk.close()
+        self._chunks = []
+
+    def aggregate(
+        self,
+        group_by: str = "doc_type",
+        metric: str = "documents",
+        doc_type: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> Dict[str, float]:
+        """
+        Group rows by ``doc_type``, ``party`` or ``month`` and compute
+        ``metric`` per group: ``documents`` (count), ``value`` (sum of each
+        document's largest amount), ``amount_total`` (sum of all amounts) or
+        ``avg_processing_ms``. Filters are optional; ``since`` is inclusive
+        and ``until`` exclusive. Documents with several parties count toward
+        each of them (grouped by normalized name).
+        """
+        if group_by not in GROUP_KEYS:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_KEYS)}")
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {', '.join(METRICS)}")
+
+        sums: Dict[str, float] = defaultdict(float)
+        counts: Counter = Counter()
+        for chunk in self._chunks:
+            mask = self._row_mask(chunk, doc_type, since, until)
+            if mask is False:
+                continue
+            if group_by == "party":
+                names = chunk.strings("parties.key.dict")
+                keys, rows = chunk.column("parties.key.codes"), chunk.column("parties.rows")
+                if mask is not None:
+                    selected = bytes(map(mask.__getitem__, rows))
+                    keys, rows = list(compress(keys, selected)), list(compress(rows, selected))
+            else:
+                names = chunk.strings(f"{group_by}.dict")
+                keys, rows = chunk.column(f"{group_by}.codes"), range(chunk.rows)
+                if mask is not None:
+                    keys, rows = list(compress(keys, mask)), list(compress(rows, mask))
+
+            chunk_counts = Counter(keys)
+            for code, count in chunk_counts.items():
+                counts[names[code]] += count
+            if metric == "documents":
+                continue
+            column = chunk.column("processing_ms" if metric == "avg_processing_ms" else metric)
+            chunk_sums: Dict[int, float] = defaultdict(float)
+            for code, value in zip(keys, map(column.__getitem__, rows)):
+                chunk_sums[code] += value
+            for code, total in chunk_sums.items():
+                sums[names[code]] += total
+
+        if metric == "documents":
+            return dict(counts.most_common())
+        if metric == "avg_processing_ms":
+            averages = {key: sums[key] / counts[key] for key in counts}
+            return dict(sorted(averages.items(), key=lambda kv: kv[1], reverse=True))
+        return dict(sorted(sums.items(), key=lambda kv: kv[1], reverse=True))
+
+    @staticmethod
+    def _row_mask(
+        chunk: ChunkFile, doc_type: str | None, since: datetime | None, until: datetime | None
+    ) -> bytes | None | bool:
+        """Per-row 0/1 mask, ``None`` when every row matches, ``False`` when none can."""
+        mask: bytes | None = None
+        if doc_type is not None:
+            try:
+                code = chunk.strings("doc_type.dict").index(doc_type)
+            except ValueError:
+                return False
+            mask = bytes(map(code.__eq__, chunk.column("doc_type.codes")))
+        timestamps = chunk.column("timestamp_us")
+        for bound, keep in ((since, "__le__"), (until, "__gt__")):
+            if bound is None:
+                continue
+            limit = _timestamp_us(bound.isoformat())
+            in_range = bytes(map(getattr(limit, keep), timestamps))
+            mask = in_range if mask is None else _and_masks(mask, in_range)
+        return mask
+
+    def iter_results(self) -> Iterator[ProcessingResult]:
+        """Rebuild full ``ProcessingResult`` objects, in append order."""
+        for chunk in self._chunks:
+            columns = {
+                name: chunk.column(name)
+                for name in (
+                    "timestamp_us",
+                    "confidence",
+                    "processing_ms",
+                    "degraded",
+                    "doc_type.codes",
+                    "amounts.offsets",
+                    "dates.offsets",
+                    "references.row_offsets",
+                    "parties.offsets",
+                    "parties.codes",
+                    "actions.offsets",
+                    "risks.offsets",
+                )
+            }
+            for row in range(chunk.rows):
+                metadata = DocumentMetadata(
+                    doc_type=chunk.dictionary_value("doc_type", columns["doc_type.codes"][row]),
+                    confidence=columns["confidence"][row],
+                    dates=self._texts(chunk, "dates", row, columns["dates.offsets"]),
+                    amounts=self._texts(chunk, "amounts", row, columns["amounts.offsets"]),
+                    parties=[
+                        chunk.dictionary_value("parties", code)
+                        for code in columns["parties.codes"][
+                            columns["parties.offsets"][row] : columns["parties.offsets"][row + 1]
+                        ]
+                    ],
+                    references=[
+                        chunk.string_at("references", i)
+                        for i in range(
+                            columns["references.row_offsets"][row],
+                            columns["references.row_offsets"][row + 1],
+                        )
+                    ],
+                )
+                timestamp = _EPOCH + columns["timestamp_us"][row] * _MICROSECOND
+                yield ProcessingResult(
+                    document_id=chunk.string_at("document_id", row),
+                    timestamp=timestamp.isoformat(),
+                    metadata=metadata,
+                    action_items=[
+                        ActionItem(**self._struct(chunk, "actions", i, ActionItem))
+                        for i in range(
+                            columns["actions.offsets"][row], columns["actions.offsets"][row + 1]
+                        )
+                    ],
+                    summary=chunk.string_at("summary", row),
+                    risks=[
+                        RiskAssessment(**self._struct(chunk, "risks", i, RiskAssessment))
+                        for i in range(
+                            columns["risks.offsets"][row], columns["risks.offsets"][row + 1]
+                        )
+                    ],
+                    processing_time_ms=columns["processing_ms"][row],
+                    degraded=bool(columns["degraded"][row]),
+                )
+
+    @staticmethod
+    def _texts(chunk: ChunkFile, name: str, row: int, offsets: memoryview) -> List[str]:
+        return [chunk.string_at(f"{name}.text", i) for i in range(offsets[row], offsets[row + 1])]
+
+    @staticmethod
+    def _struct(chunk: ChunkFile, prefix: str, index: int, model: type) -> Dict[str, Any]:
+        return {
+            name: chunk.dictionary_value(
+                f"{prefix}.{name}", chunk.column(f"{prefix}.{name}.codes")[index]
+            )
+            for name in model.__dataclass_fields__
+        }
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description="Columnar store for processed results.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    convert = sub.add_parser("convert", help="Append JSONL result dumps to a store")
+    convert.add_argument("store", type=Path)
+    convert.add_argument("jsonl", type=Path, nargs="+")
+    convert.add_argument("--chunk-rows", type=int, default=65_536)
+
+    query = sub.add_parser("query", help="Aggregate a store")
+    query.add_argument("store", type=Path)
+    query.add_argument("--group-by", choices=GROUP_KEYS, default="doc_type")
+    query.add_argument("--metric", choices=METRICS, default="documents")
+    query.add_argument("--doc-type")
+    query.add_argument("--since", type=datetime.fromisoformat)
+    query.add_argument("--until", type=datetime.fromisoformat)
+    query.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        with ColumnarResultWriter(args.store, chunk_rows=args.chunk_rows) as writer:
+            for path in args.jsonl:
+                with open(path, encoding="utf-8") as handle:
+                    count = writer.append_many(json.loads(line) for line in handle if line.strip())
+                print(f"Appended {count} results from {path}")
+    else:
+        with ColumnarResultReader(args.store) as reader:
+            groups = reader.aggregate(
+                args.group_by, args.metric, doc_type=args.doc_type, since=args.since, until=args.until
+            )
+            for key, value in list(groups.items())[: args.top]:
+                print(f"{key}\t{value:,.2f}" if isinstance(value, float) else f"{key}\t{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Diff-based reprocessing support for revised documents.
+
+Text is split into chunks that no entity pattern can match across (normally
+single lines) and entity matches are kept per chunk. A revision is diffed
+chunk by chunk against the stored version; only inserted or replaced chunks
+are rescanned, and the per-chunk matches are reassembled in the order a full
+scan produces, so merged entities equal a from-scratch extraction.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, List, Sequence, Tuple
+
+from .models import ProcessingResult
+from .tools import DocumentParserTool, EntityExtractionTool
+
+logger = logging.getLogger(__name__)
+
+# Reference patterns allow whitespace (including newlines) between the
+# keyword and the number, so a line ending in a keyword continues its chunk.
+# Matched against the right-stripped end of each line.
+_CONTINUES = re.compile(
+    r"(?:INV|Invoice|PO|Purchase Order|REF|Reference)[-#]?$", re.IGNORECASE
+)
+# Last characters of those keywords (plus separators); anything else cannot continue.
+_CONTINUATION_ENDINGS = frozenset("vVeEoOrRfF-#")
+_LONGEST_KEYWORD = len("Purchase Order#")
+
+
+def split_chunks(text: str) -> List[str]:
+    """Split ``text`` into runs of lines that entity matches never cross."""
+    chunks: List[str] = []
+    current: List[str] = []
+    open_match = False
+    for line in text.split("\n"):
+        current.append(line)
+        stripped = line.rstrip()
+        if stripped:
+            open_match = (
+                stripped[-1] in _CONTINUATION_ENDINGS
+                and _CONTINUES.search(stripped[-_LONGEST_KEYWORD:]) is not None
+            )
+        if not open_match:
+            chunks.append("\n".join(current))
+            current = []
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+@dataclass(frozen=True)
+class ChunkEntities:
+    """Entity matches in one chunk; dates and references are kept per pattern."""
+
+    dates: Tuple[Tuple[str, ...], ...]
+    amounts: Tuple[str, ...]
+    references: Tuple[Tuple[str, ...], ...]
+    parties: Tuple[str, ...]
+
+    def __bool__(self) -> bool:
+        return bool(self.amounts or self.parties or any(self.dates) or any(self.references))
+
+
+_NO_ENTITIES = ChunkEntities(
+    dates=((),) * len(DocumentParserTool.DATE_PATTERNS),
+    amounts=(),
+    references=((),) * len(DocumentParserTool.REFERENCE_PATTERNS),
+    parties=(),
+)
+
+
+def scan_chunk(chunk: str) -> ChunkEntities:
+    entities = ChunkEntities(
+        dates=tuple(
+            tuple(re.findall(pattern, chunk, re.IGNORECASE))
+            for pattern in DocumentParserTool.DATE_PATTERNS
+        ),
+        amounts=tuple(re.findall(DocumentParserTool.AMOUNT_PATTERN, chunk)),
+        references=tuple(
+            tuple(f"REF-{m}" for m in re.findall(pattern, chunk, re.IGNORECASE))
+            for pattern in DocumentParserTool.REFERENCE_PATTERNS
+        ),
+        parties=tuple(EntityExtractionTool.find_party_mentions(chunk)),
+    )
+    # Most chunks match nothing; sharing one instance keeps stored versions small.
+    return entities if entities else _NO_ENTITIES
+
+
+def assemble_entities(entities: Sequence[ChunkEntities]) -> Dict[str, List[str]]:
+    """Untruncated entity lists, ordered exactly as the extraction tools return them."""
+    entities = [e for e in entities if e is not _NO_ENTITIES]
+    return {
+        "dates": [
+            d
+            for idx in range(len(DocumentParserTool.DATE_PATTERNS))
+            for e in entities
+            for d in e.dates[idx]
+        ],
+        "amounts": [a for e in entities for a in e.amounts],
+        "references": [
+            r
+            for idx in range(len(DocumentParserTool.REFERENCE_PATTERNS))
+            for e in entities
+            for r in e.references[idx]
+        ],
+        "parties": list(set(p for e in entities for p in e.parties)),
+    }
+
+
+def added_entities(new: Sequence[str], old: Sequence[str]) -> List[str]:
+    """Items of ``new`` not matched by an occurrence in ``old`` (multiset difference)."""
+    remaining = Counter(old)
+    added = []
+    for item in new:
+        if remaining[item]:
+            remaining[item] -= 1
+        else:
+            added.append(item)
+    return added
+
+
+@dataclass
+class StoredVersion:
+    """A processed version of a document, kept so it can be revised."""
+
+    root_id: str
+    revision: int
+    text: str
+    result: ProcessingResult
+    chunks: List[str] | None = None
+    entities: List[ChunkEntities] | None = None
+    found: Dict[str, List[str]] | None = None
+
+
+@dataclass
+class RevisionDiff:
+    """Outcome of diffing a new text against a stored version."""
+
+    previous: StoredVersion
+    chunks: List[str]
+    entities: List[ChunkEntities]
+    found: Dict[str, List[str]]
+    previous_found: Dict[str, List[str]]
+    changed_regions: int
+    rescanned_chars: int
+    changed_text: str  # removed and inserted chunks, lower-cased
+
+
+class RevisionStore:
+    """
+    Most recently processed document versions, bounded to ``max_documents``
+    (least recently used versions are dropped first).
+    """
+
+    def __init__(self, max_documents: int = 1000):
+        self.max_documents = max_documents
+        self._versions: "OrderedDict[str, StoredVersion]" = OrderedDict()
+        # Highest revision number issued per root, so sibling revisions get distinct ids.
+        self._revisions: "OrderedDict[str, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self._versions
+
+    def remember(self, document_id: str, version: StoredVersion):
+        self._versions[document_id] = version
+        self._versions.move_to_end(document_id)
+        while len(self._versions) > self.max_documents:
+            self._versions.popitem(last=False)
+        self._revisions[version.root_id] = max(
+            version.revision, self._revisions.get(version.root_id, 0)
+        )
+        self._revisions.move_to_end(version.root_id)
+        while len(self._revisions) > self.max_documents:
+            self._revisions.popitem(last=False)
+
+    def next_revision(self, root_id: str) -> int:
+        """Revision number for the next version of ``root_id``."""
+        return self._revisions.get(root_id, 0) + 1
+
+    def get(self, document_id: str) -> StoredVersion:
+        try:
+            version = self._versions[document_id]
+        except KeyError:
+            raise KeyError(f"No stored version of document {document_id!r}") from None
+        self._versions.move_to_end(document_id)
+        return version
+
+    def diff(self, previous_id: str, new_text: str) -> RevisionDiff:
+        previous = self.get(previous_id)
+        if previous.chunks is None:
+            # Versions from process_document are chunked on first revision.
+            previous.chunks = split_chunks(previous.text)
+            previous.entities = [scan_chunk(chunk) for chunk in previous.chunks]
+        if previous.found is None:
+            previous.found = assemble_entities(previous.entities)
+
+        old = previous.chunks
+        chunks = split_chunks(new_text)
+        # Revisions are usually local edits; only the span between the common
+        # prefix and suffix goes through the (quadratic worst case) matcher.
+        head = 0
+        limit = min(len(old), len(chunks))
+        while head < limit and old[head] == chunks[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old[-1 - tail] == chunks[-1 - tail]:
+            tail += 1
+
+        entities: List[ChunkEntities] = list(previous.entities[:head])
+        changed: List[str] = []
+        regions = rescanned = 0
+        matcher = SequenceMatcher(
+            None, old[head : len(old) - tail], chunks[head : len(chunks) - tail], autojunk=False
+        )
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            i1, i2, j1, j2 = i1 + head, i2 + head, j1 + head, j2 + head
+            if op == "equal":
+                entities.extend(previous.entities[i1:i2])
+                continue
+            regions += 1
+            changed.extend(old[i1:i2])
+            changed.extend(chunks[j1:j2])
+            for chunk in chunks[j1:j2]:
+                entities.append(scan_chunk(chunk))
+                rescanned += len(chunk)
+        entities.extend(previous.entities[len(old) - tail :])
+
+        logger.info(
+            "Revision of %s: %s changed regions, %s of %s chars rescanned",
+            previous_id,
+            regions,
+            rescanned,
+            len(new_text),
+        )
+        return RevisionDiff(
+            previous=previous,
+            chunks=chunks,
+            entities=entities,
+            found=assemble_entities(entities),
+            previous_found=previous.found,
+            changed_regions=regions,
+            rescanned_chars=rescanned,
+            changed_text="\n".join(changed).lower(),
+        )
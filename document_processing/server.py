@@ -0,0 +1,400 @@
+"""
+Lightweight asyncio HTTP service that exposes the pipeline to other services.
+
+Concurrent requests are collected into micro-batches and dispatched to a
+worker pool so that IPC and scheduling overhead is paid per batch rather than
+per document.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, List, Sequence, Tuple
+
+from .config import settings
+from .metrics import percentile
+from .observability import configure_logging
+from .orchestrator import DocumentProcessingOrchestrator, new_document_id
+from .snapshot import load_snapshot
+
+logger = logging.getLogger(__name__)
+
+BatchItem = Tuple[str, str | None]
+
+# Orchestrators are not thread-safe, so thread-mode workers each keep their own.
+_worker = threading.local()
+
+
+def init_worker() -> DocumentProcessingOrchestrator:
+    """Build one orchestrator per worker so agents are not re-created per batch."""
+    orchestrator = DocumentProcessingOrchestrator()
+    snapshot = settings.memory_snapshot_path
+    if snapshot and os.path.exists(snapshot):
+        # Read-only warm start; workers map the same file and share its pages.
+        load_snapshot(snapshot, orchestrator.memory_bank, orchestrator.session_service)
+    _worker.orchestrator = orchestrator
+    return orchestrator
+
+
+def process_batch(items: Sequence[BatchItem]) -> List[Dict[str, Any]]:
+    """Run a batch of documents through the worker's orchestrator."""
+    orchestrator = getattr(_worker, "orchestrator", None) or init_worker()
+    results = orchestrator.process_batch(items)
+    return [asdict(result) for result in results]
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    """Runtime settings for the HTTP service."""
+
+    host: str = "127.0.0.1"
+    port: int = 8080
+    workers: int = 4
+    max_batch_size: int = 32
+    max_wait_ms: float = 5.0
+    max_queue_size: int = 1024
+    max_body_bytes: int = 10 * 1024 * 1024
+    use_processes: bool = True
+    latency_window: int = 10000
+
+
+class QueueFullError(Exception):
+    """Raised when the pending-request queue is at capacity."""
+
+
+class MicroBatcher:
+    """
+    Collects submitted items into batches bounded by size and wait time and
+    hands each batch to an executor.
+
+    The wait is adaptive: when every worker is idle a batch is dispatched as
+    soon as it is drained from the queue; the batcher only holds a partial
+    batch open for ``max_wait_ms`` while other batches are still in flight.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Sequence[BatchItem]], List[Any]],
+        executor: Executor,
+        workers: int,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 1024,
+        latency_window: int = 10000,
+    ):
+        self.handler = handler
+        self.executor = executor
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_size = max_queue_size
+
+        self._queue: asyncio.Queue | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._in_flight = 0
+        self._batch_tasks: set = set()
+
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self.counters = {
+            "accepted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+    async def submit(self, item: BatchItem) -> Any:
+        """Queue an item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except asyncio.QueueFull as exc:
+            self.counters["rejected"] += 1
+            raise QueueFullError("request queue is full") from exc
+        self.counters["accepted"] += 1
+        return await future
+
+    async def _collect(self) -> List[Tuple[BatchItem, asyncio.Future, float]]:
+        batch = [await self._queue.get()]
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        if len(batch) < self.max_batch_size and self._in_flight > 0 and self.max_wait > 0:
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        return batch
+
+    async def _dispatch_loop(self):
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            self._in_flight += 1
+            self.counters["batches"] += 1
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[BatchItem, asyncio.Future, float]]):
+        loop = asyncio.get_running_loop()
+        items = [item for item, _, _ in batch]
+        try:
+            results = await loop.run_in_executor(self.executor, self.handler, items)
+        except Exception as exc:
+            logger.exception("Batch of %s documents failed", len(items))
+            self.counters["failed"] += len(batch)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            now = time.perf_counter()
+            self.counters["completed"] += len(batch)
+            for (_, future, enqueued_at), result in zip(batch, results):
+                self._latencies.append((now - enqueued_at) * 1000)
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        batches = self.counters["batches"]
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.max_queue_size,
+            "in_flight_batches": self._in_flight,
+            "workers": self.workers,
+            "avg_batch_size": round(
+                (self.counters["completed"] + self.counters["failed"]) / batches, 2
+            )
+            if batches
+            else 0.0,
+            **self.counters,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p90": round(percentile(latencies, 90), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+                "samples": len(latencies),
+            },
+        }
+
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+
+class DocumentProcessingServer:
+    """HTTP front end exposing ``process_document`` plus health and stats."""
+
+    def __init__(self, config: ServerConfig | None = None, executor: Executor | None = None):
+        self.config = config or ServerConfig()
+        self._owns_executor = executor is None
+        if executor is None:
+            if self.config.use_processes:
+                executor = ProcessPoolExecutor(
+                    max_workers=self.config.workers, initializer=init_worker
+                )
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.config.workers, initializer=init_worker
+                )
+        self.executor = executor
+        self.batcher = MicroBatcher(
+            process_batch,
+            self.executor,
+            workers=self.config.workers,
+            max_batch_size=self.config.max_batch_size,
+            max_wait_ms=self.config.max_wait_ms,
+            max_queue_size=self.config.max_queue_size,
+            latency_window=self.config.latency_window,
+        )
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def port(self) -> int:
+        if self._server is None:
+            return self.config.port
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self):
+        await self.batcher.start()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.config.host, self.config.port
+        )
+        logger.info(
+            "Document processing server listening on %s:%s", self.config.host, self.port
+        )
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (
+                    version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                )
+                length = int(headers.get("content-length") or 0)
+                if length > self.config.max_body_bytes:
+                    writer.write(self._encode(413, {"error": "request body too large"}, False))
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self._route(method, path, body)
+                writer.write(self._encode(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Idle keep-alive connections are cancelled on shutdown; swallow so
+            # the stream protocol does not report it as an unhandled error.
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        path = path.split("?", 1)[0]
+        if path == "/process":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            return await self._process(body)
+        if path == "/stats":
+            return 200, self.batcher.stats()
+        if path == "/health":
+            return 200, {"status": "ok"}
+        return 404, {"error": f"unknown path {path}"}
+
+    async def _process(self, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        try:
+            request = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            return 400, {"error": "body must be JSON"}
+
+        document_text = request.get("document_text") if isinstance(request, dict) else None
+        if not isinstance(document_text, str):
+            return 400, {"error": "document_text is required"}
+
+        try:
+            # Ids are assigned here so concurrent requests never share a session.
+            document_id = request.get("document_id") or new_document_id()
+            result = await self.batcher.submit((document_text, document_id))
+        except QueueFullError:
+            return 429, {"error": "server busy, retry later"}
+        except Exception as exc:
+            return 500, {"error": str(exc)}
+        return 200, result
+
+    @staticmethod
+    def _encode(status: int, payload: Dict[str, Any], keep_alive: bool) -> bytes:
+        body = json.dumps(payload).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 429:
+            headers.append("Retry-After: 1")
+        return ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description="Run the document processing HTTP service.")
+    defaults = ServerConfig()
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port)
+    parser.add_argument("--workers", type=int, default=defaults.workers)
+    parser.add_argument("--max-batch-size", type=int, default=defaults.max_batch_size)
+    parser.add_argument("--max-wait-ms", type=float, default=defaults.max_wait_ms)
+    parser.add_argument("--max-queue-size", type=int, default=defaults.max_queue_size)
+    parser.add_argument("--threads", action="store_true", help="Use threads instead of processes")
+    args = parser.parse_args(argv)
+
+    configure_logging(settings.log_mode, level=logging.INFO, sample_rate=settings.log_sample_rate)
+    config = ServerConfig(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_queue_size=args.max_queue_size,
+        use_processes=not args.threads,
+    )
+    asyncio.run(DocumentProcessingServer(config).serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, MutableMapping, MutableSequence
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +17,8 @@ class InMemorySessionService:
     """
 
     def __init__(self):
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.sessions: MutableMapping[str, Dict[str, Any]] = {}
+        self.changes = 0  # bumped on every write, for snapshotting
         logger.info("Session service initialized")
 
     def create_session(self, session_id: str) -> Dict[str, Any]:
@@ -28,6 +29,7 @@ class InMemorySessionService:
             "state": {},
             "history": [],
         }
+        self.changes += 1
         logger.info("Created session: %s", session_id)
         return self.sessions[session_id]
 
@@ -48,6 +50,7 @@ class InMemorySessionService:
                 "value": str(value)[:100],  # Truncate for logging
             }
         )
+        self.changes += 1
         logger.debug("Session %s: Updated %s", session_id, key)
 
     def get_state(self, session_id: str, key: str) -> Any:
@@ -62,12 +65,13 @@ class MemoryBank:
     """
 
     def __init__(self):
-        self.patterns: Dict[str, List[Dict[str, Any]]] = {
+        self.patterns: Dict[str, MutableSequence[Dict[str, Any]]] = {
             "invoice_patterns": [],
             "contract_patterns": [],
             "common_entities": [],
             "action_templates": [],
         }
+        self.changes = 0  # bumped on every write, for snapshotting
         logger.info("Memory bank initialized")
 
     def store_pattern(self, doc_type: str, pattern: Dict[str, Any]):
@@ -75,9 +79,10 @@ class MemoryBank:
         key = f"{doc_type.lower()}_patterns"
         if key in self.patterns:
             self.patterns[key].append(pattern)
+            self.changes += 1
             logger.debug("Stored pattern for %s", doc_type)
 
-    def retrieve_patterns(self, doc_type: str) -> List[Dict[str, Any]]:
+    def retrieve_patterns(self, doc_type: str) -> MutableSequence[Dict[str, Any]]:
         """Retrieve patterns for document type."""
         key = f"{doc_type.lower()}_patterns"
         return self.patterns.get(key, [])
@@ -0,0 +1,576 @@
+"""
+Snapshots of learned memory and session state, for warm starts.
+
+A snapshot is one columnar chunk file (the container used by
+``result_store``). Each pattern category becomes typed columns, with strings
+dictionary-encoded, and each session is a JSON blob indexed by sorted session
+id. Loading memory-maps the file and decodes nothing up front. Patterns and
+sessions are materialized on access, so a warm start takes milliseconds at
+any size, and processes loading the same file share its pages.
+"""
+
+from __future__ import annotations
+
+import atexit
+import heapq
+import json
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping, MutableSequence, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from .orchestrator import DocumentProcessingOrchestrator
+from .result_store import ChunkFile, DictionaryColumn, write_chunk
+from .session import InMemorySessionService, MemoryBank
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+_WHOLE = "*"  # field name of the whole-pattern JSON column used for irregular categories
+_TYPECODES = {"bool": "B", "int32": "i", "int64": "q", "float": "d"}
+_INT32 = range(-(2**31), 2**31)
+_INT64 = range(-(2**63), 2**63)
+
+Field = Tuple[str, str]  # (name, kind)
+
+
+def _conforms(value: Any, kind: str) -> bool:
+    if kind == "bool":
+        return type(value) is bool
+    if kind == "int32":
+        return type(value) is int and value in _INT32
+    if kind == "int64":
+        return type(value) is int and value in _INT64
+    if kind == "float":
+        return type(value) in (int, float)
+    if kind == "str":
+        return type(value) is str
+    return True
+
+
+def _infer_fields(patterns: Sequence[Dict[str, Any]]) -> Tuple[Field, ...]:
+    if not patterns:
+        return ()
+    names = list(patterns[0])
+    if any(pattern.keys() != patterns[0].keys() for pattern in patterns):
+        return ((_WHOLE, "json"),)
+    fields = []
+    for name in names:
+        values = [pattern[name] for pattern in patterns]
+        kinds = ("bool", "int32", "int64", "float", "str")
+        kind = next((k for k in kinds if all(_conforms(v, k) for v in values)), "json")
+        fields.append((name, kind))
+    return tuple(fields)
+
+
+class PatternLog(MutableSequence):
+    """
+    Patterns of one category: snapshot rows, decoded on access, followed by
+    patterns appended since the last snapshot was loaded or saved.
+
+    Appending is cheap. Any other edit that touches snapshot rows first
+    decodes the whole category into memory.
+    """
+
+    def __init__(
+        self,
+        chunk: ChunkFile | None = None,
+        prefix: str = "",
+        count: int = 0,
+        fields: Iterable[Iterable[str]] = (),
+        patterns: Iterable[Dict[str, Any]] = (),
+    ):
+        self._chunk = chunk
+        self._prefix = prefix
+        self._base = count
+        self.fields: Tuple[Field, ...] = tuple(tuple(field) for field in fields)
+        self._tail: List[Dict[str, Any]] = list(patterns)
+        # Appends come from request threads while the snapshot writer rebases.
+        self._lock = threading.RLock()
+        self._edits = 0  # bumped by every change other than append
+        self._encoded_edits = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._base + len(self._tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        with self._lock:
+            chunk, prefix, base, fields, tail = (
+                self._chunk, self._prefix, self._base, self.fields, self._tail
+            )
+            count = base + len(tail)
+            if index < 0:
+                index += count
+            if not 0 <= index < count:
+                raise IndexError("pattern index out of range")
+            if index >= base:
+                return tail[index - base]
+        if fields[0][0] == _WHOLE:
+            return json.loads(chunk.string_at(f"{prefix}.0", index))
+        return {
+            name: self._value(chunk, f"{prefix}.{position}", kind, index)
+            for position, (name, kind) in enumerate(fields)
+        }
+
+    @staticmethod
+    def _value(chunk: ChunkFile, column: str, kind: str, index: int) -> Any:
+        if kind == "str":
+            return chunk.dictionary_value(column, chunk.column(f"{column}.codes")[index])
+        if kind == "json":
+            return json.loads(chunk.string_at(column, index))
+        value = chunk.column(column)[index]
+        return bool(value) if kind == "bool" else value
+
+    def append(self, pattern: Dict[str, Any]):
+        with self._lock:
+            self._tail.append(pattern)
+
+    def insert(self, index: int, pattern: Dict[str, Any]):
+        with self._lock:
+            if index >= len(self):
+                self._tail.append(pattern)
+                return
+            self._decode_all()
+            self._tail.insert(index, pattern)
+            self._edits += 1
+
+    def __setitem__(self, index, pattern):
+        with self._lock:
+            if isinstance(index, int) and self._base <= index < len(self):
+                self._tail[index - self._base] = pattern
+            else:
+                self._decode_all()
+                self._tail[index] = pattern
+            self._edits += 1
+
+    def __delitem__(self, index):
+        with self._lock:
+            self._decode_all()
+            del self._tail[index]
+            self._edits += 1
+
+    def _decode_all(self):
+        if self._base:
+            self._tail = self[: self._base] + self._tail
+            self._chunk, self._prefix, self._base, self.fields = None, "", 0, ()
+
+    def _rebase(self, chunk: ChunkFile, prefix: str, count: int, fields: Iterable[Iterable[str]]):
+        """Point at ``count`` rows saved to ``chunk``, keeping only patterns appended since."""
+        with self._lock:
+            if self._edits != self._encoded_edits:
+                return  # saved rows changed meanwhile; keep them until the next save
+            self._tail = self._tail[count - self._base :]
+            self._chunk = chunk
+            self._prefix = prefix
+            self._base = count
+            self.fields = tuple(tuple(field) for field in fields)
+
+    def encode(self, prefix: str) -> Tuple[int, Tuple[Field, ...], List[Tuple[str, Any]]]:
+        """
+        ``(count, fields, buffers)`` for a new snapshot. Snapshot columns are
+        copied as raw bytes when the appended patterns fit their schema, so
+        re-snapshotting a large log costs about as much as the new patterns.
+        """
+        with self._lock:
+            chunk, base_prefix, base, fields = self._chunk, self._prefix, self._base, self.fields
+            tail = list(self._tail)
+            self._encoded_edits = self._edits
+        whole = bool(fields) and fields[0][0] == _WHOLE
+        names = {name for name, _ in fields}
+        if chunk is None or not fields or not (
+            whole
+            or all(
+                pattern.keys() == names
+                and all(_conforms(pattern[name], kind) for name, kind in fields)
+                for pattern in tail
+            )
+        ):
+            return _encode_patterns(prefix, list(self))
+
+        buffers: List[Tuple[str, Any]] = []
+        for position, (name, kind) in enumerate(fields):
+            values = tail if whole else [pattern[name] for pattern in tail]
+            buffers += _encode_column(
+                f"{prefix}.{position}", kind, values, chunk, f"{base_prefix}.{position}"
+            )
+        return base + len(tail), fields, buffers
+
+
+def _encode_column(
+    name: str,
+    kind: str,
+    values: Sequence[Any],
+    chunk: ChunkFile | None = None,
+    base: str | None = None,
+) -> List[Tuple[str, Any]]:
+    """Buffers for one column: the ``base`` column of ``chunk`` (if any) followed by ``values``."""
+    if kind in _TYPECODES:
+        column = array(_TYPECODES[kind])
+        if chunk is not None:
+            column.frombytes(chunk.column(base).cast("B"))
+        column.extend(values)
+        return [(name, column)]
+
+    if kind == "str":
+        dictionary = DictionaryColumn(chunk.strings(f"{base}.dict") if chunk is not None else ())
+        for value in values:
+            dictionary.add(value)
+        typecode = "B" if len(dictionary) <= 1 << 8 else "H" if len(dictionary) <= 1 << 16 else "I"
+        codes = array(typecode)
+        if chunk is not None:
+            base_codes = chunk.column(f"{base}.codes")
+            if base_codes.format == typecode:
+                codes.frombytes(base_codes.cast("B"))
+            else:
+                codes.extend(base_codes)
+        codes.fromlist(dictionary.codes.tolist())
+        return [(f"{name}.codes", codes)] + dictionary.values.buffers(f"{name}.dict")
+
+    offsets, data = array("Q", [0]), bytearray()
+    if chunk is not None:
+        offsets.frombytes(chunk.column(f"{base}.offsets")[1:].cast("B"))
+        data += chunk.column(f"{base}.data")
+    for value in values:
+        data += json.dumps(value, default=str).encode("utf-8")
+        offsets.append(len(data))
+    return [(f"{name}.offsets", offsets), (f"{name}.data", bytes(data))]
+
+
+def _encode_patterns(
+    prefix: str, patterns: Sequence[Dict[str, Any]]
+) -> Tuple[int, Tuple[Field, ...], List[Tuple[str, Any]]]:
+    fields = _infer_fields(patterns)
+    if fields and fields[0][0] == _WHOLE:
+        return len(patterns), fields, _encode_column(f"{prefix}.0", "json", patterns)
+    buffers: List[Tuple[str, Any]] = []
+    for position, (name, kind) in enumerate(fields):
+        buffers += _encode_column(f"{prefix}.{position}", kind, [p[name] for p in patterns])
+    return len(patterns), fields, buffers
+
+
+class _SnapshotIds:
+    """Sorted session ids of a snapshot, as a sequence ``bisect`` can search."""
+
+    def __init__(self, chunk: ChunkFile, count: int):
+        self._chunk = chunk
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> str:
+        return self._chunk.string_at("sessions.id", index)
+
+
+def _position(ids: Sequence[str], session_id: str) -> int | None:
+    index = bisect_left(ids, session_id)
+    if index < len(ids) and ids[index] == session_id:
+        return index
+    return None
+
+
+@dataclass
+class _SessionsCapture:
+    """Sessions as written by one save, kept so the mapping can rebase afterwards."""
+
+    entries: Iterator[Tuple[str, bytes]]
+    written: Dict[str, Tuple[Dict[str, Any], bytes]]  # overlay sessions as encoded
+    shadowed: set
+
+
+class SnapshotSessions(MutableMapping):
+    """
+    Session mapping over a snapshot. A snapshot session is decoded on first
+    access and moved into an in-memory overlay, so callers can mutate the
+    returned dict in place as with a plain ``dict``.
+
+    After a save the mapping is rebased onto the new file and overlay sessions
+    written unchanged are dropped, so the next save only encodes sessions
+    touched since. Re-fetch sessions through the mapping (as
+    ``InMemorySessionService`` does) rather than holding a dict across saves.
+    """
+
+    def __init__(self, chunk: ChunkFile | None = None, count: int = 0):
+        self._chunk = chunk
+        self._ids = _SnapshotIds(chunk, count) if chunk is not None else []
+        self._overlay: Dict[str, Dict[str, Any]] = {}
+        self._shadowed: set = set()  # snapshot ids now in the overlay or deleted
+        # Request threads move sessions into the overlay while the writer thread saves.
+        self._lock = threading.RLock()
+
+    def _find(self, session_id: str) -> int | None:
+        if session_id in self._shadowed:
+            return None
+        return _position(self._ids, session_id)
+
+    def __contains__(self, session_id: object) -> bool:
+        with self._lock:
+            return session_id in self._overlay or (
+                isinstance(session_id, str) and self._find(session_id) is not None
+            )
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            session = self._overlay.get(session_id)
+            if session is not None:
+                return session
+            index = self._find(session_id)
+            if index is None:
+                raise KeyError(session_id)
+            session = json.loads(self._chunk.string_at("sessions.value", index))
+            self._overlay[session_id] = session
+            self._shadowed.add(session_id)
+            return session
+
+    def __setitem__(self, session_id: str, session: Dict[str, Any]):
+        with self._lock:
+            if session_id not in self._overlay and self._find(session_id) is not None:
+                self._shadowed.add(session_id)
+            self._overlay[session_id] = session
+
+    def __delitem__(self, session_id: str):
+        with self._lock:
+            if session_id in self._overlay:
+                del self._overlay[session_id]
+            elif self._find(session_id) is not None:
+                self._shadowed.add(session_id)
+            else:
+                raise KeyError(session_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids) - len(self._shadowed) + len(self._overlay)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            overlay, shadowed, ids = list(self._overlay), set(self._shadowed), self._ids
+        yield from overlay
+        for index in range(len(ids)):
+            session_id = ids[index]
+            if session_id not in shadowed:
+                yield session_id
+
+    def capture(self) -> _SessionsCapture:
+        """
+        ``(session_id, json_bytes)`` entries in id order for a new snapshot;
+        untouched snapshot sessions are copied as-is. The overlay and the base
+        view are taken together, so a session moving between them is kept.
+        """
+        with self._lock:
+            overlay = list(self._overlay.items())
+            shadowed = set(self._shadowed)
+            chunk, ids = self._chunk, self._ids
+        written = {
+            session_id: (session, json.dumps(session, default=str).encode("utf-8"))
+            for session_id, session in overlay
+        }
+        base: Iterator[Tuple[str, Any]] = iter(())
+        if chunk is not None:
+            offsets = chunk.column("sessions.value.offsets")
+            data = chunk.column("sessions.value.data")
+            base = (
+                (ids[index], data[start:end])
+                for index, (start, end) in enumerate(zip(offsets[:-1], offsets[1:]))
+                if ids[index] not in shadowed
+            )
+        entries = heapq.merge(
+            sorted((session_id, value) for session_id, (_, value) in written.items()),
+            base,
+            key=lambda entry: entry[0],
+        )
+        return _SessionsCapture(entries, written, shadowed)
+
+    def _rebase(self, chunk: ChunkFile, count: int, capture: _SessionsCapture):
+        """Serve sessions from ``chunk``, keeping only overlay changes made since ``capture``."""
+        ids = _SnapshotIds(chunk, count)
+        with self._lock:
+            overlay = {}
+            for session_id, session in self._overlay.items():
+                saved = capture.written.get(session_id)
+                if saved is not None and saved[0] is session:
+                    if json.dumps(session, default=str).encode("utf-8") == saved[1]:
+                        continue  # unchanged since the save; the new file has it
+                overlay[session_id] = session
+            # Ids touched after the capture: moved to the overlay, or deleted.
+            touched = set(overlay) | (self._shadowed - capture.shadowed)
+            touched.update(sid for sid in capture.written if sid not in self._overlay)
+            self._chunk, self._ids, self._overlay = chunk, ids, overlay
+            self._shadowed = {sid for sid in touched if _position(ids, sid) is not None}
+
+
+def save_snapshot(
+    path: str | Path,
+    memory_bank: MemoryBank,
+    session_service: InMemorySessionService | None = None,
+):
+    """
+    Atomically write ``memory_bank`` (and sessions, if given) to ``path``.
+
+    ``PatternLog`` categories and ``SnapshotSessions`` are then rebased onto
+    the new file, so the next save only encodes what changed after this one.
+    """
+    buffers: List[Tuple[str, Any]] = []
+    categories = []
+    logs = []
+    for position, (category, patterns) in enumerate(list(memory_bank.patterns.items())):
+        if isinstance(patterns, PatternLog):
+            count, fields, column_buffers = patterns.encode(f"p{position}")
+            logs.append((patterns, f"p{position}", count, fields))
+        else:
+            count, fields, column_buffers = _encode_patterns(f"p{position}", list(patterns))
+        categories.append([category, count, [list(field) for field in fields]])
+        buffers += column_buffers
+
+    sessions = session_service.sessions if session_service is not None else {}
+    capture = None
+    if isinstance(sessions, SnapshotSessions):
+        capture = sessions.capture()
+        entries = capture.entries
+    else:
+        entries = sorted(
+            (session_id, json.dumps(session, default=str).encode("utf-8"))
+            for session_id, session in list(sessions.items())
+        )
+    ids, id_offsets = bytearray(), array("Q", [0])
+    values, value_offsets = bytearray(), array("Q", [0])
+    for session_id, value in entries:
+        ids += session_id.encode("utf-8")
+        id_offsets.append(len(ids))
+        values += value
+        value_offsets.append(len(values))
+    buffers += [
+        ("sessions.id.offsets", id_offsets),
+        ("sessions.id.data", bytes(ids)),
+        ("sessions.value.offsets", value_offsets),
+        ("sessions.value.data", bytes(values)),
+    ]
+
+    meta = {
+        "snapshot_version": SNAPSHOT_VERSION,
+        "patterns": categories,
+        "sessions": len(id_offsets) - 1,
+    }
+    write_chunk(Path(path), sum(count for _, count, _ in categories), buffers, meta=meta)
+
+    if logs or capture is not None:
+        chunk = ChunkFile(Path(path))
+        for patterns, prefix, count, fields in logs:
+            patterns._rebase(chunk, prefix, count, fields)
+        if capture is not None:
+            sessions._rebase(chunk, meta["sessions"], capture)
+
+
+def load_snapshot(
+    path: str | Path,
+    memory_bank: MemoryBank | None = None,
+    session_service: InMemorySessionService | None = None,
+) -> Tuple[MemoryBank, InMemorySessionService]:
+    """
+    Memory-map ``path`` and point ``memory_bank`` and ``session_service``
+    (new instances if omitted) at it, replacing their current contents.
+    """
+    chunk = ChunkFile(Path(path))
+    version = chunk.meta.get("snapshot_version")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version!r} in {path}")
+    memory_bank = memory_bank if memory_bank is not None else MemoryBank()
+    session_service = session_service if session_service is not None else InMemorySessionService()
+
+    for position, (category, count, fields) in enumerate(chunk.meta["patterns"]):
+        memory_bank.patterns[category] = PatternLog(chunk, f"p{position}", count, fields)
+    session_service.sessions = SnapshotSessions(chunk, chunk.meta["sessions"])
+    logger.info(
+        "Loaded snapshot %s: %s patterns, %s sessions", path, chunk.rows, chunk.meta["sessions"]
+    )
+    return memory_bank, session_service
+
+
+class SnapshotWriter:
+    """
+    Saves a snapshot every ``interval_s`` seconds when the memory bank or
+    sessions changed, and once more on ``stop`` (also run at interpreter exit).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        memory_bank: MemoryBank,
+        session_service: InMemorySessionService | None = None,
+        interval_s: float = 300.0,
+    ):
+        self.path = Path(path)
+        self.memory_bank = memory_bank
+        self.session_service = session_service
+        self.interval_s = interval_s
+        # Plain containers are wrapped so every save after the first only encodes changes.
+        for category, patterns in list(memory_bank.patterns.items()):
+            if not isinstance(patterns, PatternLog):
+                memory_bank.patterns[category] = PatternLog(patterns=patterns)
+        if session_service is not None and not isinstance(
+            session_service.sessions, SnapshotSessions
+        ):
+            sessions = SnapshotSessions()
+            sessions.update(session_service.sessions)
+            session_service.sessions = sessions
+        self._saved = self._changes()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _changes(self) -> Tuple[int, int]:
+        sessions = self.session_service.changes if self.session_service is not None else 0
+        return self.memory_bank.changes, sessions
+
+    def save(self, force: bool = False) -> bool:
+        """Write a snapshot if anything changed since the last one; returns whether it did."""
+        with self._lock:
+            changes = self._changes()
+            if changes == self._saved and not force:
+                return False
+            started = time.perf_counter()
+            save_snapshot(self.path, self.memory_bank, self.session_service)
+            self._saved = changes
+            logger.info(
+                "Saved snapshot %s in %.1f ms", self.path, (time.perf_counter() - started) * 1000
+            )
+            return True
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="memory-snapshot", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        atexit.unregister(self.stop)
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.save()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval_s):
+            try:
+                self.save()
+            except Exception:
+                logger.exception("Snapshot to %s failed", self.path)
+
+
+def warm_start(
+    orchestrator: DocumentProcessingOrchestrator, path: str | Path, interval_s: float = 300.0
+) -> SnapshotWriter:
+    """Load ``path`` into the orchestrator if it exists, then keep snapshotting to it."""
+    path = Path(path)
+    if path.exists():
+        load_snapshot(path, orchestrator.memory_bank, orchestrator.session_service)
+    writer = SnapshotWriter(path, orchestrator.memory_bank, orchestrator.session_service, interval_s)
+    writer.start()
+    return writer
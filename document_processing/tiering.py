@@ -0,0 +1,89 @@
+"""
+Tiered pipeline planning: skip entity scans that cannot match a document.
+
+After classification, a cheap presence check (digits, ``$``, ``ref``, party
+suffix keywords) decides which extraction scans can possibly produce output.
+Every date, INV and PO pattern needs a digit, amounts only need ``$``, the REF
+pattern needs "ref" and party detection needs one of the suffix keywords, so
+skipping a scan whose gate fails never changes the result.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Mapping, Tuple
+
+from .agents import EXTRACTORS
+from .tools import EntityExtractionTool
+
+logger = logging.getLogger(__name__)
+
+_DIGIT = re.compile(r"\d")
+
+TIER_FAST = "fast"  # nothing to extract; all scans skipped
+TIER_GATED = "gated"  # only scans whose presence check passed
+TIER_FULL = "full"  # profile disabled gating; every enabled scan runs
+
+
+@dataclass(frozen=True)
+class PipelineProfile:
+    """
+    Per-doc-type pipeline settings.
+
+    ``extractors`` is the set of scans the doc type may run at all; leaving
+    one out changes output and is an explicit opt-in. ``gated`` enables the
+    output-preserving presence checks.
+    """
+
+    extractors: FrozenSet[str] = frozenset(EXTRACTORS)
+    gated: bool = True
+
+
+@dataclass
+class TierPlanner:
+    """Chooses the scans to run per document and counts documents per tier."""
+
+    profiles: Mapping[str, PipelineProfile] = field(default_factory=dict)
+    default_profile: PipelineProfile = field(default_factory=PipelineProfile)
+    tier_counts: Counter = field(default_factory=Counter)
+    skipped_scans: Counter = field(default_factory=Counter)
+
+    def plan(self, doc_type: str, document_text: str) -> Tuple[str, FrozenSet[str]]:
+        """Return ``(tier, extractors)`` for a classified document."""
+        profile = self.profiles.get(doc_type, self.default_profile)
+        if not profile.gated:
+            tier, extractors = TIER_FULL, profile.extractors
+        else:
+            extractors = profile.extractors & self.possible_extractors(document_text)
+            tier = TIER_GATED if extractors else TIER_FAST
+
+        self.tier_counts[tier] += 1
+        for name in EXTRACTORS:
+            if name not in extractors:
+                self.skipped_scans[name] += 1
+        return tier, extractors
+
+    @staticmethod
+    def possible_extractors(document_text: str) -> FrozenSet[str]:
+        """Scans whose patterns could match ``document_text``."""
+        possible = set()
+        has_digit = _DIGIT.search(document_text) is not None
+        if has_digit:
+            possible.add("dates")
+        if "$" in document_text:
+            # The amount pattern also matches digitless text such as "$,".
+            possible.add("amounts")
+        if has_digit or "ref" in document_text.lower():
+            possible.add("references")
+        if any(keyword in document_text for keyword in EntityExtractionTool.PARTY_KEYWORDS):
+            possible.add("parties")
+        return frozenset(possible)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "tiers": dict(self.tier_counts),
+            "skipped_scans": dict(self.skipped_scans),
+        }
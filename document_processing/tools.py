@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import logging
 import re
+from datetime import date, datetime
 from typing import List
 
 logger = logging.getLogger(__name__)
@@ -14,16 +15,27 @@ logger = logging.getLogger(__name__)
 class DocumentParserTool:
     """Custom tool for parsing document content."""
 
+    # Each pattern is matched over the whole text in turn; entities never span a
+    # line break except a reference number following its keyword's line.
+    DATE_PATTERNS = (
+        r"\d{4}-\d{2}-\d{2}",  # YYYY-MM-DD
+        r"\d{2}/\d{2}/\d{4}",  # MM/DD/YYYY
+        # Suffix is bounded ("tember" is the longest) so long letter runs
+        # cannot trigger quadratic backtracking.
+        r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]{0,6} \d{1,2},? \d{4}",
+    )
+    AMOUNT_PATTERN = r"\$[\d,]+(?:\.\d{2})?"
+    REFERENCE_PATTERNS = (
+        r"(?:INV|Invoice)[-#]?\s*(\d+)",
+        r"(?:PO|Purchase Order)[-#]?\s*(\d+)",
+        r"(?:REF|Reference)[-#]?\s*([A-Z0-9-]+)",
+    )
+
     @staticmethod
     def extract_dates(text: str) -> List[str]:
         """Extract dates from text."""
-        date_patterns = [
-            r"\d{4}-\d{2}-\d{2}",  # YYYY-MM-DD
-            r"\d{2}/\d{2}/\d{4}",  # MM/DD/YYYY
-            r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}",
-        ]
         dates: List[str] = []
-        for pattern in date_patterns:
+        for pattern in DocumentParserTool.DATE_PATTERNS:
             dates.extend(re.findall(pattern, text, re.IGNORECASE))
         logger.debug("Extracted %s dates", len(dates))
         return dates
@@ -31,34 +43,56 @@ class DocumentParserTool:
     @staticmethod
     def extract_amounts(text: str) -> List[str]:
         """Extract monetary amounts from text."""
-        amount_pattern = r"\$[\d,]+(?:\.\d{2})?"
-        amounts = re.findall(amount_pattern, text)
+        amounts = re.findall(DocumentParserTool.AMOUNT_PATTERN, text)
         logger.debug("Extracted %s amounts", len(amounts))
         return amounts
 
     @staticmethod
     def extract_references(text: str) -> List[str]:
         """Extract reference numbers (invoice #, PO #, etc.)."""
-        ref_patterns = [
-            r"(?:INV|Invoice)[-#]?\s*(\d+)",
-            r"(?:PO|Purchase Order)[-#]?\s*(\d+)",
-            r"(?:REF|Reference)[-#]?\s*([A-Z0-9-]+)",
-        ]
         references: List[str] = []
-        for pattern in ref_patterns:
+        for pattern in DocumentParserTool.REFERENCE_PATTERNS:
             matches = re.findall(pattern, text, re.IGNORECASE)
             references.extend([f"REF-{m}" for m in matches])
         logger.debug("Extracted %s references", len(references))
         return references
 
+    @staticmethod
+    def parse_amount(amount: str) -> float | None:
+        """Convert an extracted amount such as ``$1,250.50`` to a float."""
+        try:
+            return float(amount.replace("$", "").replace(",", ""))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def parse_date(value: str) -> date | None:
+        """Convert an extracted date string to a ``date`` if it is well formed."""
+        cleaned = value.replace(",", "").strip()
+        for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%B %d %Y", "%b %d %Y"):
+            try:
+                return datetime.strptime(cleaned, fmt).date()
+            except ValueError:
+                continue
+        return None
+
 
 class EntityExtractionTool:
     """Tool for extracting named entities."""
 
+    PARTY_KEYWORDS = ("Inc", "LLC", "Corp", "Corporation", "Ltd", "Limited")
+
     @staticmethod
     def extract_parties(text: str) -> List[str]:
         """Extract company/party names."""
-        keywords = ["Inc", "LLC", "Corp", "Corporation", "Ltd", "Limited"]
+        parties = EntityExtractionTool.find_party_mentions(text)
+        logger.debug("Extracted %s parties", len(parties))
+        return list(set(parties))  # Remove duplicates
+
+    @staticmethod
+    def find_party_mentions(text: str) -> List[str]:
+        """Party mentions line by line, in order and with repeats."""
+        keywords = EntityExtractionTool.PARTY_KEYWORDS
         lines = text.split("\n")
         parties: List[str] = []
 
@@ -71,7 +105,4 @@ class EntityExtractionTool:
                             company = " ".join(words[max(0, i - 3) : i + 1])
                             parties.append(company.strip())
                             break
-
-        logger.debug("Extracted %s parties", len(parties))
-        return list(set(parties))  # Remove duplicates
-
+        return parties
@@ -7,13 +7,12 @@ from __future__ import annotations
 import logging
 from typing import Iterable, Tuple
 
-from document_processing import AgentEvaluator, DocumentProcessingOrchestrator
+from document_processing import AgentEvaluator, DocumentProcessingOrchestrator, settings
 from document_processing.adk_app import DocumentProcessingADKApp
+from document_processing.observability import configure_logging
+from document_processing.snapshot import warm_start
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+configure_logging(settings.log_mode, sample_rate=settings.log_sample_rate)
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +54,11 @@ def run_demo(
 
 def main():
     orchestrator = DocumentProcessingOrchestrator()
+    snapshots = (
+        warm_start(orchestrator, settings.memory_snapshot_path, settings.snapshot_interval_s)
+        if settings.memory_snapshot_path
+        else None
+    )
 
     sample_docs = [
         (
@@ -100,6 +104,8 @@ def main():
     ]
 
     run_demo(orchestrator, sample_docs)
+    if snapshots is not None:
+        snapshots.stop()
 
     # Initialize ADK agent so the same pipeline can be used via `adk web`.
     adk_app = DocumentProcessingADKApp()
@@ -0,0 +1,94 @@
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from document_processing.budget import ProcessingBudget
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+from document_processing.tools import DocumentParserTool
+
+
+SIZE = 2_000_000
+SAMPLES_DIR = Path(__file__).resolve().parents[1] / "sample_documents"
+
+ADVERSARIAL_INPUTS = {
+    "whitespace_and_hyphens": " \t-\n" * (SIZE // 4),
+    "single_whitespace_line": " " * SIZE,
+    "month_prefix_run": "mar" * (SIZE // 3),
+    "reference_then_whitespace": ("REF" + " " * 997) * (SIZE // 1000),
+    "party_suffix_lines": ("Acme Inc " * 10 + "\n") * (SIZE // 100),
+    "digit_run": "1" * SIZE,
+    "dollar_fragments": "$1," * (SIZE // 3),
+}
+
+
+def _fuzz_document(rng, size):
+    alphabet = ["REF", "Inc", "$", "-", " ", "\n", "#", "mar", "2025", "/", ",", "PO", "Jan 5, "]
+    return "".join(rng.choice(alphabet) for _ in range(size))
+
+
+@pytest.fixture(scope="module")
+def orchestrator():
+    return DocumentProcessingOrchestrator(budget=ProcessingBudget(max_document_chars=200_000))
+
+
+def _timed(orchestrator, text, document_id):
+    started = time.perf_counter()
+    result = orchestrator.process_document(text, document_id)
+    return result, time.perf_counter() - started
+
+
+@pytest.fixture(scope="module")
+def clean_seconds(orchestrator):
+    """Best-of-three time for ordinary business text of the same size."""
+    samples = "\n".join(path.read_text() for path in sorted(SAMPLES_DIR.glob("*.txt")))
+    clean = (samples * (SIZE // len(samples) + 1))[:SIZE]
+    return min(_timed(orchestrator, clean, "CLEAN")[1] for _ in range(3))
+
+
+@pytest.mark.parametrize("name", sorted(ADVERSARIAL_INPUTS))
+def test_adversarial_inputs_stay_within_bound(orchestrator, clean_seconds, name):
+    result, elapsed = _timed(orchestrator, ADVERSARIAL_INPUTS[name], name)
+
+    assert result.degraded
+    # Generous multiple so a loaded host doesn't flake; backtracking blows far past it.
+    assert elapsed < 10 * clean_seconds
+
+
+def test_fuzzed_inputs_within_size_limit_complete(orchestrator):
+    rng = random.Random(20251019)
+    for idx in range(5):
+        text = _fuzz_document(rng, 100_000)[:150_000]
+        assert not orchestrator.process_document(text, f"FUZZ{idx}").degraded
+
+
+def test_month_pattern_does_not_backtrack_quadratically():
+    started = time.perf_counter()
+    DocumentParserTool.extract_dates("mar" * 20000)
+    assert time.perf_counter() - started < 0.5
+    assert DocumentParserTool.extract_dates("Due September 5, 2025") == ["September 5, 2025"]
+
+
+def test_exhausted_stage_budget_returns_partial_degraded_result():
+    orchestrator = DocumentProcessingOrchestrator(budget=ProcessingBudget(max_stage_ms=0))
+
+    result = orchestrator.process_document("INVOICE total $500.00 due 2025-12-01", "SLOW")
+
+    assert result.degraded
+    assert result.metadata.doc_type == "Invoice"
+    assert result.metadata.amounts == []
+
+
+def test_documents_within_budget_are_not_degraded():
+    result = DocumentProcessingOrchestrator().process_document("INVOICE total $500.00", "OK")
+
+    assert not result.degraded
+    assert result.metadata.amounts == ["$500.00"]
+
+
+def test_scan_window_cuts_at_line_break():
+    budget = ProcessingBudget(max_document_chars=10)
+
+    assert budget.scan_window("abcdefg\nhijklmnop") == ("abcdefg", True)
+    assert budget.scan_window("short") == ("short", False)
@@ -0,0 +1,78 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from document_processing.bulk import BulkProcessor, BulkResultStore
+
+
+INVOICE = """
+INVOICE
+From: Global Solutions Inc
+Total: $17,500.00
+Payment overdue - late fees apply.
+"""
+
+CONTRACT = """
+SERVICE AGREEMENT
+Tech Innovations LLC
+Contract Value: $125,000
+"""
+
+
+def test_bulk_payload_aggregates_and_keeps_full_results():
+    documents = [INVOICE, CONTRACT, INVOICE.replace("17,500", "2,500")]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        bulk = BulkProcessor(workers=2, min_parallel=2, executor=executor)
+        payload = bulk.process(documents, fields=["doc_type", "value"])
+
+    assert payload["documents"] == 3
+    assert payload["by_doc_type"]["Invoice"]["count"] == 2
+    assert payload["by_doc_type"]["Invoice"]["total_value"] == 20_000.0
+    assert payload["totals"]["value"] == 145_000.0
+    assert sum(payload["by_risk_level"].values()) == 3
+    assert payload["columns"] == ["document_id", "doc_type", "value"]
+    handle = payload["handle"]
+    assert payload["rows"] == [
+        [f"{handle}-1", "Invoice", 17_500.0],
+        [f"{handle}-2", "Contract", 125_000.0],
+        [f"{handle}-3", "Invoice", 2_500.0],
+    ]
+
+    full = bulk.store.get(handle, f"{handle}-2")
+    assert full["metadata"]["parties"] == ["Tech Innovations LLC"]
+    assert len(json.dumps(payload)) < len(json.dumps(bulk.store.get(payload["handle"])))
+
+
+def test_row_limit_unknown_fields_and_expired_handles():
+    bulk = BulkProcessor(workers=1, store=BulkResultStore(max_batches=1))
+
+    payload = bulk.process([INVOICE, CONTRACT], ["A", "B"], max_rows=1)
+    assert [row[:3] for row in payload["rows"]] == [["A", "Invoice", 17_500.0]]
+    assert payload["rows_omitted"] == 1
+
+    with pytest.raises(ValueError, match="Unknown field"):
+        bulk.process([INVOICE], fields=["nope"])
+
+    bulk.process([CONTRACT])
+    with pytest.raises(KeyError, match="expired"):
+        bulk.store.get(payload["handle"])
+
+
+def test_duplicate_document_ids_are_rejected():
+    bulk = BulkProcessor(workers=1)
+
+    with pytest.raises(ValueError, match="Duplicate document_ids: A"):
+        bulk.process([INVOICE, CONTRACT], ["A", "A"])
+    assert len(bulk.store) == 0
+
+
+def test_unnamed_documents_get_distinct_ids_across_runs():
+    bulk = BulkProcessor(workers=1)
+
+    first = bulk.process([INVOICE, CONTRACT])
+    second = bulk.process([INVOICE, CONTRACT])
+
+    first_ids = {row[0] for row in first["rows"]}
+    assert first_ids.isdisjoint(row[0] for row in second["rows"])
+    assert len(bulk.orchestrator.session_service.sessions) == 4
@@ -0,0 +1,84 @@
+from document_processing.dedup import DuplicateDetector
+from document_processing.models import DocumentMetadata
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+
+
+INVOICE = """
+INVOICE
+Invoice Number: INV-2025-001
+From: Global Solutions Inc
+To: Acme Corp
+Description: Professional Services for the fourth quarter including onsite
+support, remote monitoring, quarterly reporting and account management.
+Amount: $15,000.00
+Payment Terms: Net 30 days
+Reference: PO-45678
+Please remit payment to the address below.
+"""
+
+
+def _metadata(amounts=(), references=()):
+    return DocumentMetadata("Invoice", 0.95, [], list(amounts), [], list(references))
+
+
+def test_detector_finds_near_duplicate_but_not_unrelated_text():
+    detector = DuplicateDetector()
+    detector.add("ORIGINAL", INVOICE, _metadata(["$15,000.00"], ["REF-45678"]))
+
+    resent = INVOICE.replace("Net 30 days", "Net 30 days.")
+    matches = detector.find_duplicates(resent, _metadata(["$15,000.00"], ["REF-45678"]))
+    unrelated = detector.find_duplicates(
+        "Quarterly report on warehouse throughput and staffing levels.", _metadata()
+    )
+
+    assert [m.document_id for m in matches] == ["ORIGINAL"]
+    assert matches[0].similarity >= 0.8
+    assert matches[0].shared_amounts == ["$15,000.00"]
+    assert unrelated == []
+
+
+def test_orchestrator_flags_resent_invoice_as_high_risk():
+    orchestrator = DocumentProcessingOrchestrator(duplicate_detector=DuplicateDetector())
+
+    first = orchestrator.process_document(INVOICE, "INV_A")
+    second = orchestrator.process_document(INVOICE.replace("Acme Corp", "ACME Corp"), "INV_B")
+
+    assert not any("duplicate" in r.description for r in first.risks)
+    flagged = [r for r in second.risks if "duplicate" in r.description]
+    assert flagged and flagged[0].level == "High"
+    assert "INV_A" in flagged[0].description
+
+
+def test_documents_without_words_are_not_indexed_or_matched():
+    detector = DuplicateDetector()
+
+    assert detector.check_and_add("BLANK1", "", _metadata()) == []
+    assert detector.check_and_add("BLANK2", "--- $$ ---", _metadata()) == []
+
+    assert len(detector) == 0
+
+
+def test_readding_an_id_replaces_its_index_entries():
+    detector = DuplicateDetector()
+    detector.add("DOC", INVOICE, _metadata())
+    detector.add("DOC", "Quarterly report on warehouse throughput and staffing levels.", _metadata())
+
+    assert len(detector) == 1
+    assert detector.find_duplicates(INVOICE, _metadata()) == []
+    assert sum(len(ordinals) for bucket in detector._buckets for ordinals in bucket.values()) == 16
+
+    detector.add("DOC", "", _metadata())
+    assert len(detector) == 0
+    assert not any(detector._buckets)
+
+
+def test_identical_resend_without_id_is_flagged():
+    orchestrator = DocumentProcessingOrchestrator(duplicate_detector=DuplicateDetector())
+
+    first = orchestrator.process_document(INVOICE)
+    second = orchestrator.process_document(INVOICE)
+
+    assert first.document_id != second.document_id
+    flagged = [r for r in second.risks if "duplicate" in r.description]
+    assert flagged and first.document_id in flagged[0].description
+    assert len(orchestrator.duplicate_detector) == 2
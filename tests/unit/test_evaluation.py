@@ -0,0 +1,73 @@
+import json
+
+from document_processing.evaluation import DOC_TYPE_LABELS, AgentEvaluator, evaluate_corpus
+
+
+CORPUS = [
+    {
+        "document_id": "E1",
+        "document_text": "INVOICE INV-1001\nFrom: Acme Corp\nTotal: $1,250.00\nDue: 2025-03-01",
+        "doc_type": "Invoice",
+        "dates": ["2025-03-01"],
+        "amounts": ["$1250"],
+        "parties": ["ACME Corp."],
+        "references": ["INV-1001"],
+    },
+    {
+        "document_id": "E2",
+        "document_text": "SERVICE AGREEMENT\nValue: $9,000.00",
+        "doc_type": "Contract",
+        "amounts": ["$9,000.00", "$500.00"],
+    },
+    {
+        "document_id": "E3",
+        "document_text": "Quarterly findings: revenue grew. Bill of materials attached.",
+        "doc_type": "Report",
+        "dates": [],
+    },
+]
+
+
+def _write(tmp_path, records):
+    path = tmp_path / "labeled.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+    return path
+
+
+def test_scores_fields_and_confusion_matrix(tmp_path):
+    report = evaluate_corpus(_write(tmp_path, CORPUS), workers=0)
+
+    assert report["documents"] == 3
+    # Normalization makes "$1250" match "$1,250.00" and "ACME Corp." match "Acme Corp".
+    assert report["fields"]["amounts"] == {
+        "precision": 1.0,
+        "recall": 0.6667,
+        "f1": 0.8,
+        "tp": 2,
+        "fp": 0,
+        "fn": 1,
+        "documents": 2,
+    }
+    assert report["fields"]["parties"]["f1"] == 1.0
+    assert report["fields"]["references"]["f1"] == 1.0
+    assert report["fields"]["dates"]["documents"] == 2
+
+    matrix = report["doc_type"]["confusion_matrix"]
+    report_row = DOC_TYPE_LABELS.index("Report")
+    # "Bill" makes the classifier call the report an invoice.
+    assert matrix[report_row][DOC_TYPE_LABELS.index("Invoice")] == 1
+    assert report["doc_type"]["accuracy"] == 0.6667
+    assert {e["document_id"] for e in report["examples"]} == {"E2", "E3"}
+
+
+def test_process_pool_matches_in_process_run(tmp_path):
+    path = _write(tmp_path, CORPUS * 5)
+
+    serial = evaluate_corpus(path, workers=0, chunk_size=2)
+    parallel = AgentEvaluator().evaluate_corpus(
+        path, workers=2, chunk_size=2, report_path=tmp_path / "report.json"
+    )
+
+    for key in ("documents", "fields", "doc_type"):
+        assert parallel[key] == serial[key]
+    assert json.loads((tmp_path / "report.json").read_text())["documents"] == 15
@@ -0,0 +1,88 @@
+from document_processing.job_queue import JobWorker, SQLiteJobQueue
+
+
+class _FlakyOrchestrator:
+    """Fails documents whose text contains 'boom'."""
+
+    def process_document(self, document_text, document_id=None):
+        if "boom" in document_text:
+            raise ValueError("cannot parse")
+        from document_processing.orchestrator import DocumentProcessingOrchestrator
+
+        return DocumentProcessingOrchestrator().process_document(document_text, document_id)
+
+
+def test_lease_hides_jobs_until_visibility_timeout(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "jobs.db")
+    queue.enqueue_many([("Invoice $10", "A"), ("Invoice $20", "B")])
+
+    first = queue.lease("w1", batch_size=10, visibility_timeout_s=60)
+    second = queue.lease("w2", batch_size=10, visibility_timeout_s=60)
+    assert [job.document_id for job in first] == ["A", "B"]
+    assert second == []
+
+    # An expired lease (crashed worker) makes the job visible again.
+    queue.conn.execute("UPDATE jobs SET available_at = 0")
+    redelivered = queue.lease("w2", batch_size=10)
+    assert [job.attempts for job in redelivered] == [2, 2]
+
+
+def test_worker_acks_results_and_dead_letters_failures(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "jobs.db", max_attempts=2, backoff_base_s=0)
+    queue.enqueue_many([("INVOICE total $500.00", "GOOD"), ("boom", "BAD")])
+    worker = JobWorker(queue, orchestrator=_FlakyOrchestrator(), batch_size=10)
+
+    worker.run(stop_when_idle=True)
+
+    assert queue.get_result("GOOD")["metadata"]["doc_type"] == "Invoice"
+    assert queue.get_result("BAD") is None
+    dead = queue.dead_letters()
+    assert [d["document_id"] for d in dead] == ["BAD"]
+    assert dead[0]["attempts"] == 2
+    assert queue.stats() == {
+        "pending": 0,
+        "leased": 0,
+        "retry_scheduled": 0,
+        "completed": 1,
+        "dead_letter": 1,
+    }
+
+
+def test_expired_lease_cannot_ack_or_fail(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "jobs.db", max_attempts=2)
+    queue.enqueue_many([("Invoice $10", "A"), ("Invoice $20", "B")])
+    stale = queue.lease("w1", batch_size=10)
+    queue.conn.execute("UPDATE jobs SET available_at = 0")
+    current = queue.lease("w2", batch_size=10)
+
+    assert queue.ack([(stale[0], {"from": "w1"})]) == [stale[0]]
+    assert queue.fail([(stale[1], "timeout")]) == [stale[1]]
+    assert queue.get_result("A") is None
+    assert queue.dead_letters() == []
+
+    assert queue.ack([(current[0], {"from": "w2"}), (current[1], {"from": "w2"})]) == []
+    assert queue.get_result("A") == {"from": "w2"}
+    assert queue.stats()["completed"] == 2
+
+
+def test_jobs_that_keep_crashing_workers_are_dead_lettered(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "jobs.db", max_attempts=2, backoff_base_s=0)
+    queue.enqueue("poison document", "POISON")
+
+    # Each worker crashes mid-document: no ack, no fail, the lease just expires.
+    attempts = [job.attempts for _ in range(4) for job in queue.lease("w", visibility_timeout_s=0)]
+
+    assert attempts == [1, 2]
+    dead = queue.dead_letters()
+    assert [(d["document_id"], d["attempts"]) for d in dead] == [("POISON", 2)]
+    assert dead[0]["last_error"] == "lease expired after 2 attempts"
+    assert queue.stats()["pending"] == 0
+
+
+def test_expired_leases_back_off_before_redelivery(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "jobs.db", backoff_base_s=60)
+    queue.enqueue("slow document", "SLOW")
+    queue.lease("w1", visibility_timeout_s=0)
+
+    assert queue.lease("w2") == []
+    assert queue.stats()["retry_scheduled"] == 1
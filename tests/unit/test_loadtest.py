@@ -0,0 +1,78 @@
+from document_processing.loadtest import (
+    DEFAULT_MIX,
+    LoadPhase,
+    find_saturation,
+    run_phase,
+    synthetic_corpus,
+)
+
+
+def test_synthetic_corpus_matches_size_mix():
+    corpus = synthetic_corpus(DEFAULT_MIX, variants=2)
+
+    for size in DEFAULT_MIX:
+        assert len(corpus[size.name]) == 2
+        assert all(size.chars <= len(doc) < size.chars + 200 for doc in corpus[size.name])
+
+
+def test_light_load_completes_every_request():
+    phase = run_phase(40, duration_s=0.5, workers=1, sample_interval_s=0.1)
+
+    assert phase.requests > 0
+    assert phase.completed == phase.requests
+    assert phase.incomplete == 0 and phase.errors == 0
+    assert phase.p50_ms <= phase.p99_ms <= phase.p999_ms <= phase.max_ms
+    assert not phase.saturated
+    assert phase.rss_mib and phase.rss_mib[-1][1] > 0
+
+
+def test_overload_counts_queued_requests_at_their_age():
+    phase = run_phase(20000, duration_s=0.3, workers=1, drain_timeout_s=0.05, slo_p99_ms=50)
+
+    assert phase.saturated
+    assert phase.incomplete > 0
+    assert phase.completed + phase.incomplete == phase.requests
+    assert phase.max_ms >= 50
+
+
+def _modelled_phase(rate_rps: float, capacity_rps: float, slo_p99_ms: float) -> LoadPhase:
+    """A phase from a service that serves ``capacity_rps`` and queues the rest."""
+    throughput = min(rate_rps, capacity_rps)
+    p99_ms = 20.0 if rate_rps <= capacity_rps else 20.0 * rate_rps / capacity_rps
+    return LoadPhase(
+        target_rps=rate_rps,
+        offered_rps=rate_rps,
+        throughput_rps=throughput,
+        requests=int(rate_rps),
+        completed=int(throughput),
+        errors=0,
+        incomplete=0,
+        p50_ms=p99_ms / 2,
+        p99_ms=p99_ms,
+        p999_ms=p99_ms,
+        max_ms=p99_ms,
+        max_dispatch_lag_ms=0.0,
+        saturated=p99_ms > slo_p99_ms or throughput < 0.9 * rate_rps,
+    )
+
+
+def test_find_saturation_stops_at_first_saturated_phase():
+    calls = []
+
+    def runner(rate_rps, slo_p99_ms):
+        calls.append(rate_rps)
+        return _modelled_phase(rate_rps, capacity_rps=1_000, slo_p99_ms=slo_p99_ms)
+
+    report = find_saturation(
+        start_rps=100,
+        step_factor=4,
+        max_rps=50_000,
+        refine_steps=2,
+        runner=runner,
+        slo_p99_ms=100,
+    )
+
+    assert calls == [100, 400, 1_600, 1_000, 1_300]
+    assert report["max_sustainable_rps"] == 1_000
+    assert report["saturation_rps"] == 1_300
+    assert [p["saturated"] for p in report["phases"]] == [False, False, True, False, True]
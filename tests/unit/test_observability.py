@@ -0,0 +1,93 @@
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+from document_processing.observability import (
+    _DeferredQueueHandler,
+    configure_logging,
+    shutdown_logging,
+)
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_production_mode_emits_one_structured_record_per_document(restore_logging):
+    stream = io.StringIO()
+    configure_logging("production", sample_rate=0.0, stream=stream)
+
+    orchestrator = DocumentProcessingOrchestrator()
+    orchestrator.process_document("INVOICE total $500.00 due 2025-12-01", "LOG1")
+    orchestrator.process_document("Random memo", "LOG2")
+    shutdown_logging()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["document"]["document_id"] for line in lines] == ["LOG1", "LOG2"]
+    record = lines[0]["document"]
+    assert record["doc_type"] == "Invoice"
+    assert set(record["stage_ms"]) == {"classify", "extract", "actions", "summary", "risks"}
+    assert record["counts"]["amounts"] == 1
+
+
+def test_production_mode_samples_stage_detail(restore_logging):
+    stream = io.StringIO()
+    configure_logging("production", sample_rate=1.0, stream=stream)
+
+    DocumentProcessingOrchestrator().process_document("Random memo", "LOG3")
+    shutdown_logging()
+
+    loggers = {json.loads(line)["logger"] for line in stream.getvalue().splitlines()}
+    assert "document_processing.agents" in loggers
+    assert "document_processing.records" in loggers
+
+
+def test_unsampled_documents_drop_detail_without_touching_logger_levels(restore_logging):
+    stream = io.StringIO()
+    configure_logging("production", sample_rate=0.0, stream=stream)
+
+    DocumentProcessingOrchestrator().process_document("Random memo", "LOG4")
+    logging.getLogger("other_library").info("kept")
+    shutdown_logging()
+
+    loggers = {json.loads(line)["logger"] for line in stream.getvalue().splitlines()}
+    assert loggers == {"document_processing.records", "other_library"}
+    assert logging.getLogger("document_processing").level == logging.NOTSET
+
+
+def test_full_queue_drops_records_without_reporting_errors():
+    handler = _DeferredQueueHandler(queue.Queue(maxsize=1))
+    errors = []
+    handler.handleError = errors.append
+    record = logging.makeLogRecord({"name": "document_processing", "msg": "hello"})
+
+    handler.handle(record)
+    handler.handle(record)
+
+    assert handler.queue.qsize() == 1
+    assert errors == []
+
+
+def test_only_package_records_defer_formatting():
+    handler = _DeferredQueueHandler(queue.Queue())
+    args = ["before"]
+    handler.handle(logging.makeLogRecord({"name": "other_library", "msg": "%s", "args": (args,)}))
+    handler.handle(
+        logging.makeLogRecord({"name": "document_processing.agents", "msg": "%s", "args": ("x",)})
+    )
+    args[0] = "after"
+
+    third_party, package = handler.queue.get_nowait(), handler.queue.get_nowait()
+    assert third_party.getMessage() == "['before']"
+    assert third_party.args is None
+    assert package.args == ("x",)
@@ -0,0 +1,88 @@
+import asyncio
+
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+from document_processing.party_registry import PartyRegistry, normalize_party_name
+
+
+def test_normalize_strips_suffixes_and_scanner_noise():
+    assert normalize_party_name("From: Global Solutions Inc") == "global solutions"
+    assert normalize_party_name("ACME Corp.") == normalize_party_name("Acme Corporation")
+
+
+def test_registry_counts_documents_and_persists(tmp_path):
+    path = tmp_path / "parties.db"
+    registry = PartyRegistry(path)
+    registry.observe(["Acme Corp", "ACME Corporation"], "DOC1")
+    registry.observe(["Acme Corp"], "DOC2")
+    registry.close()
+
+    reopened = PartyRegistry(path)
+    record = reopened.lookup("acme corp")
+
+    assert record.document_count == 2
+    assert record.first_seen_document == "DOC1"
+    assert record.last_seen_document == "DOC2"
+    assert reopened.lookup("Unknown Ltd") is None
+
+
+def test_fuzzy_index_matches_spelling_variants():
+    registry = PartyRegistry(fuzzy=True)
+    registry.observe(["Global Solutions Inc"], "DOC1")
+
+    assert registry.lookup("Globel Solution LLC").key == "global solutions"
+    assert PartyRegistry().lookup("Globel Solution LLC") is None
+
+
+def test_risk_agent_flags_only_first_seen_parties():
+    orchestrator = DocumentProcessingOrchestrator(party_registry=PartyRegistry())
+    text = "INVOICE\nFrom: Northwind Traders Inc\nTotal: $120.00"
+
+    first = orchestrator.process_document(text, "NW1")
+    second = orchestrator.process_document(text, "NW2")
+
+    assert any("new party" in r.description for r in first.risks)
+    assert not any("new party" in r.description for r in second.risks)
+
+
+def test_redelivered_document_is_not_counted_twice():
+    registry = PartyRegistry()
+    registry.observe(["Acme Corp"], "DOC1")
+    again = registry.observe(["Acme Corp"], "DOC1")
+
+    assert again["Acme Corp"].document_count == 1
+    assert len(registry) == 1
+
+
+def test_different_document_reusing_an_id_is_still_counted():
+    registry = PartyRegistry()
+    registry.observe(["Acme Corp"], "invoice.pdf")
+    registry.observe(["Acme Corp", "Northwind Traders"], "invoice.pdf")
+
+    assert registry.lookup("Acme Corp").document_count == 2
+    assert registry.lookup("Northwind Traders").document_count == 1
+
+
+def test_registry_is_shared_across_async_streams():
+    orchestrator = DocumentProcessingOrchestrator(party_registry=PartyRegistry())
+    text = "INVOICE\nFrom: Northwind Traders Inc\nTotal: $120.00"
+
+    async def consume(document_id):
+        return [event async for event in orchestrator.astream_document(text, document_id)]
+
+    async def run_all():
+        return await asyncio.gather(*(consume(f"NW{n}") for n in range(4)))
+
+    results = asyncio.run(run_all())
+    orchestrator.close()
+
+    assert all(events[-1].stage == "done" for events in results)
+    assert orchestrator.party_registry.lookup("Northwind Traders").document_count == 4
+
+
+def test_documents_without_ids_are_counted_separately():
+    orchestrator = DocumentProcessingOrchestrator(party_registry=PartyRegistry())
+
+    orchestrator.process_document("INVOICE\nFrom: Northwind Traders Inc\nTotal: $120.00")
+    orchestrator.process_document("INVOICE\nFrom: Northwind Traders Inc\nTotal: $80.00")
+
+    assert orchestrator.party_registry.lookup("Northwind Traders").document_count == 2
@@ -0,0 +1,92 @@
+import json
+from datetime import date
+
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+from document_processing.result_index import ResultIndex
+
+
+INVOICE = """
+INVOICE
+From: Global Solutions Inc
+Date: November 25, 2025
+Total: $17,500.00
+Reference: PO-45678
+"""
+
+CONTRACT = """
+SERVICE AGREEMENT entered into on 2025-11-20
+between Tech Innovations LLC and Enterprise Solutions Corp
+Contract Value: $125,000
+"""
+
+
+def _results():
+    orchestrator = DocumentProcessingOrchestrator()
+    return [
+        orchestrator.process_document(INVOICE, "INV1"),
+        orchestrator.process_document(CONTRACT, "CON1"),
+    ]
+
+
+def test_search_by_reference_party_type_and_ranges():
+    index = ResultIndex()
+    index.add_many(_results())
+
+    assert index.search(reference="PO-45678") == ["INV1"]
+    assert index.search(party="Tech Innovations LLC", doc_type="contract", amount_min=100_000) == [
+        "CON1"
+    ]
+    assert index.search(party="Tech Innovations", amount_min=200_000) == []
+    assert index.search(date_from=date(2025, 11, 21), date_to=date(2025, 11, 30)) == ["INV1"]
+
+
+def test_save_load_round_trip_and_reindex(tmp_path):
+    dump = tmp_path / "results.jsonl"
+    from dataclasses import asdict
+
+    dump.write_text("\n".join(json.dumps(asdict(r)) for r in _results()))
+    index = ResultIndex.build_from_jsonl([dump])
+
+    # Re-indexing a document replaces its old postings.
+    index.add(
+        {
+            "document_id": "INV1",
+            "metadata": {"doc_type": "Invoice", "references": ["REF-99"], "amounts": ["$5.00"]},
+        }
+    )
+    index.save(tmp_path / "results.idx")
+    loaded = ResultIndex.load(tmp_path / "results.idx")
+
+    assert len(loaded) == 2
+    assert loaded.search(reference="PO-45678") == []
+    assert loaded.search(reference="REF-99") == ["INV1"]
+    assert loaded.search(doc_type="Contract", amount_min=100_000) == ["CON1"]
+
+
+def test_search_matches_brute_force_and_stops_at_limit():
+    index = ResultIndex()
+    docs = []
+    for i in range(300):
+        metadata = {
+            "doc_type": "Invoice" if i % 2 else "Contract",
+            "parties": [f"Party {i % 3}"],
+            "amounts": [f"${i}.00", f"${i + 1}.00"],
+        }
+        docs.append((f"D{i}", metadata))
+        index.add({"document_id": f"D{i}", "metadata": metadata})
+    index.add({"document_id": "D9", "metadata": {"doc_type": "Memo"}})
+
+    def expected(predicate):
+        return [doc_id for doc_id, m in docs if doc_id != "D9" and predicate(m)]
+
+    def lowest(metadata):
+        return float(metadata["amounts"][0][1:])
+
+    invoices = expected(
+        lambda m: m["doc_type"] == "Invoice" and m["parties"] == ["Party 0"] and lowest(m) <= 100
+    )
+    assert index.search(doc_type="invoice", party="Party 0", amount_max=100) == invoices
+    assert index.search(amount_min=50, amount_max=60) == expected(lambda m: 49 <= lowest(m) <= 60)
+    assert index.search(party="Party 1", limit=3) == ["D1", "D4", "D7"]
+    assert index.search(amount_min=0, limit=3) == ["D0", "D1", "D2"]
+    assert index.search(doc_type="invoice", limit=0) == []
@@ -0,0 +1,76 @@
+import json
+from dataclasses import asdict
+from datetime import datetime
+
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+from document_processing.result_store import ColumnarResultReader, ColumnarResultWriter, main
+
+
+INVOICE = """
+INVOICE
+From: Global Solutions Inc
+Date: November 25, 2025
+Total: $17,500.00
+Reference: PO-45678
+"""
+
+CONTRACT = """
+SERVICE AGREEMENT entered into on 2025-11-20
+Tech Innovations LLC
+Global Solutions Inc
+Contract Value: $125,000
+Signature required by December 1, 2025.
+"""
+
+
+def _results():
+    orchestrator = DocumentProcessingOrchestrator()
+    results = [
+        orchestrator.process_document(INVOICE, "INV1"),
+        orchestrator.process_document(INVOICE.replace("17,500", "2,500"), "INV2"),
+        orchestrator.process_document(CONTRACT, "CON1"),
+    ]
+    results[0].timestamp = "2025-10-30T12:00:00.250000"
+    results[1].timestamp = "2025-11-02T08:30:00"
+    results[2].timestamp = "2025-11-03T09:00:00"
+    return results
+
+
+def test_round_trip_across_chunks(tmp_path):
+    results = _results()
+    with ColumnarResultWriter(tmp_path / "store", chunk_rows=2) as writer:
+        writer.append_many(results)
+    assert len(list((tmp_path / "store").glob("chunk-*.dpcs"))) == 2
+
+    with ColumnarResultReader(tmp_path / "store") as reader:
+        assert len(reader) == 3
+        assert [asdict(r) for r in reader.iter_results()] == [asdict(r) for r in results]
+
+
+def test_aggregations_with_filters(tmp_path):
+    with ColumnarResultWriter(tmp_path / "store") as writer:
+        writer.append_many(_results())
+
+    with ColumnarResultReader(tmp_path / "store") as reader:
+        assert reader.aggregate("doc_type") == {"Invoice": 2, "Contract": 1}
+        assert reader.aggregate("party", "value", doc_type="Invoice") == {
+            "global solutions": 20_000.0
+        }
+        november = reader.aggregate(
+            "party", "value", since=datetime(2025, 11, 1), until=datetime(2025, 12, 1)
+        )
+        assert november["global solutions"] == 127_500.0
+        assert november["tech innovations"] == 125_000.0
+        assert reader.aggregate("month") == {"2025-11": 2, "2025-10": 1}
+        assert reader.aggregate("doc_type", doc_type="Memo") == {}
+
+
+def test_cli_convert_appends_and_queries(tmp_path, capsys):
+    dump = tmp_path / "results.jsonl"
+    dump.write_text("\n".join(json.dumps(asdict(r)) for r in _results()))
+    main(["convert", str(tmp_path / "store"), str(dump)])
+    main(["convert", str(tmp_path / "store"), str(dump)])
+    capsys.readouterr()
+
+    main(["query", str(tmp_path / "store"), "--group-by", "doc_type"])
+    assert capsys.readouterr().out.splitlines() == ["Invoice\t4", "Contract\t2"]
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+from document_processing.revisions import RevisionStore, split_chunks
+
+
+SAMPLES_DIR = Path(__file__).resolve().parents[1] / "sample_documents"
+
+BASE = """SERVICE AGREEMENT
+Parties:
+Tech Innovations LLC
+Global Solutions Inc
+Effective: 2025-01-15
+Contract value: $125,000.00
+Purchase Order
+45678
+Payment terms: net 30
+"""
+
+
+def _comparable(result):
+    return (result.metadata, result.action_items, result.summary, result.risks)
+
+
+def test_chunks_keep_reference_keyword_with_its_number():
+    assert split_chunks("Purchase Order\n\n45678\nNext line") == [
+        "Purchase Order\n\n45678",
+        "Next line",
+    ]
+
+
+def test_revision_matches_full_reprocessing_and_reports_changes():
+    orchestrator = DocumentProcessingOrchestrator(revision_store=RevisionStore())
+    orchestrator.process_document(BASE, "C1")
+    revised = (
+        BASE.replace("$125,000.00", "$140,000.00")
+        .replace("2025-01-15", "2025-02-01")
+        .replace("Global Solutions Inc", "Northwind Corp")
+    )
+
+    result, report = orchestrator.process_revision("C1", revised)
+
+    expected = DocumentProcessingOrchestrator().process_document(revised, "FULL")
+    assert _comparable(result) == _comparable(expected)
+    assert result.document_id == "C1_rev1"
+    assert report.amounts_added == ["$140,000.00"]
+    assert report.amounts_removed == ["$125,000.00"]
+    assert report.dates_added == ["2025-02-01"]
+    assert report.dates_removed == ["2025-01-15"]
+    assert report.parties_added == ["Northwind Corp"]
+    assert report.parties_removed == ["Global Solutions Inc"]
+    assert report.changed_regions == 1
+    assert report.rerun_stages[:2] == ["classify", "extract"]
+    assert report.rescanned_chars < len(revised) / 2
+
+
+def test_unchanged_entities_skip_downstream_stages():
+    orchestrator = DocumentProcessingOrchestrator(revision_store=RevisionStore())
+    first = orchestrator.process_document(BASE, "C2")
+
+    result, report = orchestrator.process_revision("C2", BASE.replace("net 30", "net 45"))
+
+    assert report.rerun_stages == ["extract"]
+    assert _comparable(result) == _comparable(first)
+
+    _, second = orchestrator.process_revision("C2_rev1", BASE + "URGENT: sign by Friday\n")
+    assert second.rerun_stages == ["extract", "actions", "summary", "risks"]
+
+
+def test_revisions_of_sample_documents_match_full_processing():
+    incremental = DocumentProcessingOrchestrator(revision_store=RevisionStore())
+    full = DocumentProcessingOrchestrator()
+    for idx, path in enumerate(sorted(SAMPLES_DIR.glob("*.txt"))):
+        text = path.read_text()
+        incremental.process_document(text, f"S{idx}")
+        lines = text.splitlines(keepends=True)
+        middle = len(lines) // 2
+        revised = "".join(lines[:middle] + ["Amended: PO 777 dated 2025-06-30\n"] + lines[middle + 1 :])
+
+        result, _ = incremental.process_revision(f"S{idx}", revised)
+        assert _comparable(result) == _comparable(full.process_document(revised, f"F{idx}"))
+
+
+def test_sibling_revisions_get_distinct_default_ids():
+    orchestrator = DocumentProcessingOrchestrator(revision_store=RevisionStore())
+    orchestrator.process_document(BASE, "C3")
+
+    first, _ = orchestrator.process_revision("C3", BASE.replace("net 30", "net 45"))
+    second, _ = orchestrator.process_revision("C3", BASE.replace("net 30", "net 60"))
+    third, _ = orchestrator.process_revision(first.document_id, BASE + "Signed.\n")
+
+    assert [first.document_id, second.document_id, third.document_id] == [
+        "C3_rev1",
+        "C3_rev2",
+        "C3_rev3",
+    ]
@@ -0,0 +1,72 @@
+from document_processing.job_queue import SQLiteJobQueue
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+from document_processing.scheduler import (
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    PRIORITY_URGENT,
+    AgingPriorityQueue,
+    PriorityRules,
+    PriorityScheduler,
+)
+
+
+ROUTINE = "INVOICE #{n}\nAmount due: $120.00\nPayment due within 30 days."
+URGENT = "SERVICE AGREEMENT\nURGENT: Signature required by March 1, 2025."
+HIGH_VALUE = "INVOICE #9\nTotal: $250,000.00"
+
+
+class _RecordingOrchestrator(DocumentProcessingOrchestrator):
+    def __init__(self):
+        super().__init__()
+        self.order = []
+
+    def process_document(self, document_text, document_id=None):
+        self.order.append(document_id)
+        return super().process_document(document_text, document_id)
+
+
+def test_prescan_assigns_priorities():
+    rules = PriorityRules()
+
+    assert rules.prescan(URGENT).priority == PRIORITY_URGENT
+    high = rules.prescan(HIGH_VALUE)
+    assert high.priority == PRIORITY_HIGH
+    assert high.max_amount == 250_000.0
+    assert rules.prescan("SERVICE AGREEMENT between two parties").priority == PRIORITY_HIGH
+    assert rules.prescan(ROUTINE.format(n=1)).priority == PRIORITY_NORMAL
+
+
+def test_batch_runs_urgent_first_and_keeps_input_order():
+    documents = [(ROUTINE.format(n=n), f"R{n}") for n in range(5)]
+    documents += [(HIGH_VALUE, "H"), (URGENT, "U")]
+    orchestrator = _RecordingOrchestrator()
+    scheduler = PriorityScheduler()
+
+    results = scheduler.process_batch(orchestrator, documents)
+
+    assert orchestrator.order[:2] == ["U", "H"]
+    assert [r.document_id for r in results] == [doc_id for _, doc_id in documents]
+    stats = scheduler.stats()["priorities"]
+    assert stats["urgent"]["count"] == 1
+    assert stats["normal"]["count"] == 5
+    assert stats["urgent"]["within_sla"] == 1.0
+
+
+def test_aging_prevents_starvation():
+    queue = AgingPriorityQueue(aging_s=10.0)
+    queue.push("old-normal", PRIORITY_NORMAL, enqueued_at=0.0)
+    queue.push("new-urgent", PRIORITY_URGENT, enqueued_at=25.0)
+    queue.push("fresh-urgent", PRIORITY_URGENT, enqueued_at=15.0)
+
+    assert [queue.pop() for _ in range(3)] == ["fresh-urgent", "old-normal", "new-urgent"]
+
+
+def test_job_queue_leases_by_priority(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "jobs.db", priority_rules=PriorityRules())
+    queue.enqueue_many([(ROUTINE.format(n=1), "R1"), (HIGH_VALUE, "H"), (URGENT, "U")])
+
+    leased = queue.lease("w1", batch_size=10)
+
+    assert [job.document_id for job in leased] == ["U", "H", "R1"]
+    queue.ack([(job, {}) for job in leased])
+    assert queue.latency_by_priority()["urgent"]["count"] == 1
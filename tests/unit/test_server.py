@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from document_processing import server as server_module
+from document_processing.server import (
+    DocumentProcessingServer,
+    MicroBatcher,
+    QueueFullError,
+    ServerConfig,
+)
+
+
+def _echo_batches(seen):
+    def handler(items):
+        seen.append(len(items))
+        return [doc_id for _, doc_id in items]
+
+    return handler
+
+
+def test_batcher_groups_concurrent_submissions():
+    seen = []
+
+    async def scenario():
+        executor = ThreadPoolExecutor(max_workers=1)
+        batcher = MicroBatcher(_echo_batches(seen), executor, workers=1, max_batch_size=8)
+        await batcher.start()
+        results = await asyncio.gather(
+            *(batcher.submit(("text", f"doc{i}")) for i in range(20))
+        )
+        await batcher.stop()
+        executor.shutdown()
+        return results, batcher.stats()
+
+    results, stats = asyncio.run(scenario())
+
+    assert results == [f"doc{i}" for i in range(20)]
+    assert max(seen) > 1
+    assert stats["completed"] == 20
+    assert stats["latency_ms"]["samples"] == 20
+
+
+def test_batcher_rejects_when_queue_full():
+    release = threading.Event()
+
+    def blocking_handler(items):
+        release.wait(5)
+        return [None for _ in items]
+
+    async def scenario():
+        executor = ThreadPoolExecutor(max_workers=1)
+        batcher = MicroBatcher(
+            blocking_handler, executor, workers=1, max_batch_size=1, max_queue_size=1
+        )
+        await batcher.start()
+        first = asyncio.create_task(batcher.submit(("a", "1")))
+        await asyncio.sleep(0.05)  # first item is now running in the worker
+        second = asyncio.create_task(batcher.submit(("b", "2")))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await batcher.submit(("c", "3"))
+        release.set()
+        await asyncio.gather(first, second)
+        await batcher.stop()
+        executor.shutdown()
+        return batcher.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["rejected"] == 1
+
+
+def test_server_processes_document_over_http():
+    async def request(port, method, path, payload=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        head, _, payload = raw.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(payload)
+
+    async def scenario():
+        server = DocumentProcessingServer(
+            ServerConfig(port=0, workers=2, use_processes=False)
+        )
+        await server.start()
+        try:
+            ok = await request(
+                server.port,
+                "POST",
+                "/process",
+                {"document_text": "INVOICE total $500.00", "document_id": "HTTP1"},
+            )
+            bad = await request(server.port, "POST", "/process", {"text": "missing"})
+            stats = await request(server.port, "GET", "/stats")
+            anonymous = await asyncio.gather(
+                *(
+                    request(server.port, "POST", "/process", {"document_text": "memo"})
+                    for _ in range(2)
+                )
+            )
+        finally:
+            await server.stop()
+        return ok, bad, stats, anonymous
+
+    ok, bad, stats, anonymous = asyncio.run(scenario())
+
+    assert ok[0] == 200
+    assert ok[1]["document_id"] == "HTTP1"
+    assert ok[1]["metadata"]["doc_type"] == "Invoice"
+    assert bad[0] == 400
+    assert stats[1]["completed"] == 1
+    assert len({result["document_id"] for _, result in anonymous}) == 2
+
+
+def test_thread_workers_each_build_their_own_orchestrator():
+    barrier = threading.Barrier(2)
+
+    def worker_orchestrator(_):
+        barrier.wait(5)  # both threads are alive, so each ran the initializer
+        return id(server_module._worker.orchestrator)
+
+    with ThreadPoolExecutor(max_workers=2, initializer=server_module.init_worker) as pool:
+        assert len(set(pool.map(worker_orchestrator, range(2)))) == 2
@@ -0,0 +1,154 @@
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+from document_processing.session import InMemorySessionService, MemoryBank
+from document_processing.snapshot import SnapshotWriter, load_snapshot, save_snapshot
+
+
+CONTRACT = """
+SERVICE AGREEMENT
+Tech Innovations LLC
+Contract Value: $125,000
+"""
+
+
+def test_warm_start_restores_patterns_and_sessions(tmp_path):
+    orchestrator = DocumentProcessingOrchestrator()
+    orchestrator.process_document(CONTRACT, "C1")
+    orchestrator.memory_bank.patterns["common_entities"].append({"name": "Acme", "tags": ["vendor"]})
+    orchestrator.memory_bank.patterns["action_templates"].append({"irregular": 1})
+    orchestrator.memory_bank.patterns["action_templates"].append({"other": None})
+    save_snapshot(tmp_path / "memory.snap", orchestrator.memory_bank, orchestrator.session_service)
+
+    bank, sessions = load_snapshot(tmp_path / "memory.snap")
+
+    for category, patterns in orchestrator.memory_bank.patterns.items():
+        assert list(bank.patterns[category]) == patterns
+    assert bank.retrieve_patterns("Contract")[-1]["risk_level"] in ("High", "Medium", "Low")
+    assert sessions.get_state("session_C1", "doc_type") == "Contract"
+    assert "session_missing" not in sessions.sessions
+    assert len(sessions.sessions) == 1
+
+
+def test_resnapshot_appends_to_loaded_state(tmp_path):
+    path = tmp_path / "memory.snap"
+    bank = MemoryBank()
+    for n in range(300):
+        bank.store_pattern("Invoice", {"entities_found": n, "action_count": 1, "risk_level": f"L{n}"})
+    save_snapshot(path, bank)
+
+    bank, sessions = load_snapshot(path)
+    writer = SnapshotWriter(path, bank, sessions)
+    assert not writer.save()
+    # Fits the stored schema: snapshot columns are copied and extended.
+    bank.store_pattern("Invoice", {"entities_found": 7, "action_count": 2, "risk_level": "High"})
+    sessions.create_session("S1")
+    sessions.update_state("S1", "doc_type", "Invoice")
+    assert writer.save()
+
+    bank, sessions = load_snapshot(path)
+    # Outgrows the int32 column: the category is re-encoded.
+    bank.store_pattern("Invoice", {"entities_found": 2**40, "action_count": 2, "risk_level": "High"})
+    bank.store_pattern("Contract", {"entities_found": 1, "action_count": 0, "risk_level": "Low"})
+    save_snapshot(path, bank, sessions)
+
+    reloaded, reloaded_sessions = load_snapshot(path)
+    invoices = reloaded.retrieve_patterns("Invoice")
+    assert len(invoices) == 302
+    assert invoices[299] == {"entities_found": 299, "action_count": 1, "risk_level": "L299"}
+    assert invoices[300] == {"entities_found": 7, "action_count": 2, "risk_level": "High"}
+    assert invoices[-1]["entities_found"] == 2**40
+    assert list(reloaded.retrieve_patterns("Contract")) == [
+        {"entities_found": 1, "action_count": 0, "risk_level": "Low"}
+    ]
+    assert reloaded_sessions.get_state("S1", "doc_type") == "Invoice"
+
+
+def test_loaded_sessions_are_mutable_in_place(tmp_path):
+    sessions = InMemorySessionService()
+    for session_id in ("b", "a", "c"):
+        sessions.create_session(session_id)
+    save_snapshot(tmp_path / "memory.snap", MemoryBank(), sessions)
+
+    _, loaded = load_snapshot(tmp_path / "memory.snap")
+    loaded.update_state("b", "seen", True)
+    del loaded.sessions["c"]
+    loaded.create_session("d")
+
+    assert loaded.get_state("b", "seen") is True
+    assert sorted(loaded.sessions) == ["a", "b", "d"]
+    assert len(loaded.sessions) == 3
+
+
+def test_saves_rebase_patterns_onto_the_new_snapshot(tmp_path):
+    path = tmp_path / "memory.snap"
+    bank = MemoryBank()
+    writer = SnapshotWriter(path, bank)
+    for n in range(3):
+        bank.store_pattern("Invoice", {"entities_found": n, "action_count": 1, "risk_level": "Low"})
+    assert writer.save()
+
+    invoices = bank.patterns["invoice_patterns"]
+    assert invoices._tail == [] and invoices._chunk.path == path
+    assert invoices[2] == {"entities_found": 2, "action_count": 1, "risk_level": "Low"}
+
+    bank.store_pattern("Invoice", {"entities_found": 3, "action_count": 1, "risk_level": "High"})
+    assert len(invoices._tail) == 1
+    assert writer.save()
+    assert invoices._tail == []
+
+    reloaded, _ = load_snapshot(path)
+    assert [p["entities_found"] for p in reloaded.retrieve_patterns("Invoice")] == [0, 1, 2, 3]
+
+
+def test_saves_rebase_sessions_onto_the_new_snapshot(tmp_path):
+    path = tmp_path / "memory.snap"
+    service = InMemorySessionService()
+    writer = SnapshotWriter(path, MemoryBank(), service)
+    for name in ("a", "b", "c"):
+        service.create_session(name)
+    assert writer.save()
+
+    sessions = service.sessions
+    assert sessions._overlay == {} and sessions._chunk.path == path
+
+    service.update_state("b", "doc_type", "Invoice")
+    del sessions["c"]
+    service.create_session("d")
+    assert sorted(sessions._overlay) == ["b", "d"]
+    assert writer.save()
+    assert sessions._overlay == {}
+
+    _, reloaded = load_snapshot(path)
+    assert sorted(reloaded.sessions) == ["a", "b", "d"]
+    assert reloaded.get_state("b", "doc_type") == "Invoice"
+
+
+def test_session_moved_to_overlay_during_capture_is_kept(tmp_path):
+    path = tmp_path / "memory.snap"
+    sessions = InMemorySessionService()
+    for name in ("a", "b"):
+        sessions.create_session(name)
+    save_snapshot(path, MemoryBank(), sessions)
+    _, loaded = load_snapshot(path)
+
+    capture = loaded.sessions.capture()
+    loaded.update_state("b", "seen", True)  # decoded into the overlay mid-save
+
+    assert [session_id for session_id, _ in capture.entries] == ["a", "b"]
+
+
+def test_pattern_log_supports_edits_to_snapshot_rows(tmp_path):
+    path = tmp_path / "memory.snap"
+    bank = MemoryBank()
+    for n in range(3):
+        bank.store_pattern("Invoice", {"entities_found": n, "action_count": 1, "risk_level": "Low"})
+    save_snapshot(path, bank)
+    bank, _ = load_snapshot(path)
+    invoices = bank.patterns["invoice_patterns"]
+
+    invoices[0] = {"entities_found": 9, "action_count": 1, "risk_level": "High"}
+    del invoices[1]
+    invoices.insert(0, {"entities_found": 7, "action_count": 0, "risk_level": "Low"})
+    save_snapshot(path, bank)
+
+    reloaded, _ = load_snapshot(path)
+    assert [p["entities_found"] for p in reloaded.retrieve_patterns("Invoice")] == [7, 9, 2]
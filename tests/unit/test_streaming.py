@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+from document_processing.models import PIPELINE_STAGES, DocumentClassified, ProcessingDone
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+
+
+CONTRACT = "SERVICE AGREEMENT between Tech Innovations LLC and Acme Corp. Value: $125,000"
+
+
+class _CountingOrchestrator(DocumentProcessingOrchestrator):
+    def __init__(self):
+        super().__init__()
+        self.risk_calls = 0
+        assess = self.risk_assessor.assess_risks
+
+        def counting(*args, **kwargs):
+            self.risk_calls += 1
+            return assess(*args, **kwargs)
+
+        self.risk_assessor.assess_risks = counting
+
+
+def test_stream_yields_every_stage_in_order():
+    orchestrator = DocumentProcessingOrchestrator()
+
+    events = list(orchestrator.stream_document(CONTRACT, "S1"))
+
+    assert tuple(e.stage for e in events) == PIPELINE_STAGES
+    assert isinstance(events[-1], ProcessingDone)
+    assert events[-1].result.metadata.doc_type == "Contract"
+    assert events[-1].result.risks == events[4].risks
+
+
+def test_stopping_early_cancels_remaining_stages():
+    orchestrator = _CountingOrchestrator()
+
+    for event in orchestrator.stream_document(CONTRACT, "S2"):
+        if isinstance(event, DocumentClassified):
+            doc_type = event.doc_type
+            break
+
+    assert doc_type == "Contract"
+    assert orchestrator.risk_calls == 0
+
+
+def test_async_stream_supports_early_exit():
+    orchestrator = _CountingOrchestrator()
+
+    async def first_two():
+        stages = []
+        async for event in orchestrator.astream_document(CONTRACT, "S3"):
+            stages.append(event.stage)
+            if len(stages) == 2:
+                break
+        return stages
+
+    assert asyncio.run(first_two()) == ["classified", "extracted"]
+    assert orchestrator.risk_calls == 0
+
+
+def test_async_stream_runs_each_document_on_one_thread():
+    orchestrator = DocumentProcessingOrchestrator()
+    threads = []
+    for agent, method in (
+        (orchestrator.classifier, "classify"),
+        (orchestrator.risk_assessor, "assess_risks"),
+    ):
+        original = getattr(agent, method)
+
+        def recording(*args, _original=original, **kwargs):
+            threads.append(threading.get_ident())
+            return _original(*args, **kwargs)
+
+        setattr(agent, method, recording)
+
+    async def consume():
+        return [event.stage async for event in orchestrator.astream_document(CONTRACT, "S4")]
+
+    assert asyncio.run(consume())[-1] == "done"
+    orchestrator.close()
+    assert len(threads) == 2 and len(set(threads)) == 1
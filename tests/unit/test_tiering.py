@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from document_processing.orchestrator import DocumentProcessingOrchestrator
+from document_processing.tiering import PipelineProfile, TierPlanner
+
+
+SAMPLES_DIR = Path(__file__).resolve().parents[1] / "sample_documents"
+
+
+def _comparable(result):
+    return (result.metadata, result.action_items, result.summary, result.risks)
+
+
+def test_tiered_pipeline_matches_full_pipeline_output():
+    documents = [path.read_text() for path in sorted(SAMPLES_DIR.glob("*.txt"))] + [
+        "Team memo: the office will be closed on Friday afternoon.",
+        "Please see the reference binder in the library. URGENT",
+        "Meeting with Acme Corp about the new vendor onboarding.",
+        "Price list: $, to be confirmed",
+    ]
+    full = DocumentProcessingOrchestrator()
+    planner = TierPlanner()
+    tiered = DocumentProcessingOrchestrator(tier_planner=planner)
+
+    for idx, text in enumerate(documents):
+        doc_id = f"T{idx}"
+        assert _comparable(tiered.process_document(text, doc_id)) == _comparable(
+            full.process_document(text, doc_id)
+        )
+
+    stats = planner.stats()
+    assert stats["tiers"]["fast"] == 2  # edge_cases.txt and the office memo
+    assert sum(stats["tiers"].values()) == len(documents)
+
+
+def test_profiles_are_configurable_per_doc_type():
+    planner = TierPlanner(
+        profiles={
+            "Invoice": PipelineProfile(gated=False),
+            "Report": PipelineProfile(extractors=frozenset({"dates"})),
+        }
+    )
+
+    assert planner.plan("Invoice", "invoice with no numbers") == (
+        "full",
+        frozenset({"dates", "amounts", "references", "parties"}),
+    )
+    assert planner.plan("Report", "Report for 2025-01-01 by Acme Inc") == (
+        "gated",
+        frozenset({"dates"}),
+    )
+    assert planner.plan("General Document", "memo") == ("fast", frozenset())
+    assert planner.stats()["tiers"] == {"full": 1, "gated": 1, "fast": 1}